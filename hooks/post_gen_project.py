@@ -5,6 +5,7 @@ import os
 import subprocess
 import sys
 import time
+import urllib.request
 
 
 def run_command(command, cwd=None, timeout=60):
@@ -47,6 +48,22 @@ def test_stdio_transport(cwd):
         return False
 
 
+def wait_until_ready(url, process, timeout=30):
+    """Poll the server's readiness probe instead of sleeping a fixed time."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.1)
+    return False
+
+
 def test_streamable_http_transport(cwd):
     """Test streamable-http transport functionality."""
     print("\n🧪 Testing streamable-http transport...")
@@ -59,15 +76,15 @@ def test_streamable_http_transport(cwd):
     ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
     
     try:
-        # Wait for server to start
-        time.sleep(3)
-        
-        # Check if server is running
-        if server_process.poll() is not None:
-            stdout, stderr = server_process.communicate()
-            print("❌ Server failed to start:")
-            print(f"   stdout: {stdout.decode()}")
-            print(f"   stderr: {stderr.decode()}")
+        # Wait until the server is ready to serve
+        if not wait_until_ready("http://localhost:8001/readyz", server_process):
+            if server_process.poll() is not None:
+                stdout, stderr = server_process.communicate()
+                print("❌ Server failed to start:")
+                print(f"   stdout: {stdout.decode()}")
+                print(f"   stderr: {stderr.decode()}")
+            else:
+                print("❌ Server did not become ready within 30s")
             return False
         
         # Run the streamable-http test
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Per-call dispatch overhead of small tools.
+
+Registers the same three tools on a plain `FastMCP` server ("sdk") and on
+`Server` ("server") and calls each through the low-level `tools/call` handler,
+without a transport, so what is timed is dispatch: finding the tool,
+validating its arguments, running it, converting and validating its result.
+The tools do almost nothing, so the difference is overhead. The "rejected"
+row is a call with an operation outside the `calculate` enum.
+
+Usage:
+    uv run python -m benchmarks.bench_dispatch
+    uv run python -m benchmarks.bench_dispatch --calls 2000 --repeat 10
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Literal
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from {{ cookiecutter.package_name }}.arrays import OPERATIONS, Operation
+from {{ cookiecutter.package_name }}.core import Server
+
+CALLS: dict[str, tuple[str, dict[str, Any]]] = {
+    "echo": ("echo", {"message": "hello"}),
+    "timestamp": ("timestamp", {"format": "unix"}),
+    "calculate": ("calculate", {"operation": "multiply", "a": 6, "b": 7}),
+    "rejected": ("calculate", {"operation": "power", "a": 6, "b": 7}),
+}
+
+
+def echo(message: str) -> str:
+    return f"Echo: {message}"
+
+
+def timestamp(format: Literal["iso", "unix", "human"] = "iso") -> str:
+    return str(int(datetime.now().timestamp()))
+
+
+def calculate(operation: Operation, a: float, b: float) -> float:
+    return OPERATIONS[operation](a, b)
+
+
+def register(server: FastMCP) -> FastMCP:
+    for fn in (echo, timestamp, calculate):
+        server.tool()(fn)
+    return server
+
+
+async def best_of(server: FastMCP, name: str, arguments: dict[str, Any], calls: int, repeat: int) -> float:
+    """Fastest mean time of one call over `repeat` runs of `calls`, in microseconds."""
+    handler = server._mcp_server.request_handlers[CallToolRequest]
+    request = CallToolRequest(params=CallToolRequestParams(name=name, arguments=arguments))
+    await handler(request)  # Warm up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await handler(request)
+        times.append((time.perf_counter() - start) / calls)
+    return min(times) * 1e6
+
+
+async def run(args: argparse.Namespace) -> None:
+    servers = {"sdk": register(FastMCP("sdk")), "server": register(Server("server"))}
+    print(f"🧪 {args.calls} calls per run, best of {args.repeat}")
+    print()
+    print(f"{'tool':<10} {'sdk µs':>9} {'server µs':>10} {'speedup':>8}")
+    for label, (name, arguments) in CALLS.items():
+        sdk, ours = [await best_of(server, name, arguments, args.calls, args.repeat) for server in servers.values()]
+        print(f"{label:<10} {sdk:>9.1f} {ours:>10.1f} {sdk / ours:>7.1f}x")
+
+
+def main(args: argparse.Namespace) -> None:
+    asyncio.run(run(args))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500, help="Calls per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
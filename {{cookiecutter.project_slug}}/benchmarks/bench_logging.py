@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Per-call cost of the logging configurations.
+
+Times the same `logger.info` call the tools make under each logging mode and
+reports the nanoseconds spent on the calling thread (what a request pays) and
+the total time until everything has been written.
+
+Usage:
+    uv run python -m benchmarks.bench_logging
+    uv run python -m benchmarks.bench_logging --calls 5000 --to-stderr
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, TextIO
+
+from loguru import logger
+
+from {{ cookiecutter.package_name }}.logs import configure_logging
+
+SCENARIOS: dict[str, dict[str, Any]] = {
+    "text, sync": {"log_format": "text", "log_queue": False},
+    "text, queued": {"log_format": "text", "log_queue": True},
+    "json, sync": {"log_format": "json", "log_queue": False},
+    "json, queued": {"log_format": "json", "log_queue": True},
+    "json, queued, 100/s limit": {"log_format": "json", "log_queue": True, "log_rate_limit": 100},
+    "level disabled": {"log_level": "WARNING"},
+}
+
+
+def lazy_call(a: float, b: float) -> None:
+    logger.info("Calculate tool called: {} {} {}", a, "add", b)
+
+
+def eager_call(a: float, b: float) -> None:
+    logger.info(f"Calculate tool called: {a} add {b}")
+
+
+def measure(options: dict[str, Any], call: Callable[[float, float], None], calls: int, stream: TextIO) -> tuple[float, float]:
+    """Return (caller ns/call, total ns/call including the background drain)."""
+    configure_logging(**{"log_level": "INFO", **options}, stream=stream)
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        call(float(i), 2.0)
+    caller = time.perf_counter_ns() - start
+    # Removing the sink flushes the queue and joins the writer thread
+    logger.remove()
+    total = time.perf_counter_ns() - start
+    return caller / calls, total / calls
+
+
+def main(args: argparse.Namespace) -> None:
+    stream = sys.stderr if args.to_stderr else open(os.devnull, "w")
+    results = {name: measure(options, lazy_call, args.calls, stream) for name, options in SCENARIOS.items()}
+    results["level disabled, f-string"] = measure(SCENARIOS["level disabled"], eager_call, args.calls, stream)
+    configure_logging()
+
+    print(f"{'scenario':<28} {'caller ns/call':>15} {'total ns/call':>15}")
+    for name, (caller, total) in results.items():
+        print(f"{name:<28} {caller:>15.0f} {total:>15.0f}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000, help="Log calls per scenario")
+    parser.add_argument("--to-stderr", action="store_true", help="Write to stderr instead of /dev/null")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Cost of encoding a large tool result with each serializer backend.
+
+Builds a tool result of `--rows` records and times the two steps every
+response goes through: converting the return value into content (FastMCP
+writes indented JSON, see `serialization.to_content`), and encoding the
+JSON-RPC response that carries it for the transport. The "sdk" row is what
+the MCP SDK does on its own, and speedups are relative to it. Backends that
+are not installed are skipped.
+
+Usage:
+    uv run python -m benchmarks.bench_serialization
+    uv run python -m benchmarks.bench_serialization --rows 50000 --repeat 20
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from mcp.server.fastmcp.utilities.func_metadata import _convert_to_content
+from mcp.types import CallToolResult, JSONRPCMessage, JSONRPCResponse
+
+from {{ cookiecutter.package_name }}.serialization import BACKENDS, configure_serializer, encode_message, to_content
+
+
+def make_rows(count: int) -> dict[str, Any]:
+    return {
+        "rows": [
+            {"id": i, "name": f"item {i}", "price": i * 1.25, "tags": ["red", "large"], "active": i % 2 == 0}
+            for i in range(count)
+        ]
+    }
+
+
+def make_message(result: dict[str, Any], content: Any) -> JSONRPCMessage:
+    tool_result = CallToolResult(content=list(content), structuredContent=result)
+    response = JSONRPCResponse(jsonrpc="2.0", id=1, result=tool_result.model_dump(by_alias=True, exclude_none=True))
+    return JSONRPCMessage(response)
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(args: argparse.Namespace) -> None:
+    result = make_rows(args.rows)
+    message = make_message(result, _convert_to_content(result))
+    sdk_content = best_of(lambda: _convert_to_content(result), args.repeat)
+    sdk_message = best_of(lambda: message.model_dump_json(by_alias=True, exclude_none=True), args.repeat)
+    timings = {"sdk": (sdk_content, sdk_message)}
+
+    for name in BACKENDS:
+        try:
+            configure_serializer(name)
+        except ImportError:
+            print(f"   {name} is not installed, skipped")
+            continue
+        timings[name] = (
+            best_of(lambda: to_content(result), args.repeat),
+            best_of(lambda: encode_message(message), args.repeat),
+        )
+    configure_serializer()
+
+    size = len(message.model_dump_json(by_alias=True, exclude_none=True))
+    print(f"🧪 Tool result with {args.rows} rows, {size / 1e6:.1f} MB on the wire (sdk), best of {args.repeat}")
+    print()
+    print(f"{'backend':<10} {'content ms':>11} {'message ms':>11} {'total ms':>10} {'speedup':>8}")
+    for name, (content, encoded) in timings.items():
+        total = content + encoded
+        print(f"{name:<10} {content:>11.2f} {encoded:>11.2f} {total:>10.2f} {(sdk_content + sdk_message) / total:>7.1f}x")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Records in the tool result")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
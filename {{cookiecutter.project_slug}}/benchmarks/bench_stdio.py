@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Serial versus pipelined requests over the stdio transport.
+
+A host that pipelines writes many requests to the server's stdin before
+reading the responses. Each scenario runs a server in this process on a pair
+of pipes, writes `--calls` requests in one go and reads every response,
+timing each from the moment the requests were written:
+
+- "sdk": the SDK's `stdio_server`, reading and writing one line at a time
+  through a thread, with no limit on requests in flight;
+- "serial": this package's transport with `concurrency=1`, one request at a
+  time, in order;
+- "pipelined": this package's transport with `--concurrency` requests at once.
+
+Each runs twice: with `echo`, which returns at once, so what is timed is the
+transport, and with `wait`, which sleeps `--wait-ms` like a tool calling
+another service, so what is timed is how requests overlap.
+
+Usage:
+    uv run python -m benchmarks.bench_stdio
+    uv run python -m benchmarks.bench_stdio --calls 1000 --wait-ms 5 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from io import TextIOWrapper
+from typing import Any
+
+import anyio
+import anyio.to_thread
+from mcp.server.stdio import stdio_server as sdk_stdio_server
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.logs import configure_logging
+from {{ cookiecutter.package_name }}.stdio import DEFAULT_CONCURRENCY, stdio_server
+
+from .common import format_report, summarize
+
+INITIALIZE = {
+    "protocolVersion": "2025-06-18",
+    "capabilities": {},
+    "clientInfo": {"name": "bench", "version": "1"},
+}
+
+
+def create_server() -> Server:
+    server = Server("bench")
+
+    @server.tool()
+    def echo(message: str) -> str:
+        return message
+
+    @server.tool()
+    async def wait(ms: float) -> str:
+        await asyncio.sleep(ms / 1000)
+        return "done"
+
+    return server
+
+
+def request_lines(calls: int, name: str, arguments: dict[str, Any]) -> bytes:
+    params = {"name": name, "arguments": arguments}
+    return "".join(
+        json.dumps({"jsonrpc": "2.0", "id": i, "method": "tools/call", "params": params}) + "\n"
+        for i in range(1, calls + 1)
+    ).encode()
+
+
+async def run_scenario(mode: str, concurrency: int, calls: int, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    """Pipeline `calls` requests to a fresh server and summarize their latencies."""
+    server = create_server()
+    server_in, client_out = os.pipe()
+    client_in, server_out = os.pipe()
+    to_server, from_server = os.fdopen(client_out, "wb"), os.fdopen(client_in, "rb")
+    stdin, stdout = os.fdopen(server_in, "rb"), os.fdopen(server_out, "wb")
+    if mode == "sdk":
+        transport = sdk_stdio_server(
+            anyio.wrap_file(TextIOWrapper(stdin, encoding="utf-8")),
+            anyio.wrap_file(TextIOWrapper(stdout, encoding="utf-8")),
+        )
+    else:
+        transport = stdio_server(stdin, stdout, concurrency=1 if mode == "serial" else concurrency)
+
+    async def serve() -> None:
+        async with transport as (read_stream, write_stream):
+            await server._mcp_server.run(read_stream, write_stream, server._mcp_server.create_initialization_options())
+
+    def send(data: bytes) -> None:
+        to_server.write(data)
+        to_server.flush()
+
+    def read_responses(count: int) -> tuple[list[float], int]:
+        finished, errors = [], 0
+        for _ in range(count):
+            response = json.loads(from_server.readline())
+            finished.append(time.perf_counter())
+            errors += "error" in response or response["result"].get("isError", False)
+        return finished, errors
+
+    requests = request_lines(calls, name, arguments)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(serve)
+        initialize = {"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": INITIALIZE}
+        await anyio.to_thread.run_sync(send, (json.dumps(initialize) + "\n").encode())
+        await anyio.to_thread.run_sync(from_server.readline)
+        await anyio.to_thread.run_sync(send, b'{"jsonrpc": "2.0", "method": "notifications/initialized"}\n')
+
+        start = time.perf_counter()
+        # Written from another thread, so that a full pipe does not stop the responses being read
+        tg.start_soon(anyio.to_thread.run_sync, send, requests)
+        finished, errors = await anyio.to_thread.run_sync(read_responses, calls)
+        elapsed = time.perf_counter() - start
+        to_server.close()
+
+    for stream in (stdout, stdin, from_server):
+        stream.close()
+    return summarize([at - start for at in finished], elapsed, errors)
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Keep log output, the SDK's per-request lines included, out of the measurement
+    configure_logging(log_level="WARNING", log_queue=False)
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    workloads = {"echo": {"message": "benchmark"}, "wait": {"ms": args.wait_ms}}
+    results: dict[str, dict[str, Any]] = {}
+    for name, arguments in workloads.items():
+        for mode in ("sdk", "serial", "pipelined"):
+            print(f"🧪 {name} {mode}: {args.calls} calls")
+            results[f"{name} {mode}"] = await run_scenario(mode, args.concurrency, args.calls, name, arguments)
+    print()
+    print(format_report(results))
+
+
+def main(args: argparse.Namespace) -> None:
+    asyncio.run(run(args))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500, help="Requests written at once")
+    parser.add_argument("--wait-ms", type=float, default=2.0, help="Milliseconds each `wait` call sleeps")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Requests in flight when pipelined")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
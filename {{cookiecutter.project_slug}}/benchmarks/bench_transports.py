@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Load test for the stdio and streamable-http transports.
+
+Drives N concurrent MCP client sessions against the `echo`, `calculate` and
+`timestamp` tools and reports throughput and p50/p99/p999 latency. Results can
+be saved as a JSON baseline; later runs fail when they regress past a threshold.
+
+The "memory" scenario runs the same sessions against the server in this
+process over the in-memory transport. With no process, socket or encoding in
+between, it measures the server's dispatch alone; the gap to the other
+scenarios is what their transport costs. (In every scenario, the SDK client
+also checks each structured result against the tool's output schema.)
+
+Usage:
+    uv run python -m benchmarks.bench_transports --sessions 8 --calls 200
+    uv run python -m benchmarks.bench_transports --transport memory
+    uv run python -m benchmarks.bench_transports --save-baseline
+    uv run python -m benchmarks.bench_transports --check --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from mcp import ClientSession, StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from {{ cookiecutter.package_name }}.logs import configure_logging
+from {{ cookiecutter.package_name }}.memory import connect
+
+from .common import find_regressions, format_report, load_baseline, save_baseline, summarize
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+SERVER_COMMAND = [sys.executable, "-c", "from {{ cookiecutter.package_name }} import main; main()"]
+
+# The tool mix each session cycles through
+WORKLOAD: list[tuple[str, dict[str, Any]]] = [
+    ("echo", {"message": "benchmark"}),
+    ("calculate", {"operation": "multiply", "a": 6, "b": 7}),
+    ("timestamp", {"format": "unix"}),
+]
+
+
+@dataclass
+class SessionRun:
+    """Latencies and timing of the measured calls made on one session."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+
+
+async def drive_session(session: ClientSession, calls: int, warmup: int) -> SessionRun:
+    """Issue `warmup` unmeasured then `calls` measured tool calls on one session."""
+    run = SessionRun()
+    for i in range(warmup + calls):
+        if i == warmup:
+            run.started = time.perf_counter()
+        name, arguments = WORKLOAD[i % len(WORKLOAD)]
+        start = time.perf_counter()
+        result = await session.call_tool(name, arguments)
+        elapsed = time.perf_counter() - start
+        if i < warmup:
+            continue
+        run.latencies.append(elapsed)
+        if result.isError:
+            run.errors += 1
+    run.finished = time.perf_counter()
+    return run
+
+
+@asynccontextmanager
+async def stdio_session() -> AsyncIterator[ClientSession]:
+    """Spawn a stdio server and open a session to it."""
+    params = StdioServerParameters(
+        command=SERVER_COMMAND[0],
+        args=[*SERVER_COMMAND[1:], "--transport", "stdio", "--log-level", "WARNING"],
+    )
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+@asynccontextmanager
+async def http_session(url: str) -> AsyncIterator[ClientSession]:
+    """Open a session to a running streamable-http server."""
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+async def run_scenario(open_session: Any, sessions: int, calls: int, warmup: int) -> dict[str, Any]:
+    """Run `sessions` concurrent sessions and summarize their combined latencies."""
+    connected = 0
+    all_connected = asyncio.Event()
+
+    async def one() -> SessionRun:
+        nonlocal connected
+        async with open_session() as session:
+            # Start calling only once every session is up so the measured phases overlap
+            connected += 1
+            if connected == sessions:
+                all_connected.set()
+            await all_connected.wait()
+            return await drive_session(session, calls, warmup)
+
+    runs = await asyncio.gather(*(one() for _ in range(sessions)))
+    latencies = [latency for run in runs for latency in run.latencies]
+    elapsed = max(run.finished for run in runs) - min(run.started for run in runs)
+    return summarize(latencies, elapsed, sum(run.errors for run in runs))
+
+
+def wait_for_port(host: str, port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Poll until the server accepts connections instead of sleeping a fixed time."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited before it started listening")
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not listen on {host}:{port} within {timeout}s")
+
+
+@asynccontextmanager
+async def http_server(host: str, port: int, extra_args: list[str]) -> AsyncIterator[str]:
+    """Start a streamable-http server for the duration of the benchmark."""
+    process = subprocess.Popen(
+        [
+            *SERVER_COMMAND,
+            "--transport", "streamable-http",
+            "--host", host,
+            "--port", str(port),
+            "--log-level", "WARNING",
+            *extra_args,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(host, port, process)
+        yield f"http://{host}:{port}/mcp"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+async def main(args: argparse.Namespace) -> int:
+    results: dict[str, dict[str, Any]] = {}
+
+    if args.transport in ("memory", "all"):
+        print(f"🧪 memory: {args.sessions} sessions x {args.calls} calls")
+        # Keep log output, the SDK's per-request lines included, out of the measurement
+        configure_logging(log_level="WARNING", log_queue=False)
+        logging.getLogger("mcp").setLevel(logging.WARNING)
+        results["memory"] = await run_scenario(connect, args.sessions, args.calls, args.warmup)
+
+    if args.transport in ("stdio", "all"):
+        print(f"🧪 stdio: {args.sessions} sessions x {args.calls} calls")
+        results["stdio"] = await run_scenario(stdio_session, args.sessions, args.calls, args.warmup)
+
+    if args.transport in ("streamable-http", "all"):
+        print(f"🧪 streamable-http: {args.sessions} sessions x {args.calls} calls")
+        if args.url:
+            url = args.url
+            results["streamable-http"] = await run_scenario(
+                lambda: http_session(url), args.sessions, args.calls, args.warmup
+            )
+        else:
+            async with http_server(args.host, args.port, args.server_arg) as url:
+                results["streamable-http"] = await run_scenario(
+                    lambda: http_session(url), args.sessions, args.calls, args.warmup
+                )
+
+    print()
+    print(format_report(results))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+
+    if args.check:
+        regressions = find_regressions(results, load_baseline(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["memory", "stdio", "streamable-http", "all"], default="all")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent client sessions")
+    parser.add_argument("--calls", type=int, default=100, help="Measured calls per session")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured calls per session")
+    parser.add_argument("--url", help="Benchmark an already running streamable-http server")
+    parser.add_argument("--host", default="127.0.0.1", help="Host for the spawned HTTP server")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the spawned HTTP server")
+    parser.add_argument(
+        "--server-arg",
+        action="append",
+        default=[],
+        help="Extra argument for the spawned HTTP server (repeatable), e.g. --server-arg=--workers=4",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results to the baseline")
+    parser.add_argument("--check", action="store_true", help="Fail if results regress past the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed regression (0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
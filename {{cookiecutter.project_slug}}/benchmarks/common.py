@@ -0,0 +1,81 @@
+"""Shared helpers for benchmark statistics, baselines and regression checks."""
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Sequence
+
+# Metrics where a larger value is better; everything else is a latency.
+HIGHER_IS_BETTER = frozenset({"throughput"})
+# Metrics compared against the baseline. p999 is reported but too noisy to gate on.
+GATED_METRICS = ("throughput", "p50_ms", "p99_ms")
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: Sequence[float], elapsed: float, errors: int = 0) -> dict[str, Any]:
+    """Summarize per-call latencies (seconds) measured over `elapsed` seconds."""
+    ordered = sorted(latencies)
+    return {
+        "calls": len(ordered),
+        "errors": errors,
+        "throughput": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "p999_ms": percentile(ordered, 0.999) * 1000,
+    }
+
+
+def format_report(results: dict[str, dict[str, Any]]) -> str:
+    """Render results as a fixed-width table."""
+    lines = [f"{'scenario':<24} {'calls':>8} {'errors':>7} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9}"]
+    for name, result in results.items():
+        lines.append(
+            f"{name:<24} {result['calls']:>8} {result['errors']:>7} {result['throughput']:>10.1f} "
+            f"{result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['p999_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, Any]]:
+    """Load a saved baseline, or an empty one if the file does not exist."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, results: dict[str, dict[str, Any]]) -> None:
+    """Merge `results` into the baseline file at `path`."""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Describe every gated metric that is worse than the baseline by more than `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in GATED_METRICS:
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                change = (old - new) / old
+            else:
+                change = (new - old) / old
+            if change > threshold:
+                regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f} ({change:+.1%} worse)")
+    return regressions
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Load script for admission control on the streamable-http transport.
+
+Opens N sessions and has each fire tool calls as fast as it can, several at a
+time, against a server started with the given limits. Reports how many calls
+were admitted and how many were rejected (HTTP 429 or a RATE_LIMITED JSON-RPC
+error), with the latency of each group: rejections are meant to be fast.
+Exits with 1 if a 429 came without a Retry-After header, or if limits were set
+and nothing was rejected.
+
+Usage:
+    uv run python -m benchmarks.load_admission --max-in-flight 4
+    uv run python -m benchmarks.load_admission --session-rate 20 --tool-rate 100
+    uv run python -m benchmarks.load_admission --url http://127.0.0.1:8000/mcp
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from .bench_transports import http_server
+from .common import format_report, summarize
+
+# Implementation-defined JSON-RPC error code used for rate-limited tool calls
+RATE_LIMITED = -32029
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+CALL = {"name": "calculate", "arguments": {"operation": "add", "a": 1, "b": 2}}
+
+
+def read_message(response: httpx.Response) -> dict[str, Any]:
+    """The JSON-RPC message in a JSON or single-event SSE response."""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        data = [line[5:].strip() for line in response.text.splitlines() if line.startswith("data:")]
+        return json.loads(data[-1])
+    return response.json()
+
+
+async def open_session(client: httpx.AsyncClient, url: str) -> str:
+    """Initialize a session and return its id."""
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 0,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "load-admission", "version": "0"},
+        },
+    }
+    response = await client.post(url, json=initialize, headers=HEADERS)
+    response.raise_for_status()
+    session_id = response.headers["mcp-session-id"]
+    headers = {**HEADERS, "mcp-session-id": session_id}
+    await client.post(url, json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=headers)
+    return session_id
+
+
+async def call(client: httpx.AsyncClient, url: str, session_id: str, request_id: int) -> tuple[str, float]:
+    """Make one tool call and classify the outcome."""
+    message = {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": CALL}
+    start = time.perf_counter()
+    response = await client.post(url, json=message, headers={**HEADERS, "mcp-session-id": session_id})
+    elapsed = time.perf_counter() - start
+    if response.status_code == 429:
+        return ("http_429" if "retry-after" in response.headers else "http_429_no_retry_after"), elapsed
+    if response.status_code != 200:
+        return f"http_{response.status_code}", elapsed
+    error = read_message(response).get("error")
+    if error is None:
+        return "admitted", elapsed
+    return ("rate_limited" if error["code"] == RATE_LIMITED else "error"), elapsed
+
+
+async def run_load(url: str, sessions: int, requests: int, concurrency: int) -> tuple[Counter, dict[str, list[float]], float]:
+    limits = httpx.Limits(max_connections=sessions * concurrency)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+        session_ids = [await open_session(client, url) for _ in range(sessions)]
+        outcomes: Counter = Counter()
+        latencies: dict[str, list[float]] = {"admitted": [], "rejected": []}
+        counter = iter(range(1, sessions * requests + 1))
+
+        async def worker(session_id: str, count: int) -> None:
+            for _ in range(count):
+                outcome, elapsed = await call(client, url, session_id, next(counter))
+                outcomes[outcome] += 1
+                group = "admitted" if outcome == "admitted" else "rejected"
+                latencies[group].append(elapsed)
+
+        per_worker = max(1, requests // concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(session_id, per_worker) for session_id in session_ids for _ in range(concurrency))
+        )
+        return outcomes, latencies, time.perf_counter() - start
+
+
+async def main(args: argparse.Namespace) -> int:
+    server_args = [
+        f"--max-in-flight={args.max_in_flight}",
+        f"--session-rate={args.session_rate}",
+        f"--tool-rate={args.tool_rate}",
+    ]
+    limited = bool(args.max_in_flight or args.session_rate or args.tool_rate)
+    print(f"🧪 {args.sessions} sessions x {args.requests} calls, {args.concurrency} at a time per session")
+
+    if args.url:
+        outcomes, latencies, elapsed = await run_load(args.url, args.sessions, args.requests, args.concurrency)
+    else:
+        print(f"   server limits: {' '.join(server_args)}")
+        async with http_server(args.host, args.port, server_args) as url:
+            outcomes, latencies, elapsed = await run_load(url, args.sessions, args.requests, args.concurrency)
+
+    print()
+    print(format_report({group: summarize(values, elapsed) for group, values in latencies.items()}))
+    print()
+    for outcome, count in sorted(outcomes.items()):
+        print(f"   {outcome:<24} {count:>8}")
+
+    if outcomes["http_429_no_retry_after"]:
+        print("\n❌ Some 429 responses had no Retry-After header")
+        return 1
+    if limited and not args.url and not latencies["rejected"]:
+        print("\n❌ Limits were set but no call was rejected; raise the load")
+        return 1
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=4, help="Client sessions")
+    parser.add_argument("--requests", type=int, default=200, help="Tool calls per session")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight per session")
+    parser.add_argument("--max-in-flight", type=int, default=0, help="Server --max-in-flight")
+    parser.add_argument("--session-rate", type=float, default=0, help="Server --session-rate")
+    parser.add_argument("--tool-rate", type=float, default=0, help="Server --tool-rate")
+    parser.add_argument("--url", help="Load an already running server instead (its own limits apply)")
+    parser.add_argument("--host", default="127.0.0.1", help="Host for the spawned HTTP server")
+    parser.add_argument("--port", type=int, default=8766, help="Port for the spawned HTTP server")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -7,4 +7,9 @@ set +a
 
 set -x
 
-exec uv run {{ cookiecutter.package_entrypoint }} --transport streamable-http --host 0.0.0.0 --port 9080
+# Run the server from the venv rather than through `uv run`, so that it is the
+# container's main process and receives SIGTERM itself. It then fails /readyz
+# for DRAIN_DELAY seconds, lets in-flight calls finish for up to DRAIN_TIMEOUT
+# seconds and exits. Keep DRAIN_TIMEOUT below the pod's termination grace period.
+exec .venv/bin/{{ cookiecutter.package_entrypoint }} --transport streamable-http --host 0.0.0.0 --port 9080 \
+    --drain-delay "${DRAIN_DELAY:-5}" --drain-timeout "${DRAIN_TIMEOUT:-20}"
@@ -0,0 +1,36 @@
+"""Shared fixtures."""
+
+import asyncio
+
+import pytest
+
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.plugins import configure_plugins
+
+# Finding plugins reads the metadata of every installed distribution, for
+# each server a test creates. Tests of plugins enable them again.
+configure_plugins(enabled=False)
+
+
+@pytest.fixture
+async def session():
+    """A client session to `create_server()` over the in-memory transport."""
+    connected: asyncio.Future = asyncio.get_running_loop().create_future()
+    done = asyncio.Event()
+
+    async def hold() -> None:
+        # The connection's task group must be entered and exited in one task,
+        # but pytest-asyncio sets fixtures up and tears them down in different ones
+        try:
+            async with connect() as session:
+                connected.set_result(session)
+                await done.wait()
+        except BaseException as error:
+            if not connected.done():
+                connected.set_exception(error)
+            raise
+
+    task = asyncio.create_task(hold())
+    yield await connected
+    done.set()
+    await task
@@ -0,0 +1,118 @@
+"""Tests for in-flight limits and per-session and per-tool rate limits."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from mcp.shared.exceptions import McpError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from {{ cookiecutter.package_name }}.admission import (
+    RATE_LIMITED,
+    AdmissionMiddleware,
+    KeyedLimiter,
+    TokenBucket,
+    configure_admission,
+    settings,
+)
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.server import create_server
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    saved = dict(settings)
+    yield
+    configure_admission(**saved)
+
+
+def test_token_bucket_allows_a_burst_then_reports_the_wait():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = bucket.acquire()
+    assert 0.09 < wait <= 0.1
+
+
+def test_keyed_limiter_is_bounded():
+    limiter = KeyedLimiter(rate=1, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        assert limiter.acquire(key) == 0.0
+    assert limiter.acquire("c") > 0
+    # "a" was evicted, so it starts again with a full bucket
+    assert limiter.acquire("a") == 0.0
+
+
+def make_app(**limits) -> tuple[AdmissionMiddleware, Starlette]:
+    release = asyncio.Event()
+
+    async def mcp(request: Request) -> Response:
+        if request.query_params.get("wait"):
+            await release.wait()
+        return JSONResponse({"ok": True})
+
+    app = Starlette(routes=[Route("/mcp", mcp, methods=["GET", "POST"])])
+    app.state.release = release
+    return AdmissionMiddleware(app, **limits), app
+
+
+async def test_in_flight_limit_rejects_fast_with_retry_after():
+    middleware, app = make_app(max_in_flight=1)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as client:
+        slow = asyncio.create_task(client.post("/mcp?wait=1"))
+        while middleware.in_flight == 0:
+            await asyncio.sleep(0.001)
+
+        response = await client.post("/mcp")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["error"]["code"] == RATE_LIMITED
+        # The long-lived GET stream is not counted or limited
+        assert (await client.get("/mcp")).status_code == 200
+
+        app.state.release.set()
+        assert (await slow).status_code == 200
+        assert (await client.post("/mcp")).status_code == 200
+    assert middleware.rejected == {"in_flight": 1}
+
+
+async def test_session_rate_is_per_session():
+    middleware, _ = make_app(session_rate=1, session_burst=2)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as client:
+        first = {"mcp-session-id": "first"}
+        assert [(await client.post("/mcp", headers=first)).status_code for _ in range(3)] == [200, 200, 429]
+        assert (await client.post("/mcp", headers={"mcp-session-id": "second"})).status_code == 200
+    assert middleware.rejected == {"session_rate": 1}
+
+
+async def test_tool_rate_is_a_jsonrpc_error():
+    configure_admission(tool_rate=1, tool_burst=2)
+    server = create_server()
+    rejected = server.metrics.rejected.get("tool_rate", 0)
+    async with connect(server) as session:
+        for _ in range(2):
+            assert not (await session.call_tool("echo", {"message": "x"})).isError
+        with pytest.raises(McpError) as error:
+            await session.call_tool("echo", {"message": "x"})
+        assert error.value.error.code == RATE_LIMITED
+        assert error.value.error.data["retryAfter"] > 0
+
+        # Other tools have their own bucket; batch items are limited too
+        result = await session.call_tool(
+            "batch", {"calls": [{"name": "echo", "arguments": {"message": "x"}}, {"name": "timestamp"}]}
+        )
+        echo, timestamp = (json.loads(block.text) for block in result.content)
+        assert "Rate limit exceeded for tool echo" in echo["error"]
+        assert timestamp["ok"]
+    assert server.metrics.rejected["tool_rate"] == rejected + 2
+
+
+def test_http_app_applies_configured_limits():
+    from {{ cookiecutter.package_name }}.app import create_http_app
+
+    assert not any(m.cls is AdmissionMiddleware for m in create_http_app().user_middleware)
+    configure_admission(max_in_flight=8)
+    assert any(m.cls is AdmissionMiddleware for m in create_http_app().user_middleware)
@@ -0,0 +1,54 @@
+"""Tests for the element-wise calculate_array tool."""
+
+import json
+
+import pytest
+
+from {{ cookiecutter.package_name }}.arrays import MAX_ELEMENTS, calculate_elementwise, numpy_module
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(numpy_module() is None, reason="NumPy not installed")),
+]
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+@pytest.mark.parametrize(
+    "operation, expected",
+    [("add", [5.0, 2.0, 4.5]), ("subtract", [-3.0, 2.0, -3.5]), ("multiply", [4.0, 0.0, 2.0])],
+)
+def test_operations(use_numpy, operation, expected):
+    result = calculate_elementwise(operation, [1, 2, 0.5], [4, 0, 4], use_numpy=use_numpy)
+    assert result.results == expected
+    assert result.errors == []
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_division_by_zero_is_reported_per_element(use_numpy):
+    result = calculate_elementwise("divide", [1, 2, 0, 9], [2, 0, 0, 3], use_numpy=use_numpy)
+    assert result.results == [0.5, None, None, 3.0]
+    assert [(error.index, error.error) for error in result.errors] == [
+        (1, "Cannot divide by zero"),
+        (2, "Cannot divide by zero"),
+    ]
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError, match="Unknown operation"):
+        calculate_elementwise("power", [1], [1])
+    with pytest.raises(ValueError, match="differ in length"):
+        calculate_elementwise("add", [1, 2], [1])
+    with pytest.raises(ValueError, match="At most"):
+        calculate_elementwise("add", [0.0] * (MAX_ELEMENTS + 1), [0.0] * (MAX_ELEMENTS + 1))
+
+
+async def test_tool_returns_structured_results(session):
+    result = await session.call_tool(
+        "calculate_array", {"operation": "divide", "a": [1, 4], "b": [0, 2]}
+    )
+    assert not result.isError
+    assert json.loads(result.content[0].text)["results"] == [None, 2.0]
+
+    oversized = [1.0] * (MAX_ELEMENTS + 1)
+    result = await session.call_tool("calculate_array", {"operation": "add", "a": oversized, "b": oversized})
+    assert result.isError
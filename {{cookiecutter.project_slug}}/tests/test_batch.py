@@ -0,0 +1,108 @@
+"""Tests for the batch tool."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from {{ cookiecutter.package_name }}.batch import configure_batch, limits
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+
+
+@pytest.fixture(autouse=True)
+def restore_limits():
+    saved = dict(limits)
+    yield
+    limits.update(saved)
+
+
+def items(result) -> list[dict]:
+    """The per-call results of a batch, in order."""
+    return [json.loads(block.text) for block in result.content]
+
+
+async def test_results_come_back_in_order_with_per_item_errors(session):
+    result = await session.call_tool(
+        "batch",
+        {
+            "calls": [
+                {"name": "calculate", "arguments": {"operation": "add", "a": 1, "b": 2}},
+                {"name": "calculate", "arguments": {"operation": "divide", "a": 1, "b": 0}},
+                {"name": "echo", "arguments": {"message": "hi"}},
+                {"name": "missing"},
+            ]
+        },
+    )
+
+    assert not result.isError
+    first, second, third, fourth = items(result)
+    assert first["ok"] and first["content"][0]["text"] == "3.0"
+    assert not second["ok"] and "Cannot divide by zero" in second["error"]
+    assert third["content"][0]["text"] == "Echo: hi"
+    assert not fourth["ok"] and "Unknown tool" in fourth["error"]
+
+
+@pytest.mark.slow
+async def test_calls_run_concurrently_up_to_the_limit():
+    server = Server("test")
+    server.add_batch_tool()
+    running = 0
+    peak = 0
+
+    @server.tool()
+    async def wait(seconds: float) -> float:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(seconds)
+        running -= 1
+        return seconds
+
+    configure_batch(max_concurrency=3)
+    calls = [{"name": "wait", "arguments": {"seconds": 0.02}} for _ in range(6)]
+    async with connect(server) as session:
+        start = time.perf_counter()
+        result = await session.call_tool("batch", {"calls": calls})
+        elapsed = time.perf_counter() - start
+
+    assert all(item["ok"] for item in items(result))
+    assert peak == 3
+    assert elapsed < 6 * 0.02
+
+
+async def test_oversized_and_nested_batches_are_rejected(session):
+    configure_batch(max_calls=2)
+    echo = {"name": "echo", "arguments": {"message": "x"}}
+    result = await session.call_tool("batch", {"calls": [echo] * 3})
+    assert result.isError
+    assert "exceeds the limit of 2" in result.content[0].text
+
+    result = await session.call_tool("batch", {"calls": [{"name": "batch", "arguments": {"calls": []}}]})
+    assert items(result)[0]["error"] == "Batches cannot be nested"
+
+
+async def test_items_have_their_output_validated_like_direct_calls():
+    server = Server("test")
+    server.add_batch_tool()
+
+    @server.tool()
+    def count() -> int:
+        return -1
+
+    # A schema stricter than the return annotation, so only validation catches it
+    server._tool_manager.get_tool("count").fn_metadata.output_schema = {
+        "type": "object",
+        "properties": {"result": {"type": "integer", "minimum": 0}},
+        "required": ["result"],
+    }
+    async with connect(server) as session:
+        direct = await session.call_tool("count", {})
+        batched = await session.call_tool("batch", {"calls": [{"name": "count"}]})
+
+    assert direct.isError
+    assert direct.content[0].text == "Output validation error: -1 is less than the minimum of 0"
+    assert items(batched) == [
+        {"ok": False, "content": None, "structured": None, "error": direct.content[0].text}
+    ]
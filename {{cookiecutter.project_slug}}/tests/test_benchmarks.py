@@ -0,0 +1,35 @@
+"""Tests for the benchmark statistics and regression checks."""
+
+from benchmarks.common import find_regressions, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 1001)]
+    assert percentile(values, 0.50) == 500.0
+    assert percentile(values, 0.99) == 990.0
+    assert percentile(values, 0.999) == 999.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_summarize():
+    result = summarize([0.001, 0.002, 0.003, 0.004], elapsed=0.5, errors=1)
+    assert result["calls"] == 4
+    assert result["errors"] == 1
+    assert result["throughput"] == 8.0
+    assert result["p50_ms"] == 2.0
+
+
+def test_find_regressions():
+    baseline = {"stdio": {"throughput": 1000.0, "p50_ms": 1.0, "p99_ms": 5.0}}
+
+    within = {"stdio": {"throughput": 950.0, "p50_ms": 1.05, "p99_ms": 5.2}}
+    assert find_regressions(within, baseline, threshold=0.10) == []
+
+    slower = {"stdio": {"throughput": 800.0, "p50_ms": 1.0, "p99_ms": 7.0}}
+    regressions = find_regressions(slower, baseline, threshold=0.10)
+    assert len(regressions) == 2
+    assert any("throughput" in r for r in regressions)
+    assert any("p99_ms" in r for r in regressions)
+
+    # Scenarios without a baseline are never regressions
+    assert find_regressions({"streamable-http": slower["stdio"]}, baseline, threshold=0.10) == []
@@ -0,0 +1,102 @@
+"""Tests for the tool and resource result cache."""
+
+from {{ cookiecutter.package_name }} import cache as cache_module
+from {{ cookiecutter.package_name }}.cache import MISSING, ResultCache, make_key
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+
+
+def test_keys_are_canonical():
+    assert make_key({"a": 1, "b": 2}) == make_key({"b": 2, "a": 1})
+    assert make_key({"a": 1}) != make_key({"a": 2})
+    assert make_key(None) == make_key({})
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2}
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    cache = ResultCache(ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock[0] = 0.06
+    assert cache.get("a") is MISSING
+
+
+async def test_cached_tool_runs_once_per_arguments():
+    server = Server("test")
+    calls = []
+
+    @server.tool(cache=True)
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    @server.tool()
+    def uncached(x: int) -> int:
+        calls.append(x)
+        return x
+
+    async with connect(server) as session:
+        for _ in range(3):
+            result = await session.call_tool("square", {"x": 4})
+            assert result.content[0].text == "16"
+        await session.call_tool("square", {"x": 5})
+        await session.call_tool("uncached", {"x": 1})
+        await session.call_tool("uncached", {"x": 1})
+
+    assert calls == [4, 5, 1, 1]
+    assert server.cache_stats()["tool:square"]["hits"] == 2
+    assert "tool:uncached" not in server.cache_stats()
+
+
+async def test_errors_are_not_cached():
+    server = Server("test")
+    calls = []
+
+    @server.tool(cache=True)
+    def fails() -> str:
+        calls.append(None)
+        raise ValueError("nope")
+
+    async with connect(server) as session:
+        assert (await session.call_tool("fails", {})).isError
+        assert (await session.call_tool("fails", {})).isError
+    assert len(calls) == 2
+
+
+async def test_cached_resource_is_built_once():
+    server = Server("test")
+    calls = []
+
+    @server.resource("data://static", cache=True)
+    def static() -> str:
+        calls.append(None)
+        return "payload"
+
+    async with connect(server) as session:
+        for _ in range(3):
+            result = await session.read_resource("data://static")
+            assert result.contents[0].text == "payload"
+
+    assert len(calls) == 1
+    assert server.cache_stats()["resource:data://static"]["hits"] == 2
+
+
+def test_template_server_caches_only_deterministic_tools():
+    from {{ cookiecutter.package_name }}.server import create_server
+
+    stats = create_server().cache_stats()
+    assert {"tool:echo", "tool:calculate", "resource:config://settings"} <= set(stats)
+    assert "tool:timestamp" not in stats
@@ -0,0 +1,117 @@
+"""Tests for single-flight coalescing of identical concurrent calls."""
+
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+from {{ cookiecutter.package_name }}.coalesce import SingleFlight
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+
+
+def make_server(gate: asyncio.Event, calls: list) -> Server:
+    server = Server("test")
+
+    @server.tool(coalesce=True)
+    async def lookup(key: str) -> str:
+        calls.append(key)
+        await gate.wait()
+        if key == "missing":
+            raise KeyError(key)
+        return key.upper()
+
+    @server.resource("config://settings", coalesce=True)
+    async def settings() -> str:
+        calls.append("settings")
+        await gate.wait()
+        return "{}"
+
+    return server
+
+
+async def release(gate: asyncio.Event, server: Server, callers: int) -> None:
+    """Open `gate` once all `callers` have started or joined a call."""
+    while sum(stats["executions"] + stats["coalesced"] for stats in server.coalesce_stats().values()) < callers:
+        await asyncio.sleep(0.001)
+    gate.set()
+
+
+async def test_identical_concurrent_calls_share_one_execution():
+    gate, calls = asyncio.Event(), []
+    server = make_server(gate, calls)
+
+    results = await asyncio.gather(
+        *[server.call_tool("lookup", {"key": "a"}) for _ in range(10)],
+        server.call_tool("lookup", {"key": "b"}),
+        release(gate, server, 11),
+    )
+
+    assert sorted(calls) == ["a", "b"]
+    texts = [result[0][0].text for result in results[:11]]
+    assert texts == ["A"] * 10 + ["B"]
+    assert server.coalesce_stats()["tool:lookup"] == {"executions": 2, "coalesced": 9, "in_flight": 0}
+    # Nothing is kept afterwards: a later call runs again
+    await server.call_tool("lookup", {"key": "a"})
+    assert calls.count("a") == 2
+
+
+async def test_errors_reach_every_caller_and_are_not_kept():
+    gate, calls = asyncio.Event(), []
+    server = make_server(gate, calls)
+
+    results = await asyncio.gather(
+        *[server.call_tool("lookup", {"key": "missing"}) for _ in range(3)],
+        release(gate, server, 3),
+        return_exceptions=True,
+    )
+
+    assert calls == ["missing"]
+    assert all("missing" in str(error) for error in results[:3])
+    assert server.coalesce_stats()["tool:lookup"]["in_flight"] == 0
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+    gate = asyncio.Event()
+
+    async def execute() -> int:
+        await gate.wait()
+        return 42
+
+    first = asyncio.create_task(flights.run("k", execute))
+    second = asyncio.create_task(flights.run("k", execute))
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+
+    assert await second == 42
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert flights.stats() == {"executions": 1, "coalesced": 1, "in_flight": 0}
+
+
+async def test_concurrent_resource_reads_across_sessions_share_one_read():
+    gate, calls = asyncio.Event(), []
+    server = make_server(gate, calls)
+
+    async with AsyncExitStack() as stack:
+        sessions = [await stack.enter_async_context(connect(server)) for _ in range(5)]
+        results = await asyncio.gather(
+            *[session.read_resource("config://settings") for session in sessions], release(gate, server, 5)
+        )
+
+    assert calls == ["settings"]
+    assert {result.contents[0].text for result in results[:5]} == {"{}"}
+    # Every read still carries the ETag of the shared contents
+    assert len({result.contents[0].meta["etag"] for result in results[:5]}) == 1
+    assert server.coalesce_stats()["resource:config://settings"]["coalesced"] == 4
+
+
+def test_streaming_tools_cannot_coalesce():
+    server = Server("test")
+    with pytest.raises(TypeError, match="coalescing"):
+
+        @server.tool(coalesce=True)
+        async def export():
+            yield "row"
@@ -0,0 +1,97 @@
+"""Tests for offloading sync tools to bounded pools."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.exceptions import ToolError
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.executors import Pool, PoolFullError, offload
+from {{ cookiecutter.package_name }}.memory import connect
+
+
+def blocking_sleep(seconds: float) -> str:
+    time.sleep(seconds)
+    return threading.current_thread().name
+
+
+def process_id() -> int:
+    return os.getpid()
+
+
+@pytest.mark.slow
+async def test_thread_tool_does_not_block_the_loop():
+    server = Server("test")
+    server.tool(executor="thread")(blocking_sleep)
+
+    async with connect(server) as session:
+        start = time.perf_counter()
+        slow = asyncio.create_task(session.call_tool("blocking_sleep", {"seconds": 0.3}))
+        await asyncio.sleep(0.01)
+        # The loop stays responsive while the tool sleeps in a worker thread
+        assert time.perf_counter() - start < 0.2
+
+        result = await slow
+    assert "tool-worker" in result.content[0].text
+
+
+@pytest.mark.slow
+async def test_process_tool_runs_in_another_process():
+    server = Server("test")
+    server.tool(executor="process")(process_id)
+
+    async with connect(server) as session:
+        result = await session.call_tool("process_id", {})
+    assert int(result.content[0].text) != os.getpid()
+
+
+async def test_full_pool_rejects_calls():
+    pool = Pool("thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    stats = pool.stats()
+    assert stats["in_flight"] == 2
+    assert stats["queued"] == 1
+    with pytest.raises(PoolFullError):
+        await pool.run(time.sleep, 0)
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(*running)
+    assert pool.stats()["in_flight"] == 0
+    assert pool.stats()["completed"] == 2
+    pool.shutdown()
+
+
+async def test_pool_full_surfaces_as_tool_error():
+    server = Server("test")
+    server.tool(executor="thread")(blocking_sleep)
+    from {{ cookiecutter.package_name }}.executors import pools
+
+    pool = pools["thread"]
+    saved = pool.max_workers, pool.max_queue, pool.in_flight
+    pool.max_workers, pool.max_queue, pool.in_flight = 1, 0, 1
+    try:
+        with pytest.raises(ToolError, match="pool is full"):
+            await server.call_tool("blocking_sleep", {"seconds": 0})
+    finally:
+        pool.max_workers, pool.max_queue, pool.in_flight = saved
+
+
+def test_only_plain_sync_functions_can_be_offloaded():
+    async def async_tool() -> str:
+        return ""
+
+    def context_tool(ctx: Context) -> str:
+        return ""
+
+    with pytest.raises(TypeError):
+        offload(async_tool, "thread")
+    with pytest.raises(TypeError):
+        offload(context_tool, "thread")
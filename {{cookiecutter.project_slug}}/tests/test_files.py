@@ -0,0 +1,146 @@
+"""Tests for memory-mapped file resources served in chunks."""
+
+import base64
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from mcp.client.session import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    BlobResourceContents,
+    ReadResourceRequest,
+    ReadResourceRequestParams,
+    ReadResourceResult,
+)
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.files import MappedFileResource, guess_mime_type
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.resources import ETAG, NOT_MODIFIED
+
+
+async def read(session: ClientSession, uri: str, **meta) -> ReadResourceResult:
+    params = ReadResourceRequestParams.model_validate({"uri": uri, "_meta": meta})
+    return await session.send_request(ReadResourceRequest(params=params), ReadResourceResult)
+
+
+async def read_all(session: ClientSession, uri: str, length: int | None = None) -> list:
+    """Follow nextOffset from the start to the end of the file."""
+    items, offset = [], 0
+    while offset is not None:
+        item = (await read(session, uri, range={"offset": offset, "length": length})).contents[0]
+        items.append(item)
+        offset = item.meta.get("nextOffset")
+    return items
+
+
+@pytest.mark.parametrize(
+    "name, mime_type",
+    [
+        ("rows.csv", "text/csv"),
+        ("events.jsonl", "application/x-ndjson"),
+        ("rows.csv.gz", "application/octet-stream"),
+        ("blob.unknown", "application/octet-stream"),
+    ],
+)
+def test_mime_type_is_guessed_from_the_extension(name, mime_type):
+    assert guess_mime_type(Path(name)) == mime_type
+
+
+async def test_text_file_is_served_in_chunks(tmp_path):
+    text = "".join(f"{i},héllo wörld\n" for i in range(2000))
+    path = tmp_path / "rows.csv"
+    path.write_text(text, encoding="utf-8")
+    server = Server("test")
+    server.file_resource("data://rows", path, chunk_size=1000)
+
+    async with connect(server) as session:
+        items = await read_all(session, "data://rows")
+        # A client cannot ask for more than chunk_size
+        big = (await read(session, "data://rows", range={"offset": 0, "length": 10**9})).contents[0]
+
+    size = len(text.encode())
+    assert len(items) > size // 1000
+    assert all(item.mimeType == "text/csv" and item.meta["size"] == size for item in items)
+    assert all(item.meta["length"] <= 1000 for item in items)
+    # Chunks never split a character, so they join back into the file
+    assert "".join(item.text for item in items) == text
+    assert big.meta["length"] <= 1000
+
+
+async def test_binary_file_is_served_as_blobs(tmp_path):
+    data = bytes(range(256)) * 40
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    server = Server("test")
+    server.file_resource("data://bin", path, chunk_size=4096)
+
+    async with connect(server) as session:
+        items = await read_all(session, "data://bin", length=3000)
+
+    assert all(isinstance(item, BlobResourceContents) for item in items)
+    assert [item.meta["offset"] for item in items] == [0, 3000, 6000, 9000]
+    assert b"".join(base64.b64decode(item.blob) for item in items) == data
+
+
+async def test_etag_follows_the_file_and_bad_ranges_are_errors(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("first")
+    server = Server("test")
+    server.file_resource("data://notes", path)
+
+    async with connect(server) as session:
+        etag = (await session.read_resource("data://notes")).contents[0].meta[ETAG]
+        unchanged = (await read(session, "data://notes", ifNoneMatch=etag)).contents[0]
+        assert unchanged.meta[NOT_MODIFIED]
+
+        path.write_text("second version")
+        changed = (await read(session, "data://notes", ifNoneMatch=etag)).contents[0]
+        assert changed.text == "second version"
+        assert changed.meta[ETAG] != etag
+
+        with pytest.raises(McpError):
+            await read(session, "data://notes", range={"offset": 1000})
+        with pytest.raises(McpError):
+            await read(session, "data://notes", range={"offset": -1})
+
+
+def test_text_ranges_are_aligned_to_characters(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("€uro", encoding="utf-8")
+    resource = MappedFileResource.from_path("data://notes", path)
+
+    # Shorter than the character at the offset: the whole character
+    first = resource.read_range(0, 1)
+    assert (first.content, first.meta["length"], first.meta["nextOffset"]) == ("€", 3, 3)
+    # Inside a character: from the next one
+    inside = resource.read_range(1, 2)
+    assert (inside.content, inside.meta["offset"], inside.meta["nextOffset"]) == ("u", 3, 4)
+    assert resource.read_range(2).content == "uro"
+
+    path.write_bytes(b"caf\xe9")
+    with pytest.raises(UnicodeDecodeError):
+        resource.read_range()
+
+
+def test_memory_stays_flat_for_large_files(tmp_path):
+    path = tmp_path / "large.log"
+    with open(path, "wb") as f:
+        f.write(b"x" * 16 * 1024 * 1024)
+    resource = MappedFileResource.from_path("data://large", path)
+    readers = [MappedFileResource.from_path("data://large", path) for _ in range(4)]
+
+    tracemalloc.start()
+    try:
+        offset = 0
+        while offset is not None:
+            for reader in (resource, *readers):
+                chunk = reader.read_range(offset)
+            offset = chunk.meta.get("nextOffset")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A couple of chunks (bytes and decoded text), not the 16 MiB file
+    assert peak < 8 * resource.chunk_size
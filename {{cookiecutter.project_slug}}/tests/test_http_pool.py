@@ -0,0 +1,185 @@
+"""Tests for the pooled HTTP client, against a small HTTP server in the test's event loop."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from mcp.server.fastmcp import Context
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.http_pool import HTTPPool
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.metrics import render
+
+
+class Service:
+    """A keep-alive HTTP/1.1 server that counts connections and concurrent requests.
+
+    `/ok` answers at once, `/slow` after 0.1 s, `/hang` once closed, and `/flaky`
+    answers 503 to its first `failures` requests.
+    """
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.connections = 0
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+        self._closed = asyncio.Event()
+        self._handlers: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._server.close()
+        self._closed.set()
+        for writer in self._handlers.values():
+            writer.close()
+        await asyncio.gather(*self._handlers)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                method, path, _ = head.split(b"\r\n", 1)[0].decode().split(" ")
+                headers = head.lower().split(b"\r\n")
+                length = next((int(h.split(b":")[1]) for h in headers if h.startswith(b"content-length:")), 0)
+                await reader.readexactly(length)
+                status, body = await self._handle(method, path)
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, method: str, path: str) -> tuple[int, bytes]:
+        self.requests += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if path == "/slow":
+                await asyncio.sleep(0.1)
+            elif path == "/hang":
+                await self._closed.wait()
+            elif path == "/flaky" and self.failures:
+                self.failures -= 1
+                return 503, b"unavailable"
+            return 200, json.dumps({"method": method, "path": path}).encode()
+        finally:
+            self.active -= 1
+
+
+async def test_connections_are_kept_alive_and_reused():
+    pool = HTTPPool()
+    service = Service()
+    async with service as url:
+        for _ in range(5):
+            response = await pool.get(f"{url}/ok")
+            assert response.json() == {"method": "GET", "path": "/ok"}
+        stats = pool.stats()
+        await pool.aclose()
+        assert pool.stats()["connections"] == 0
+        # A closed pool opens a new client on its next request
+        assert (await pool.get(f"{url}/ok")).status_code == 200
+        await pool.aclose()
+
+    assert service.connections == 2  # One for the five requests, one after closing
+    assert stats["connections"] == stats["idle_connections"] == 1
+    assert stats["requests"] == 5 and stats["retries"] == stats["errors"] == 0
+
+
+@pytest.mark.slow
+async def test_requests_to_one_host_are_limited():
+    pool = HTTPPool(max_per_host=2)
+    service = Service()
+    async with service as url:
+        calls = [asyncio.create_task(pool.get(f"{url}/slow")) for _ in range(6)]
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        await asyncio.gather(*calls)
+        await pool.aclose()
+
+    host = url.removeprefix("http://")
+    assert stats["in_flight"] == {host: 2}
+    assert stats["waiting"] == {host: 4}
+    assert service.peak == 2
+    assert service.connections == 2  # The waiting requests reuse the two connections
+    assert pool.stats()["in_flight"] == pool.stats()["waiting"] == {}
+
+
+async def test_idempotent_requests_are_retried_on_unavailable():
+    pool = HTTPPool(backoff=0)
+    service = Service(failures=2)
+    async with service as url:
+        response = await pool.get(f"{url}/flaky")
+        service.failures = 3
+        exhausted = await pool.get(f"{url}/flaky")
+        await pool.aclose()
+
+    assert response.status_code == 200
+    assert exhausted.status_code == 503  # Still failing after the 2 retries: returned as is
+    assert service.requests == 2 + 1 + 3
+    assert pool.stats()["retries"] == 4
+
+
+async def test_other_requests_are_not_retried():
+    pool = HTTPPool(backoff=0)
+    service = Service(failures=1)
+    async with service as url:
+        response = await pool.post(f"{url}/flaky", json={"order": 1})
+        await pool.aclose()
+
+    assert response.status_code == 503
+    assert service.requests == 1
+    assert pool.stats()["retries"] == 0
+
+
+@pytest.mark.slow
+async def test_timeouts_are_counted_as_errors():
+    pool = HTTPPool(timeout=0.05, retries=0)
+    async with Service() as url:
+        with pytest.raises(httpx.ReadTimeout):
+            await pool.get(f"{url}/hang")
+        await pool.aclose()
+    assert pool.stats()["errors"] == 1
+
+
+async def test_failed_connections_are_retried():
+    pool = HTTPPool(backoff=0, retries=1)
+    async with Service() as url:
+        pass  # Closed: nothing listens on its port any more
+    with pytest.raises(httpx.ConnectError):
+        await pool.post(f"{url}/ok")
+    await pool.aclose()
+    assert pool.stats()["retries"] == 1
+    assert pool.stats()["errors"] == 1
+
+
+async def test_tools_share_the_server_pool():
+    server = Server("test")
+
+    @server.tool()
+    async def fetch(url: str, ctx: Context) -> dict:
+        response = await ctx.fastmcp.http.get(url)
+        return response.json()
+
+    service = Service()
+    async with service as url, connect(server) as session:
+        for _ in range(3):
+            result = await session.call_tool("fetch", {"url": f"{url}/ok"})
+            assert json.loads(result.content[0].text) == {"method": "GET", "path": "/ok"}
+        text = render(server.metrics, http=server.http.stats())
+        await server.http.aclose()
+
+    assert service.connections == 1
+    assert "mcp_http_requests_total 3" in text
+    assert 'mcp_http_connections{state="idle"} 1' in text
+    assert "mcp_http_max_connections 100" in text
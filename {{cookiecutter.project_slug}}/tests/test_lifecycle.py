@@ -0,0 +1,107 @@
+"""Tests for readiness probes and connection draining."""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from {{ cookiecutter.package_name }}.lifecycle import (
+    SHUTTING_DOWN,
+    DrainMiddleware,
+    Lifecycle,
+    configure_lifecycle,
+    settings,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    saved = dict(settings)
+    yield
+    configure_lifecycle(**saved)
+
+
+def make_app(lifecycle: Lifecycle) -> tuple[DrainMiddleware, Starlette]:
+    release = asyncio.Event()
+
+    async def mcp(request: Request) -> Response:
+        if request.query_params.get("wait"):
+            await release.wait()
+        return JSONResponse({"ok": True})
+
+    app = Starlette(routes=[Route("/mcp", mcp, methods=["GET", "POST", "DELETE"])])
+    app.state.release = release
+    return DrainMiddleware(app, lifecycle), app
+
+
+def test_configured_settings_are_the_defaults():
+    configure_lifecycle(drain_timeout=5, drain_delay=1)
+    lifecycle = Lifecycle()
+    assert (lifecycle.drain_timeout, lifecycle.drain_delay) == (5, 1)
+    assert Lifecycle(drain_delay=0).drain_delay == 0
+
+
+async def test_probes_follow_the_lifecycle():
+    lifecycle = Lifecycle(drain_timeout=1)
+    middleware, _ = make_app(lifecycle)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as client:
+        assert (await client.get("/readyz")).status_code == 503
+        async with lifecycle.serving():
+            assert (await client.get("/readyz")).status_code == 200
+            await lifecycle.drain()
+            assert (await client.get("/readyz")).status_code == 503
+            assert (await client.get("/healthz")).status_code == 200
+
+
+async def test_drain_refuses_new_sessions_and_waits_for_requests_in_flight():
+    lifecycle = Lifecycle(drain_timeout=5)
+    middleware, app = make_app(lifecycle)
+    session = {"mcp-session-id": "s1"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as client:
+        slow = asyncio.create_task(client.post("/mcp?wait=1", headers=session))
+        while lifecycle.in_flight == 0:
+            await asyncio.sleep(0.001)
+
+        drain = asyncio.create_task(lifecycle.drain())
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+        response = await client.post("/mcp")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["error"]["code"] == SHUTTING_DOWN
+        assert (await client.get("/mcp", headers=session)).status_code == 503
+        # Existing sessions are still served until the drain completes
+        assert (await client.post("/mcp", headers=session)).status_code == 200
+
+        app.state.release.set()
+        assert (await slow).status_code == 200
+        assert await drain == 0
+        assert (await client.post("/mcp", headers=session)).status_code == 503
+    assert middleware.rejected == {"draining": 3}
+
+
+@pytest.mark.slow
+async def test_drain_delay_keeps_serving_and_timeout_gives_up():
+    lifecycle = Lifecycle(drain_timeout=0.2, drain_delay=0.1)
+    middleware, _ = make_app(lifecycle)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as client:
+        slow = asyncio.create_task(client.post("/mcp?wait=1", headers={"mcp-session-id": "s1"}))
+        await asyncio.sleep(0.05)
+        drain = asyncio.create_task(lifecycle.drain())
+        await asyncio.sleep(0.02)
+        # Not ready, but new sessions are still accepted while the load balancer catches up
+        assert (await client.post("/mcp")).status_code == 200
+        assert await drain == 1
+        slow.cancel()
+
+
+def test_http_app_serves_probes():
+    from {{ cookiecutter.package_name }}.app import create_http_app
+
+    app = create_http_app()
+    assert any(m.cls is DrainMiddleware for m in app.user_middleware)
+    assert isinstance(app.state.lifecycle, Lifecycle)
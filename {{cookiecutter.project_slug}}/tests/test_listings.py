@@ -0,0 +1,122 @@
+"""Tests for list responses cached per version of the registry."""
+
+import asyncio
+
+import pytest
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from {{ cookiecutter.package_name }} import listings
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.listings import DUMP_OPTIONS, DumpedResult
+from {{ cookiecutter.package_name }}.memory import connect
+
+
+def make_server(tools: int = 3) -> Server:
+    server = Server("test")
+    for i in range(tools):
+        server.add_tool(lambda: "ok", name=f"tool_{i}", description=f"Tool {i}")
+
+    @server.prompt()
+    def greet(name: str) -> str:
+        return f"Hello {name}"
+
+    @server.resource("config://settings")
+    def settings() -> str:
+        return "{}"
+
+    @server.resource("items://{item_id}")
+    def item(item_id: str) -> str:
+        return item_id
+
+    return server
+
+
+async def test_lists_are_built_once_for_every_session():
+    server = make_server()
+    for _ in range(3):
+        async with connect(server) as session:
+            tools = (await session.list_tools()).tools
+            prompts = (await session.list_prompts()).prompts
+            resources = (await session.list_resources()).resources
+            templates = (await session.list_resource_templates()).resourceTemplates
+
+    assert [tool.name for tool in tools] == ["tool_0", "tool_1", "tool_2"]
+    assert [prompt.name for prompt in prompts] == ["greet"]
+    assert [str(resource.uri) for resource in resources] == ["config://settings"]
+    assert [template.uriTemplate for template in templates] == ["items://{item_id}"]
+    assert {name: listing.builds for name, listing in server.listings.items()} == {
+        "tools": 1,
+        "prompts": 1,
+        "resources": 1,
+        "resource_templates": 1,
+    }
+
+
+async def test_registry_changes_are_listed_and_announced():
+    server = make_server()
+    notifications = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification):
+            notifications.append(type(message.root).__name__)
+
+    async with connect(server, message_handler=on_message) as session:
+        capabilities = session.get_server_capabilities()
+        await session.list_tools()
+        server.add_tool(lambda: "new", name="added")
+        server.remove_tool("tool_0")  # Announced together with the addition
+        await asyncio.sleep(0.01)
+        names = [tool.name for tool in (await session.list_tools()).tools]
+        # Lists the session never asked for are not announced
+        server.add_prompt(server._prompt_manager.get_prompt("greet"))
+
+        @server.prompt()
+        def farewell() -> str:
+            return "Bye"
+
+        await asyncio.sleep(0.01)
+
+    assert capabilities.tools.listChanged and capabilities.prompts.listChanged
+    assert capabilities.resources.listChanged and capabilities.resources.subscribe
+    assert names == ["tool_1", "tool_2", "added"]
+    assert notifications == ["ToolListChangedNotification"]
+    assert server.listings["tools"].builds == 2
+
+
+async def test_large_catalogs_are_paginated(monkeypatch):
+    monkeypatch.setitem(listings.settings, "page_size", 2)
+    server = make_server(tools=5)
+    pages = []
+    async with connect(server) as session:
+        cursor = None
+        while True:
+            result = await session.list_tools(params=types.PaginatedRequestParams(cursor=cursor))
+            pages.append([tool.name for tool in result.tools])
+            cursor = result.nextCursor
+            if cursor is None:
+                break
+
+        first = await session.list_tools()
+        server.remove_tool("tool_4")
+        with pytest.raises(McpError, match="list again"):
+            await session.list_tools(params=types.PaginatedRequestParams(cursor=first.nextCursor))
+        with pytest.raises(McpError, match="list again"):
+            await session.list_tools(params=types.PaginatedRequestParams(cursor="made-up"))
+
+    assert pages == [["tool_0", "tool_1"], ["tool_2", "tool_3"], ["tool_4"]]
+
+
+async def test_an_empty_registry_lists_one_empty_page():
+    server = Server("test")
+    async with connect(server) as session:
+        result = await session.list_tools()
+    assert result.tools == [] and result.nextCursor is None
+
+
+def test_dumped_results_dump_once():
+    result = types.ListToolsResult(tools=[types.Tool(name="a", inputSchema={"type": "object"})])
+    dumped = DumpedResult(result)
+    assert dumped.model_dump(**DUMP_OPTIONS) is dumped.model_dump(**DUMP_OPTIONS)
+    assert dumped.model_dump(**DUMP_OPTIONS) == types.ServerResult(result).model_dump(**DUMP_OPTIONS)
+    assert dumped.model_dump() == types.ServerResult(result).model_dump()
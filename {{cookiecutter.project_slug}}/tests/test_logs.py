@@ -0,0 +1,83 @@
+"""Tests for the logging configuration."""
+
+import io
+import json
+import threading
+
+import pytest
+from loguru import logger
+
+from {{ cookiecutter.package_name }} import logs
+from {{ cookiecutter.package_name }}.logs import configure_logging, log_stats
+from {{ cookiecutter.package_name }}.metrics import Metrics, render
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    yield
+    configure_logging(log_queue=False)
+
+
+def test_queued_json_lines():
+    stream = io.StringIO()
+    configure_logging(log_format="json", log_queue=True, stream=stream)
+    logger.info("Calculate tool called: {} {} {}", 1, "add", 2)
+    logger.remove()  # flushes the queue
+
+    entry = json.loads(stream.getvalue())
+    assert entry["msg"] == "Calculate tool called: 1 add 2"
+    assert entry["level"] == "INFO"
+    assert entry["fn"] == "test_queued_json_lines"
+
+
+def test_records_dropped_by_a_full_queue_are_counted(monkeypatch):
+    monkeypatch.setattr(logs, "QUEUE_SIZE", 2)
+    release = threading.Event()
+
+    class StalledStream(io.StringIO):
+        def write(self, text):
+            release.wait(5)
+            return super().write(text)
+
+    configure_logging(log_queue=True, stream=StalledStream())
+    for i in range(10):
+        logger.info("record {}", i)
+    dropped = log_stats()["dropped"]
+    release.set()
+
+    assert dropped > 0
+    assert f"mcp_log_dropped_total {dropped}" in render(Metrics(), logs=log_stats())
+    configure_logging(log_queue=False)
+    assert log_stats() == {"dropped": 0}
+
+
+def test_disabled_level_skips_formatting():
+    class Exploding:
+        def __format__(self, spec):
+            raise AssertionError("message was formatted")
+
+    stream = io.StringIO()
+    configure_logging(log_level="WARNING", log_queue=False, stream=stream)
+    logger.info("value: {}", Exploding())
+    assert stream.getvalue() == ""
+
+
+def test_rate_limit_is_per_function():
+    stream = io.StringIO()
+    configure_logging(log_format="json", log_queue=False, log_rate_limit=2, stream=stream)
+
+    def noisy_tool():
+        for _ in range(10):
+            logger.info("called")
+
+    def quiet_tool():
+        logger.info("called")
+
+    noisy_tool()
+    quiet_tool()
+    logger.warning("always passes")
+
+    functions = [json.loads(line)["fn"] for line in stream.getvalue().splitlines()]
+    assert functions.count("noisy_tool") == 2
+    assert functions.count("quiet_tool") == 1
+    assert functions.count("test_rate_limit_is_per_function") == 1
@@ -0,0 +1,101 @@
+"""Tests for call metrics and the /metrics endpoint."""
+
+import httpx
+import pytest
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.metrics import UNKNOWN, Metrics, merge, render
+
+
+def sample(text: str, series: str) -> float:
+    """The value of one series in exposition text."""
+    for line in text.splitlines():
+        name, _, value = line.rpartition(" ")
+        if name == series:
+            return float(value)
+    raise AssertionError(f"{series} not found")
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics(buckets=[0.1, 1.0])
+    stats = metrics.stats_for("tool", "t")
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        stats.observe(seconds)
+
+    text = render(metrics)
+    assert sample(text, 'mcp_call_duration_seconds_bucket{kind="tool",name="t",le="0.1"}') == 2
+    assert sample(text, 'mcp_call_duration_seconds_bucket{kind="tool",name="t",le="1.0"}') == 3
+    assert sample(text, 'mcp_call_duration_seconds_bucket{kind="tool",name="t",le="+Inf"}') == 4
+    assert sample(text, 'mcp_call_duration_seconds_count{kind="tool",name="t"}') == 4
+    assert sample(text, 'mcp_call_duration_seconds_sum{kind="tool",name="t"}') == pytest.approx(2.65)
+
+
+async def test_tool_prompt_and_resource_calls_are_recorded():
+    server = Server("test")
+
+    @server.tool()
+    def divide(a: float, b: float) -> float:
+        return a / b
+
+    @server.prompt()
+    def greet(name: str) -> str:
+        return f"Hello {name}"
+
+    @server.resource("items://{item_id}")
+    def item(item_id: str) -> str:
+        return item_id
+
+    async with connect(server) as session:
+        assert server.metrics.active_sessions == 1
+        await session.call_tool("divide", {"a": 1, "b": 2})
+        assert (await session.call_tool("divide", {"a": 1, "b": 0})).isError
+        assert (await session.call_tool("missing", {})).isError
+        await session.get_prompt("greet", {"name": "x"})
+        await session.read_resource("items://1")
+        await session.read_resource("items://2")
+    assert server.metrics.active_sessions == 0
+
+    text = render(server.metrics)
+    assert sample(text, 'mcp_calls_total{kind="tool",name="divide"}') == 2
+    assert sample(text, 'mcp_errors_total{kind="tool",name="divide"}') == 1
+    assert sample(text, 'mcp_in_flight{kind="tool",name="divide"}') == 0
+    assert sample(text, 'mcp_calls_total{kind="tool",name="' + UNKNOWN + '"}') == 1
+    assert sample(text, 'mcp_calls_total{kind="prompt",name="greet"}') == 1
+    # Template reads are grouped under the template, not each concrete URI
+    assert sample(text, 'mcp_calls_total{kind="resource",name="items://{item_id}"}') == 2
+
+
+def test_merge_labels_each_process():
+    first = "# HELP a A.\n# TYPE a counter\na 1\n# HELP b B.\n# TYPE b gauge\nb{x=\"1\"} 2\n"
+    second = "# HELP a A.\n# TYPE a counter\na 3\n"
+    assert merge([first, second]).splitlines() == [
+        "# HELP a A.",
+        "# TYPE a counter",
+        'a{worker="0"} 1',
+        'a{worker="1"} 3',
+        "# HELP b B.",
+        "# TYPE b gauge",
+        'b{worker="0",x="1"} 2',
+    ]
+
+
+async def test_http_app_serves_metrics():
+    from {{ cookiecutter.package_name }}.app import create_http_app
+
+    transport = httpx.ASGITransport(app=create_http_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "mcp_active_sessions 0" in response.text
+    assert 'mcp_executor_workers{pool="thread"}' in response.text
+    assert 'mcp_cache_hits_total{cache="tool:calculate"} 0' in response.text
+
+
+def test_metrics_route_can_be_disabled():
+    from {{ cookiecutter.package_name }}.app import create_http_app
+
+    paths = [route.path for route in create_http_app(metrics=False).routes]
+    assert "/metrics" not in paths
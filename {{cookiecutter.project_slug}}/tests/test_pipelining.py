@@ -0,0 +1,193 @@
+"""Tests for pipelined requests over the stdio transport, through a pair of pipes."""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import anyio
+import anyio.to_thread
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.stdio import stdio_server
+
+
+class PipeClient:
+    """Writes JSON-RPC lines to the server's stdin and reads lines from its stdout."""
+
+    def __init__(self, to_server: Any, from_server: Any) -> None:
+        self._to_server = to_server
+        self._from_server = from_server
+
+    async def send(self, *messages: dict[str, Any]) -> None:
+        data = "".join(json.dumps(message) + "\n" for message in messages).encode()
+        await anyio.to_thread.run_sync(self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        self._to_server.write(data)
+        self._to_server.flush()
+
+    async def receive(self) -> dict[str, Any]:
+        return json.loads(await anyio.to_thread.run_sync(self._from_server.readline))
+
+    async def call(self, id: int, name: str, **arguments: Any) -> None:
+        params = {"name": name, "arguments": arguments}
+        await self.send({"jsonrpc": "2.0", "id": id, "method": "tools/call", "params": params})
+
+    def close(self) -> None:
+        self._to_server.close()
+
+
+@asynccontextmanager
+async def pipe_session(server: Server, concurrency: int | None = None) -> AsyncIterator[PipeClient]:
+    """Run `server` on stdio over pipes and yield an initialized client."""
+    server_in, client_out = os.pipe()
+    client_in, server_out = os.pipe()
+    client = PipeClient(os.fdopen(client_out, "wb"), os.fdopen(client_in, "rb"))
+    stdin, stdout = os.fdopen(server_in, "rb"), os.fdopen(server_out, "wb")
+
+    async def serve() -> None:
+        async with stdio_server(stdin, stdout, concurrency=concurrency) as (read_stream, write_stream):
+            await server._mcp_server.run(read_stream, write_stream, server._mcp_server.create_initialization_options())
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(serve)
+            initialize = {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "test", "version": "1"},
+            }
+            await client.send({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": initialize})
+            assert "result" in await client.receive()
+            await client.send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            yield client
+            client.close()  # End of input: the server stops once its responses are written
+    finally:
+        # Write ends first, so that reads blocked in a thread see the end of input
+        for stream in (client._to_server, stdout, stdin, client._from_server):
+            stream.close()
+
+
+def make_server(gates: dict[str, asyncio.Event], started: list[str]) -> tuple[Server, list[int]]:
+    server = Server("test")
+    active, peak = [0], [0]
+
+    @server.tool()
+    async def wait(key: str) -> str:
+        started.append(key)
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        try:
+            await gates.setdefault(key, asyncio.Event()).wait()
+        finally:
+            active[0] -= 1
+        return key
+
+    @server.tool()
+    def echo(message: str) -> str:
+        return message
+
+    return server, peak
+
+
+async def test_responses_are_written_as_requests_finish():
+    gates, started = {}, []
+    server, _ = make_server(gates, started)
+    async with pipe_session(server) as client:
+        await client.call(1, "wait", key="slow")
+        await client.call(2, "echo", message="fast")
+        first = await client.receive()
+        gates["slow"].set()
+        second = await client.receive()
+
+    assert first["id"] == 2 and first["result"]["content"][0]["text"] == "fast"
+    assert second["id"] == 1 and second["result"]["content"][0]["text"] == "slow"
+
+
+async def test_requests_beyond_the_limit_wait_in_order():
+    gates = {key: asyncio.Event() for key in "abcde"}
+    started = []
+    server, peak = make_server(gates, started)
+    async with pipe_session(server, concurrency=2) as client:
+        for i, key in enumerate("abcde", start=1):
+            await client.call(i, "wait", key=key)
+        await client.send({"jsonrpc": "2.0", "id": 9, "method": "ping"})
+        await asyncio.sleep(0.01)
+        assert started == ["a", "b"]
+        ids = []
+        for key in "bacd":
+            gates[key].set()
+            ids.append((await client.receive())["id"])
+        # The ping waited for a slot too, and got the one "d" freed
+        ids.append((await client.receive())["id"])
+        gates["e"].set()
+        ids.append((await client.receive())["id"])
+
+    assert started == ["a", "b", "c", "d", "e"]
+    assert ids == [2, 1, 3, 4, 9, 5]
+    assert peak[0] == 2
+
+
+async def test_a_limit_of_one_handles_requests_serially():
+    gates, started = {}, []
+    server, peak = make_server(gates, started)
+    for key in "xyz":
+        gates[key] = asyncio.Event()
+        gates[key].set()
+    async with pipe_session(server, concurrency=1) as client:
+        for i, key in enumerate("xyz", start=1):
+            await client.call(i, "wait", key=key)
+        ids = [(await client.receive())["id"] for _ in range(3)]
+
+    assert ids == [1, 2, 3]
+    assert peak[0] == 1
+
+
+async def test_requests_cancelled_while_waiting_never_run():
+    gates, started = {"hold": asyncio.Event()}, []
+    server, _ = make_server(gates, started)
+    async with pipe_session(server, concurrency=1) as client:
+        await client.call(1, "wait", key="hold")
+        await client.call(2, "wait", key="never")
+        cancel = {"requestId": 2, "reason": "no longer needed"}
+        await client.send({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": cancel})
+        await asyncio.sleep(0.01)
+        gates["hold"].set()
+        assert (await client.receive())["id"] == 1
+        await client.send({"jsonrpc": "2.0", "id": 3, "method": "ping"})
+        assert (await client.receive())["id"] == 3
+
+    assert started == ["hold"]
+
+
+async def test_no_limit_and_malformed_cancellations_hold_nothing_back():
+    gates = {key: asyncio.Event() for key in "abc"}
+    started = []
+    server, peak = make_server(gates, started)
+    async with pipe_session(server, concurrency=0) as client:
+        for i, key in enumerate("abc", start=1):
+            await client.call(i, "wait", key=key)
+        await client.send({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {}})
+        await client.send({"jsonrpc": "2.0", "id": 9, "method": "ping"})
+        assert (await client.receive())["id"] == 9
+        while len(started) < 3:
+            await asyncio.sleep(0.01)
+        for key in "abc":
+            gates[key].set()
+        ids = sorted([(await client.receive())["id"] for _ in range(3)])
+
+    assert ids == [1, 2, 3]
+    assert peak[0] == 3
+
+
+async def test_messages_larger_than_a_read_are_reassembled():
+    server, _ = make_server({}, [])
+    message = "x" * 300_000
+    async with pipe_session(server) as client:
+        await client.call(1, "echo", message=message)
+        await client.call(2, "echo", message="after")
+        responses = [await client.receive(), await client.receive()]
+
+    assert [response["result"]["content"][0]["text"] for response in responses] == [message, "after"]
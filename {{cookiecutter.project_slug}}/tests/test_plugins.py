@@ -0,0 +1,163 @@
+"""Tests for tool plugins found through entry points and imported on first call."""
+
+import asyncio
+import json
+import sys
+import threading
+from importlib.metadata import EntryPoint
+from types import SimpleNamespace
+
+import pytest
+
+from {{ cookiecutter.package_name }} import plugins
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.plugins import PLUGIN_GROUP, Plugin, load_plugins
+
+PLUGIN_SOURCE = '''
+def register(mcp):
+    @mcp.tool()
+    def forecast(city: str, days: int = 3) -> str:
+        """Weather forecast for a city"""
+        return f"{city}: sunny for {days} days"
+
+    @mcp.tool(cache=True)
+    def temperature(city: str) -> float:
+        return 21.5
+'''
+
+
+@pytest.fixture
+def installed(tmp_path, monkeypatch):
+    """Install plugins, given as entry point name and value, and keep the manifest in `tmp_path`."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "weather_tools.py").write_text(PLUGIN_SOURCE)
+    monkeypatch.setitem(plugins.settings, "manifest", str(tmp_path / "plugins.json"))
+    monkeypatch.setitem(plugins.settings, "enabled", True)
+    entry_points = []
+    monkeypatch.setattr(plugins, "entry_points", lambda group: entry_points if group == PLUGIN_GROUP else [])
+
+    def install(name: str, value: str) -> None:
+        entry_points.append(EntryPoint(name, value, PLUGIN_GROUP))
+
+    yield install
+    sys.modules.pop("weather_tools", None)
+
+
+def manifest(tmp_path) -> dict:
+    return json.loads((tmp_path / "plugins.json").read_text())
+
+
+async def test_first_start_imports_plugins_and_records_their_tools(installed, tmp_path):
+    installed("weather", "weather_tools:register")
+    server = Server("test")
+    load_plugins(server)
+
+    assert "weather_tools" in sys.modules
+    assert {tool.name for tool in server._tool_manager.list_tools()} == {"forecast", "temperature"}
+    tools = manifest(tmp_path)["weather=weather_tools:register"]
+    assert [tool["name"] for tool in tools] == ["forecast", "temperature"]
+    assert tools[0]["description"] == "Weather forecast for a city"
+    assert tools[0]["inputSchema"]["properties"]["days"]["default"] == 3
+
+
+async def test_later_starts_import_plugins_on_first_call(installed, tmp_path):
+    installed("weather", "weather_tools:register")
+    load_plugins(Server("first"))
+    sys.modules.pop("weather_tools")
+
+    server = Server("test")
+    load_plugins(server)
+    assert "weather_tools" not in sys.modules
+    async with connect(server) as session:
+        listed = {tool.name: tool for tool in (await session.list_tools()).tools}
+        assert "weather_tools" not in sys.modules
+        result = await session.call_tool("forecast", {"city": "Oslo"})
+        assert "weather_tools" in sys.modules
+        await session.call_tool("temperature", {"city": "Oslo"})
+        await session.call_tool("temperature", {"city": "Oslo"})
+        relisted = [tool.name for tool in (await session.list_tools()).tools]
+
+    assert listed["forecast"].inputSchema["required"] == ["city"]
+    assert listed["temperature"].outputSchema["properties"]["result"]["type"] == "number"
+    assert result.content[0].text == "Oslo: sunny for 3 days"
+    # Imported tools are registered for real, with their options, and listed once
+    assert sorted(relisted) == ["forecast", "temperature"]
+    assert server.cache_stats()["tool:temperature"]["hits"] == 1
+
+
+async def test_concurrent_first_calls_import_once_off_the_event_loop(installed, tmp_path, monkeypatch):
+    (tmp_path / "slow_tools.py").write_text(PLUGIN_SOURCE)
+    installed("slow", "slow_tools:register")
+    load_plugins(Server("first"))
+    sys.modules.pop("slow_tools")
+    # The next import blocks until released
+    gate = SimpleNamespace(imports=0, started=threading.Event(), release=threading.Event())
+    monkeypatch.setitem(sys.modules, "plugin_gate", gate)
+    (tmp_path / "slow_tools.py").write_text(
+        "import plugin_gate\n"
+        "plugin_gate.imports += 1\n"
+        "plugin_gate.started.set()\n"
+        "plugin_gate.released = plugin_gate.release.wait(5)\n" + PLUGIN_SOURCE
+    )
+
+    server = Server("test")
+    load_plugins(server)
+    calls = asyncio.gather(*[server.call_tool("forecast", {"city": "Oslo"}) for _ in range(3)])
+    # The loop keeps running while the plugin imports
+    while not gate.started.is_set():
+        await asyncio.sleep(0.001)
+    gate.release.set()
+    results = await calls
+    sys.modules.pop("slow_tools", None)
+
+    assert gate.released  # Not timed out with the loop blocked
+    assert gate.imports == 1
+    assert [result[0][0].text for result in results] == ["Oslo: sunny for 3 days"] * 3
+
+
+async def test_broken_plugins_are_left_out(installed, tmp_path):
+    installed("weather", "weather_tools:register")
+    installed("missing", "no_such_module:register")
+    server = Server("test")
+    load_plugins(server)
+
+    assert list(manifest(tmp_path)) == ["weather=weather_tools:register"]
+    assert "forecast" in {tool.name for tool in await server.list_tools()}
+
+
+async def test_a_plugin_failing_on_first_call_reports_an_error(installed, tmp_path):
+    installed("weather", "weather_tools:register")
+    load_plugins(Server("first"))
+    sys.modules.pop("weather_tools")
+    (tmp_path / "weather_tools.py").write_text("raise ImportError('needs pandas')\n")
+
+    server = Server("test")
+    load_plugins(server)
+    async with connect(server) as session:
+        result = await session.call_tool("forecast", {"city": "Oslo"})
+        listed = [tool.name for tool in (await session.list_tools()).tools]
+
+    assert result.isError and "needs pandas" in result.content[0].text
+    assert "forecast" in listed  # Still listed, so a later call can try again
+
+
+async def test_manifest_keeps_installed_plugins_only(installed, tmp_path):
+    (tmp_path / "plugins.json").write_text(json.dumps({"old=gone:register": [{"name": "gone", "inputSchema": {}}]}))
+    installed("weather", "weather_tools:register")
+    load_plugins(Server("test"))
+    assert list(manifest(tmp_path)) == ["weather=weather_tools:register"]
+
+    plugins.settings["enabled"] = False
+    server = Server("test")
+    load_plugins(server)
+    assert await server.list_tools() == []
+
+
+def test_manifest_entries_are_per_release():
+    def plugin(version: str) -> Plugin:
+        dist = SimpleNamespace(name="acme-weather", version=version)
+        return Plugin(SimpleNamespace(name="weather", value="weather_tools:register", dist=dist))
+
+    assert plugin("1.0").key == "acme-weather==1.0 weather=weather_tools:register"
+    assert plugin("1.0").key != plugin("1.1").key
@@ -0,0 +1,139 @@
+"""Tests for the sampling profiler started on demand."""
+
+import json
+import os
+import signal
+import threading
+import time
+
+import anyio.to_thread
+import httpx
+import pytest
+
+from {{ cookiecutter.package_name }} import profiler
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.profiler import MAX_SHARE, ProfilerBusy, sample
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_server() -> Server:
+    server = Server("test")
+
+    @server.tool()
+    async def crunch(seconds: float) -> str:
+        busy(seconds)
+        return "done"
+
+    return server
+
+
+async def profile_calls(seconds: float = 0.4):
+    """Profile the server while `crunch` keeps its event loop busy."""
+    async with connect(make_server()) as session:
+        async with anyio.create_task_group() as tg:
+            profiles = []
+
+            async def run() -> None:
+                profiles.append(await anyio.to_thread.run_sync(sample, seconds, 0.002))
+
+            tg.start_soon(run)
+            await anyio.sleep(0.05)
+            await session.call_tool("crunch", {"seconds": seconds - 0.1})
+    return profiles[0]
+
+
+@pytest.mark.slow
+async def test_samples_are_attributed_to_the_tool_being_called():
+    profile = await profile_calls()
+    lines = profile.collapsed().splitlines()
+
+    crunching = [line for line in lines if ";tool:crunch;" in line]
+    assert crunching and all(line.startswith("thread:MainThread;") for line in crunching)
+    assert any(";busy (tests/test_profiler.py:" in line for line in crunching)
+    # Counts add up to one per thread per sample
+    counts = sum(int(line.rpartition(" ")[2]) for line in lines if line.startswith("thread:MainThread;"))
+    assert counts == profile.samples
+    assert profile.overhead / profile.duration <= MAX_SHARE * 1.5
+
+
+@pytest.mark.slow
+async def test_speedscope_profiles_are_per_thread():
+    profile = await profile_calls()
+    document = json.loads(profile.render("speedscope"))
+
+    frames = document["shared"]["frames"]
+    profiles = {entry["name"]: entry for entry in document["profiles"]}
+    main = profiles["MainThread"]
+    assert main["type"] == "sampled" and main["unit"] == "seconds"
+    assert len(main["samples"]) == len(main["weights"])
+    assert main["endValue"] == pytest.approx(profile.samples * profile.interval)
+    names = {frames[index]["name"] for stack in main["samples"] for index in stack}
+    assert {"tool:crunch", "busy"} <= names
+    assert all(index < len(frames) for entry in profiles.values() for stack in entry["samples"] for index in stack)
+
+
+@pytest.mark.slow
+def test_one_profile_at_a_time():
+    with pytest.raises(ValueError):
+        sample(0)
+    with pytest.raises(ValueError):
+        sample(1, interval=0.0001)
+
+    thread = threading.Thread(target=sample, args=(0.2,))
+    thread.start()
+    time.sleep(0.05)
+    with pytest.raises(ProfilerBusy):
+        sample(0.1)
+    thread.join()
+    assert sample(0.01).samples >= 1
+
+
+@pytest.mark.slow
+async def test_http_app_serves_profiles_when_enabled():
+    from {{ cookiecutter.package_name }}.app import create_http_app
+
+    assert "/debug/profile" not in [route.path for route in create_http_app().routes]
+    transport = httpx.ASGITransport(app=create_http_app(profiler=True))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        collapsed = await client.get("/debug/profile", params={"seconds": 0.05})
+        speedscope = await client.get("/debug/profile", params={"seconds": 0.05, "format": "speedscope"})
+        invalid = await client.get("/debug/profile", params={"seconds": 600})
+        unknown = await client.get("/debug/profile", params={"format": "pprof"})
+
+    assert collapsed.status_code == 200 and collapsed.headers["content-type"].startswith("text/plain")
+    assert "thread:MainThread;" in collapsed.text
+    assert speedscope.json()["profiles"]
+    assert "attachment" in speedscope.headers["content-disposition"]
+    assert invalid.status_code == 400 and "at most 60" in invalid.text
+    assert unknown.status_code == 400
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(profiler.SIGNAL is None, reason="no SIGUSR1 on this platform")
+def test_signal_writes_profiles_to_files(tmp_path, monkeypatch):
+    monkeypatch.setitem(profiler.settings, "seconds", 0.05)
+    monkeypatch.setitem(profiler.settings, "directory", str(tmp_path / "profiles"))
+    previous = signal.getsignal(profiler.SIGNAL)
+    try:
+        assert profiler.install_signal_handler()
+        os.kill(os.getpid(), profiler.SIGNAL)
+        deadline = time.monotonic() + 5
+        while len(list(tmp_path.glob("profiles/*"))) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for thread in threading.enumerate():
+            if thread.name == "profiler":
+                thread.join()
+    finally:
+        signal.signal(profiler.SIGNAL, previous)
+
+    collapsed = next(tmp_path.glob("profiles/*.collapsed"))
+    speedscope = next(tmp_path.glob("profiles/*.speedscope.json"))
+    assert collapsed.name.startswith(f"{{ cookiecutter.package_name }}-{os.getpid()}-")
+    assert "thread:MainThread;" in collapsed.read_text()
+    assert json.loads(speedscope.read_text())["profiles"]
@@ -0,0 +1,88 @@
+"""Tests for versioned resources, conditional reads and update notifications."""
+
+import anyio
+from mcp.client.session import ClientSession
+from mcp.types import ReadResourceRequest, ReadResourceRequestParams, ReadResourceResult, ServerNotification
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.resources import ETAG, NOT_MODIFIED
+
+
+def make_server() -> tuple[Server, dict[str, str]]:
+    server = Server("test")
+    data = {"value": "one"}
+
+    @server.resource("data://value", cache=True)
+    def value() -> str:
+        return data["value"]
+
+    @server.resource("data://items/{name}")
+    def item(name: str) -> str:
+        return f"item {name}"
+
+    return server, data
+
+
+async def read_if_none_match(session: ClientSession, uri: str, etag: str) -> ReadResourceResult:
+    params = ReadResourceRequestParams.model_validate({"uri": uri, "_meta": {"ifNoneMatch": etag}})
+    return await session.send_request(ReadResourceRequest(params=params), ReadResourceResult)
+
+
+async def test_reads_carry_a_stable_etag():
+    server, data = make_server()
+    async with connect(server) as session:
+        first = (await session.read_resource("data://value")).contents[0]
+        again = (await session.read_resource("data://value")).contents[0]
+        other = (await session.read_resource("data://items/a")).contents[0]
+
+    assert first.text == "one"
+    assert first.meta[ETAG] == again.meta[ETAG]
+    assert other.meta[ETAG] != first.meta[ETAG]
+
+
+async def test_conditional_read_skips_unchanged_contents():
+    server, _ = make_server()
+    async with connect(server) as session:
+        etag = (await session.read_resource("data://items/a")).contents[0].meta[ETAG]
+
+        result = await read_if_none_match(session, "data://items/a", etag)
+        assert result.contents[0].text == ""
+        assert result.contents[0].meta == {ETAG: etag, NOT_MODIFIED: True}
+
+        result = await read_if_none_match(session, "data://items/a", "stale")
+        assert result.contents[0].text == "item a"
+        assert NOT_MODIFIED not in result.contents[0].meta
+
+
+async def test_subscribers_are_notified_only_on_real_changes():
+    server, data = make_server()
+    updates: list[str] = []
+
+    async def on_message(message) -> None:
+        if isinstance(message, ServerNotification):
+            updates.append(str(message.root.params.uri))
+
+    async with connect(server, message_handler=on_message) as session:
+        assert session.get_server_capabilities().resources.subscribe
+        await session.subscribe_resource("data://value")
+
+        # Rebuilt, but identical
+        await server.refresh_resource("data://value")
+        data["value"] = "two"
+        # The cached version is served until the resource is refreshed
+        assert (await session.read_resource("data://value")).contents[0].text == "one"
+        etag = await server.refresh_resource("data://value")
+        # Already announced
+        await server.refresh_resource("data://value")
+        await anyio.sleep(0.01)
+
+        read = (await session.read_resource("data://value")).contents[0]
+        assert (read.text, read.meta[ETAG]) == ("two", etag)
+
+        await session.unsubscribe_resource("data://value")
+        data["value"] = "three"
+        await server.refresh_resource("data://value")
+        await anyio.sleep(0.01)
+
+    assert updates == ["data://value"]
@@ -0,0 +1,83 @@
+"""Tests for compiled tool schemas and enum parameters."""
+
+from typing import Literal
+
+import jsonschema
+import pytest
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.schemas import CompiledSchema
+from {{ cookiecutter.package_name }}.server import mcp
+
+
+async def test_enum_parameters_are_advertised_and_enforced():
+    async with connect(mcp) as session:
+        tools = {tool.name: tool for tool in (await session.list_tools()).tools}
+        calculate = await session.call_tool("calculate", {"operation": "multiply", "a": 6, "b": 7})
+        rejected = await session.call_tool("calculate", {"operation": "power", "a": 6, "b": 7})
+        unix = await session.call_tool("timestamp", {"format": "unix"})
+        bad_format = await session.call_tool("timestamp", {"format": "rfc"})
+
+    assert tools["calculate"].inputSchema["properties"]["operation"]["enum"] == ["add", "subtract", "multiply", "divide"]
+    assert tools["calculate_array"].inputSchema["properties"]["operation"]["enum"][0] == "add"
+    assert tools["timestamp"].inputSchema["properties"]["format"]["enum"] == ["iso", "unix", "human"]
+    assert calculate.structuredContent == {"result": 42.0}
+    assert unix.content[0].text.isdigit()
+    assert rejected.isError and "Input should be 'add', 'subtract', 'multiply' or 'divide'" in rejected.content[0].text
+    assert bad_format.isError
+
+
+async def test_invalid_values_never_reach_the_tool():
+    server = Server("test")
+    calls = []
+
+    @server.tool()
+    def pick(color: Literal["red", "green"]) -> str:
+        calls.append(color)
+        return color
+
+    async with connect(server) as session:
+        assert not (await session.call_tool("pick", {"color": "red"})).isError
+        assert (await session.call_tool("pick", {"color": "blue"})).isError
+    assert calls == ["red"]
+
+
+async def test_output_schemas_are_compiled_once_per_tool():
+    server = Server("test")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    assert "add" not in server._output_schemas  # Not at registration, to keep startup fast
+    async with connect(server) as session:
+        result = await session.call_tool("add", {"a": 1, "b": 2})
+        compiled = server._output_schema("add")
+        await session.call_tool("add", {"a": 2, "b": 3})
+        assert server._output_schema("add") is compiled
+
+        # A tool replaced under the same name gets its own validator
+        def join(a: int, b: int) -> str:
+            return f"{a}{b}"
+
+        server.remove_tool("add")
+        server.add_tool(join, name="add")
+        await session.list_tools()
+        joined = await session.call_tool("add", {"a": 1, "b": 2})
+
+    assert result.structuredContent == {"result": 3}
+    assert joined.structuredContent == {"result": "12"}
+    assert server._output_schema("add") is not compiled
+
+
+def test_compiled_schema_reports_what_jsonschema_would():
+    schema = {"type": "object", "properties": {"result": {"type": "number"}}, "required": ["result"]}
+    compiled = CompiledSchema(schema)
+    assert compiled.error({"result": 1.5}) is None
+    for instance in ({"result": "x"}, {}):
+        with pytest.raises(jsonschema.ValidationError) as raised:
+            jsonschema.validate(instance, schema)
+        assert compiled.error(instance) == raised.value.message
+    with pytest.raises(jsonschema.SchemaError):
+        CompiledSchema({"type": "nonsense"})
@@ -0,0 +1,132 @@
+"""Tests for the pluggable JSON serializer."""
+
+import json
+from datetime import date
+
+import httpx
+import pytest
+from mcp.types import (
+    JSONRPCMessage,
+    JSONRPCNotification,
+    JSONRPCResponse,
+    ResourceUpdatedNotification,
+    ResourceUpdatedNotificationParams,
+    ServerNotification,
+)
+from pydantic import AnyUrl, BaseModel
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.serialization import (
+    BACKENDS,
+    configure_serializer,
+    create_serializer,
+    get_serializer,
+)
+
+
+def available_backends() -> list[str]:
+    names = []
+    for name in BACKENDS:
+        try:
+            create_serializer(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    previous = get_serializer()
+    yield configure_serializer(request.param)
+    configure_serializer(previous.name)
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+def test_backends_agree_with_the_sdk_encoding(backend):
+    response = JSONRPCMessage(
+        JSONRPCResponse(jsonrpc="2.0", id=7, result={"text": "héllo", "items": [1, 2.5, None, True]})
+    )
+    notification = ServerNotification(
+        ResourceUpdatedNotification(params=ResourceUpdatedNotificationParams(uri=AnyUrl("data://x")))
+    )
+    message = JSONRPCMessage(
+        JSONRPCNotification(jsonrpc="2.0", **notification.model_dump(by_alias=True, exclude_none=True))
+    )
+    for item in (response, message):
+        encoded = backend.encode_message(item)
+        assert "\n" not in encoded
+        assert json.loads(encoded) == json.loads(item.model_dump_json(by_alias=True, exclude_none=True))
+    assert "héllo" in backend.encode_message(response)
+
+
+def test_backends_encode_what_pydantic_can(backend):
+    value = {"when": date(2024, 1, 2), "point": Point(x=1, y=2), 3: "three"}
+    assert json.loads(backend.dumps(value)) == {"when": "2024-01-02", "point": {"x": 1, "y": 2}, "3": "three"}
+
+
+def test_auto_prefers_the_fastest_installed():
+    assert create_serializer("auto").name == available_backends()[0]
+    with pytest.raises(ValueError):
+        create_serializer("yaml")
+
+
+async def test_tool_results_are_compact_and_keep_structured_content(backend):
+    server = Server("test")
+
+    @server.tool()
+    def point() -> Point:
+        return Point(x=1, y=2)
+
+    @server.tool()
+    def table(rows: int) -> dict:
+        return {"rows": [{"id": i} for i in range(rows)]}
+
+    async with connect(server) as session:
+        structured = await session.call_tool("point", {})
+        unstructured = await session.call_tool("table", {"rows": 2})
+
+    assert structured.content[0].text == '{"x":1,"y":2}'
+    assert structured.structuredContent == {"x": 1, "y": 2}
+    assert unstructured.content[0].text == '{"rows":[{"id":0},{"id":1}]}'
+
+
+@pytest.mark.parametrize("stateless", [True, False])
+async def test_http_responses_use_the_serializer(monkeypatch, backend, stateless):
+    from {{ cookiecutter.package_name }} import sessions
+
+    encoded = []
+
+    def spy(message):
+        encoded.append(message)
+        return backend.encode_message(message)
+
+    monkeypatch.setattr(sessions, "encode_message", spy)
+
+    server = Server("test")
+    server.settings.stateless_http = stateless
+    http_app = server.streamable_http_app()
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "0"},
+        },
+    }
+    headers = {"Accept": "application/json, text/event-stream"}
+    async with http_app.router.lifespan_context(http_app):
+        transport = httpx.ASGITransport(app=http_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://127.0.0.1:8000") as client:
+            response = await client.post("/mcp", json=initialize, headers=headers)
+
+    assert response.status_code == 200
+    assert "serverInfo" in response.text
+    assert len(encoded) == 1
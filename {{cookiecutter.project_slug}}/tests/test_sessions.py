@@ -0,0 +1,242 @@
+"""Tests for session stores and resuming sessions on another replica."""
+
+import inspect
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from mcp.server.auth.middleware.bearer_auth import AuthenticatedUser
+from mcp.server.auth.provider import AccessToken
+from mcp.server.fastmcp import Context
+from mcp.server.streamable_http import StreamableHTTPServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.sessions import (
+    MemorySessionStore,
+    SQLiteSessionStore,
+    configure_sessions,
+    create_store,
+    settings,
+)
+
+HEADERS = {"Accept": "application/json, text/event-stream"}
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "replica-test", "version": "0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+
+# The private SDK members that SharedSessionManager and SerializedTransport
+# override or use, with the parameters they rely on
+SDK_METHODS = {
+    StreamableHTTPSessionManager: {
+        "_handle_stateless_request": ["self", "scope", "receive", "send"],
+        "_handle_stateful_request": ["self", "scope", "receive", "send"],
+        "_admit_session": ["self", "requestor"],
+        "_serve_opening_request": ["self", "http_transport", "scope", "receive", "send"],
+        "_discard_session": ["self", "session_id", "transport"],
+    },
+    StreamableHTTPServerTransport: {
+        "_create_json_response": ["self", "response_message", "status_code", "headers"],
+        "_create_event_data": ["self", "event_message"],
+    },
+}
+SDK_ATTRIBUTES = ["_server_instances", "_session_owners", "_session_creation_lock", "_task_group"]
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    saved = dict(settings)
+    yield
+    configure_sessions(**saved)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def store(request, tmp_path):
+    store = MemorySessionStore() if request.param == "memory" else SQLiteSessionStore(str(tmp_path / "s.db"))
+    yield store
+    await store.aclose()
+
+
+def test_sdk_internals_are_where_the_manager_expects_them():
+    # If this fails after an mcp upgrade, adapt sessions.py before moving the pin
+    for cls, methods in SDK_METHODS.items():
+        for name, parameters in methods.items():
+            assert hasattr(cls, name), f"{cls.__name__}.{name} no longer exists"
+            signature = list(inspect.signature(getattr(cls, name)).parameters)
+            assert signature == parameters, f"{cls.__name__}.{name} now takes {signature}"
+    manager = StreamableHTTPSessionManager(app=Server("test")._mcp_server)
+    for name in SDK_ATTRIBUTES:
+        assert hasattr(manager, name), f"StreamableHTTPSessionManager.{name} no longer exists"
+
+
+async def test_store_sets_gets_expires_and_deletes(store):
+    assert await store.get("a") is None
+    await store.set("a", '{"x":1}')
+    await store.set("b", "{}", ttl=60)
+    await store.set("c", "{}", ttl=-1)
+    assert await store.get("a") == '{"x":1}'
+    assert await store.get("b") == "{}"
+    assert await store.get("c") is None
+    await store.delete("a")
+    assert await store.get("a") is None
+
+
+def test_store_urls(tmp_path):
+    assert isinstance(create_store("memory"), MemorySessionStore)
+    sqlite = create_store(f"sqlite:///{tmp_path}/s.db")
+    assert isinstance(sqlite, SQLiteSessionStore)
+    assert sqlite.path == f"{tmp_path}/s.db"
+    with pytest.raises(ValueError):
+        configure_sessions("postgres://db")
+    assert settings["store"] == "memory"
+
+
+def parse(response: httpx.Response) -> dict:
+    """The JSON-RPC message of a JSON or single-event SSE response."""
+    if response.headers["content-type"].startswith("text/event-stream"):
+        data = [line[5:] for line in response.text.splitlines() if line.startswith("data:")]
+        return json.loads(data[-1])
+    return response.json()
+
+
+def make_replica(store) -> Server:
+    server = Server("test")
+    server.session_store = store
+
+    @server.tool()
+    def client_name(ctx: Context) -> str:
+        return ctx.session.client_params.clientInfo.name
+
+    return server
+
+
+async def test_any_replica_resumes_a_session(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    apps = [make_replica(SQLiteSessionStore(path)).streamable_http_app() for _ in range(3)]
+    clients = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://127.0.0.1:8000") for app in apps
+    ]
+    first, second, third = clients
+    call = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "client_name", "arguments": {}}}
+
+    async with apps[0].router.lifespan_context(apps[0]), apps[1].router.lifespan_context(apps[1]):
+        async with apps[2].router.lifespan_context(apps[2]):
+            response = await first.post("/mcp", json=INITIALIZE, headers=HEADERS)
+            session = {**HEADERS, "mcp-session-id": response.headers["mcp-session-id"]}
+            assert (await second.post("/mcp", json=INITIALIZED, headers=session)).status_code == 202
+
+            for client in (second, first, second):
+                result = parse(await client.post("/mcp", json=call, headers=session))["result"]
+                # The replayed handshake gives the resuming replica the client's parameters
+                assert result["structuredContent"] == {"result": "replica-test"}
+
+            assert (await second.delete("/mcp", headers=session)).status_code == 200
+            assert (await third.post("/mcp", json=call, headers=session)).status_code == 404
+            unknown = {**HEADERS, "mcp-session-id": "unknown"}
+            assert (await third.post("/mcp", json=call, headers=unknown)).status_code == 404
+    for client in clients:
+        await client.aclose()
+
+
+async def test_sessions_of_authenticated_clients_are_not_resumed(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    stores = [SQLiteSessionStore(path) for _ in range(2)]
+    apps = [make_replica(store).streamable_http_app() for store in stores]
+    user = AuthenticatedUser(AccessToken(token="secret", client_id="alice", scopes=[]))
+
+    def authenticated(app):
+        async def with_user(scope, receive, send):
+            await app({**scope, "user": user}, receive, send)
+
+        return with_user
+
+    first, second = (
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=authenticated(app)), base_url="http://127.0.0.1:8000")
+        for app in apps
+    )
+    async with apps[0].router.lifespan_context(apps[0]), apps[1].router.lifespan_context(apps[1]):
+        response = await first.post("/mcp", json=INITIALIZE, headers=HEADERS)
+        session_id = response.headers["mcp-session-id"]
+        session = {**HEADERS, "mcp-session-id": session_id}
+        assert (await first.post("/mcp", json=INITIALIZED, headers=session)).status_code == 202
+        # Not recorded, so another replica cannot bind it to the credential
+        assert await stores[0].get(session_id) is None
+        assert (await second.post("/mcp", json=INITIALIZED, headers=session)).status_code == 404
+    await first.aclose()
+    await second.aclose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_replica(port: int, store: str) -> subprocess.Popen:
+    command = "from {{ cookiecutter.package_name }} import main; main()"
+    return subprocess.Popen(
+        [sys.executable, "-c", command, "--transport", "streamable-http", "--host", "127.0.0.1"]
+        + ["--port", str(port), "--session-store", store, "--log-level", "WARNING"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(client: httpx.Client, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        assert process.poll() is None, "Replica exited before it was ready"
+        try:
+            if client.get("/readyz").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError("Replica did not become ready")
+
+
+@pytest.mark.transport
+def test_round_robin_across_replica_processes(tmp_path):
+    store = f"sqlite:///{tmp_path}/sessions.db"
+    ports = [free_port(), free_port()]
+    processes = [start_replica(port, store) for port in ports]
+    clients = [httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) for port in ports]
+    try:
+        for client, process in zip(clients, processes):
+            wait_ready(client, process)
+
+        response = clients[0].post("/mcp", json=INITIALIZE, headers=HEADERS)
+        session = {**HEADERS, "mcp-session-id": response.headers["mcp-session-id"]}
+        assert clients[1].post("/mcp", json=INITIALIZED, headers=session).status_code == 202
+        for i in range(6):
+            call = {
+                "jsonrpc": "2.0",
+                "id": i + 2,
+                "method": "tools/call",
+                "params": {"name": "calculate", "arguments": {"operation": "add", "a": i, "b": 1}},
+            }
+            # A plain round-robin balancer: each call goes to the next process
+            response = clients[i % 2].post("/mcp", json=call, headers=session)
+            assert not parse(response)["result"]["isError"]
+
+        for client in clients:
+            metrics = client.get("/metrics").text
+            assert 'mcp_calls_total{kind="tool",name="calculate"} 3' in metrics
+    finally:
+        for client in clients:
+            client.close()
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
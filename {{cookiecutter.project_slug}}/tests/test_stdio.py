@@ -109,6 +109,7 @@ async def client_session():
             yield session
 
 
+@pytest.mark.transport
 @pytest.mark.asyncio
 async def test_stdio_basic(client_session: ClientSession):
     """Basic pytest test for stdio transport."""
@@ -108,6 +108,7 @@ async def client_session(host: str = "127.0.0.1", port: int = 8000):
             yield session
 
 
+@pytest.mark.transport
 @pytest.mark.asyncio
 async def test_streamable_http(client_session: ClientSession):
     """Basic pytest test for streamable-http transport."""
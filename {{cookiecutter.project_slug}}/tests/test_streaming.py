@@ -0,0 +1,82 @@
+"""Tests for async generator tools streamed as progress notifications."""
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+
+
+def make_server() -> tuple[Server, asyncio.Event]:
+    server = Server("test")
+    resume = asyncio.Event()
+
+    @server.tool()
+    async def countdown(start: int) -> AsyncIterator[str]:
+        """Count down from start"""
+        for n in range(start, 0, -1):
+            yield f"{n} "
+            if n == start:
+                # Only continues once the client has seen the first chunk
+                await asyncio.wait_for(resume.wait(), timeout=1)
+        yield "liftoff"
+
+    return server, resume
+
+
+async def test_chunks_arrive_as_they_are_produced():
+    server, resume = make_server()
+    received = []
+
+    async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        received.append((progress, message))
+        resume.set()
+
+    async with connect(server) as session:
+        result = await session.call_tool("countdown", {"start": 3}, progress_callback=on_progress)
+
+    assert received == [(1, "3 "), (2, "2 "), (3, "1 "), (4, "liftoff")]
+    assert result.content[0].text == "Streamed 4 chunks"
+
+
+async def test_without_progress_token_chunks_are_joined():
+    server, resume = make_server()
+    resume.set()
+    async with connect(server) as session:
+        result = await session.call_tool("countdown", {"start": 2})
+    assert result.content[0].text == "2 1 liftoff"
+
+
+async def test_schema_hides_the_injected_context():
+    server, _ = make_server()
+    tool = (await server.list_tools())[0]
+    assert set(tool.inputSchema["properties"]) == {"start"}
+
+
+async def test_generator_can_use_its_own_context():
+    server = Server("test")
+
+    @server.tool()
+    async def numbered(count: int, ctx: Context) -> AsyncIterator[str]:
+        for i in range(count):
+            await ctx.info(f"chunk {i}")
+            yield str(i)
+
+    async with connect(server) as session:
+        result = await session.call_tool("numbered", {"count": 3})
+    assert result.content[0].text == "012"
+
+
+def test_streaming_tools_cannot_be_cached_or_offloaded():
+    server = Server("test")
+
+    async def chunks() -> AsyncIterator[str]:
+        yield ""
+
+    with pytest.raises(TypeError):
+        server.tool(cache=True)(chunks)
+    with pytest.raises(TypeError):
+        server.tool(executor="thread")(chunks)
@@ -0,0 +1,143 @@
+"""Tests for per-call tracing."""
+
+import json
+import time
+
+import pytest
+
+from {{ cookiecutter.package_name }} import tracing
+from {{ cookiecutter.package_name }}.core import Server
+from {{ cookiecutter.package_name }}.memory import connect
+from {{ cookiecutter.package_name }}.tracing import (
+    STATUS_ERROR,
+    InMemoryCollector,
+    OTLPFileExporter,
+    parse_traceparent,
+    set_exporter,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def collector():
+    collector = set_exporter(InMemoryCollector())
+    yield collector
+    set_exporter(None)
+
+
+def make_server() -> Server:
+    server = Server("test")
+
+    @server.tool(cache=True)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @server.tool()
+    def fail() -> str:
+        raise ValueError("boom")
+
+    @server.prompt()
+    def greet(name: str) -> str:
+        return f"Hello {name}"
+
+    @server.resource("data://config")
+    def config() -> str:
+        return "{}"
+
+    return server
+
+
+async def test_tool_call_is_a_span_with_phases(collector):
+    async with connect(make_server()) as session:
+        await session.call_tool("add", {"a": 1, "b": 2})
+
+    root = collector.spans[-1]
+    assert root.name == "tools/call add"
+    assert root.parent_id is None
+    assert root.attributes["mcp.method.name"] == "tools/call"
+    assert root.attributes["gen_ai.tool.name"] == "add"
+    assert root.attributes["mcp.request.size"] == len('{"a":1,"b":2}')
+    assert root.attributes["mcp.response.size"] > 0
+    assert root.attributes["mcp.cache.hit"] is False
+    phases = [span for span in collector.spans if span.parent_id == root.span_id]
+    assert [span.name for span in phases] == ["validate", "execute", "serialize"]
+    assert all(span.trace_id == root.trace_id for span in phases)
+    assert all(root.start_ns <= span.start_ns <= span.end_ns <= root.end_ns for span in phases)
+
+
+async def test_errors_and_cache_hits_are_recorded(collector):
+    async with connect(make_server()) as session:
+        await session.call_tool("add", {"a": 1, "b": 2})
+        collector.clear()
+        await session.call_tool("add", {"a": 1, "b": 2})
+        hit = collector.spans[-1]
+        collector.clear()
+        result = await session.call_tool("fail", {})
+
+    assert hit.attributes["mcp.cache.hit"] is True
+    assert result.isError
+    spans = {span.name: span for span in collector.spans}
+    assert spans["tools/call fail"].status == STATUS_ERROR
+    assert spans["tools/call fail"].attributes["error.type"] == "tool_error"
+    execute = spans["execute"]
+    assert execute.attributes["error.type"] == "ValueError"
+    assert execute.events[0]["attributes"]["exception.message"] == "boom"
+
+
+async def test_prompts_and_resources_and_client_trace_context(collector):
+    traceparent = f"00-{TRACE_ID}-{PARENT_ID}-01"
+    async with connect(make_server()) as session:
+        await session.call_tool("add", {"a": 1, "b": 2}, meta={"traceparent": traceparent})
+        await session.get_prompt("greet", {"name": "x"})
+        await session.read_resource("data://config")
+
+    roots = [span for span in collector.spans if span.kind == tracing.KIND_SERVER]
+    assert [span.name for span in roots] == ["tools/call add", "prompts/get greet", "resources/read data://config"]
+    assert (roots[0].trace_id, roots[0].parent_id) == (TRACE_ID, PARENT_ID)
+    assert roots[1].trace_id != TRACE_ID
+    assert roots[2].attributes["mcp.resource.uri"] == "data://config"
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID)
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_otlp_file_exporter_writes_export_requests(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    set_exporter(OTLPFileExporter(str(path)))
+    try:
+        with tracing.span("tools/call add", {"gen_ai.tool.name": "add", "mcp.request.size": 13}):
+            with tracing.span("execute"):
+                pass
+    finally:
+        set_exporter(None)  # Shuts the exporter down, flushing the file
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    spans = [
+        span
+        for line in lines
+        for resource in line["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+    assert [span["name"] for span in spans] == ["execute", "tools/call add"]
+    child, root = spans
+    assert child["parentSpanId"] == root["spanId"] and child["traceId"] == root["traceId"]
+    assert {"key": "mcp.request.size", "value": {"intValue": "13"}} in root["attributes"]
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+
+def test_disabled_tracing_is_nearly_free():
+    assert not tracing.enabled()
+    assert tracing.span("a") is tracing.span("b")
+    start = time.perf_counter()
+    for _ in range(10_000):
+        with tracing.span("execute"):
+            pass
+    # A few hundred nanoseconds per span at most, even on a slow machine
+    assert time.perf_counter() - start < 0.01
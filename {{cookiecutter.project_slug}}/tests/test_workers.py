@@ -0,0 +1,154 @@
+"""Tests for multi-worker session-affinity routing."""
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from {{ cookiecutter.package_name }} import workers
+from {{ cookiecutter.package_name }}.workers import AffinityRouter, SessionTable, WorkerProcesses
+
+
+def make_worker(index: int) -> Starlette:
+    """A stand-in worker that hands out session ids and reports its index."""
+    sessions: set[str] = set()
+
+    async def handle(request: Request) -> Response:
+        session_id = request.headers.get("mcp-session-id")
+        if session_id is None:
+            session_id = f"session-{index}-{len(sessions)}"
+            sessions.add(session_id)
+        elif session_id not in sessions:
+            return JSONResponse({"error": "Session not found"}, status_code=404)
+        elif request.method == "DELETE":
+            sessions.discard(session_id)
+            return Response(status_code=200)
+        return JSONResponse({"worker": index}, headers={"mcp-session-id": session_id})
+
+    async def metrics(request: Request) -> Response:
+        return Response(f"# HELP up Up.\n# TYPE up gauge\nup {index}\n")
+
+    return Starlette(
+        routes=[
+            Route("/mcp", handle, methods=["GET", "POST", "DELETE"]),
+            Route("/metrics", metrics),
+        ]
+    )
+
+
+@pytest.fixture
+async def router_client():
+    clients = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=make_worker(i)), base_url="http://worker")
+        for i in range(3)
+    ]
+    router = AffinityRouter(clients, metrics_path="/metrics")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=router), base_url="http://test") as client:
+        yield router, client
+
+
+async def test_new_sessions_are_spread_across_workers(router_client):
+    _, client = router_client
+    workers = [(await client.post("/mcp")).json()["worker"] for _ in range(6)]
+    assert workers == [0, 1, 2, 0, 1, 2]
+
+
+async def test_session_requests_stick_to_their_worker(router_client):
+    router, client = router_client
+    await client.post("/mcp")
+    second = await client.post("/mcp")
+    session_id = second.headers["mcp-session-id"]
+    assert router.sessions[session_id] == 1
+
+    for _ in range(5):
+        response = await client.post("/mcp", headers={"mcp-session-id": session_id})
+        assert response.json()["worker"] == 1
+
+
+async def test_unknown_session_is_rejected(router_client):
+    _, client = router_client
+    response = await client.post("/mcp", headers={"mcp-session-id": "does-not-exist"})
+    assert response.status_code == 404
+
+
+async def test_deleted_session_is_forgotten(router_client):
+    router, client = router_client
+    session_id = (await client.post("/mcp")).headers["mcp-session-id"]
+    response = await client.delete("/mcp", headers={"mcp-session-id": session_id})
+    assert response.status_code == 200
+    assert session_id not in router.sessions
+
+
+def test_sessions_the_workers_dropped_are_forgotten(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(workers.time, "monotonic", lambda: clock[0])
+    table = SessionTable(idle_timeout=10, max_sessions=2)
+    table["a"] = 0
+    table["b"] = 1
+
+    clock[0] = 5
+    assert table.begin("a") == 0  # A stream that stays open
+    clock[0] = 12
+    assert table.begin("b") is None  # Idle for longer than the workers keep sessions
+    clock[0] = 30
+    table["c"] = 2
+    assert "a" in table  # Idle, but with a request in flight
+    table.end("a")
+    table["d"] = 0  # One too many: the least recently used goes
+
+    assert "c" not in table and "a" in table and "d" in table
+    assert len(table) == 2
+
+
+class FakeProcess:
+    def __init__(self, alive: bool = True) -> None:
+        self.alive = alive
+        self.exitcode = None if alive else -9
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+
+async def test_dead_workers_are_restarted_and_skipped_meanwhile(router_client, tmp_path, monkeypatch):
+    router, client = router_client
+    session_id = (await client.post("/mcp")).headers["mcp-session-id"]
+    socket_paths = [str(tmp_path / f"worker-{index}.sock") for index in range(3)]
+    processes = WorkerProcesses(socket_paths, {})
+    processes.processes = [FakeProcess(alive=False), FakeProcess(), FakeProcess()]
+    restarted = []
+    monkeypatch.setattr(processes, "_spawn", lambda index: restarted.append(index) or FakeProcess())
+
+    processes.check(router)
+    assert restarted == [0] and router.down == {0}
+    response = await client.post("/mcp", headers={"mcp-session-id": session_id})
+    assert response.status_code == 404
+    assert [(await client.post("/mcp")).json()["worker"] for _ in range(4)] == [1, 2, 1, 2]
+
+    processes.check(router)  # Not listening yet
+    assert router.down == {0}
+    (tmp_path / "worker-0.sock").touch()
+    processes.check(router)
+    assert router.down == set()
+    assert (await client.post("/mcp")).json()["worker"] == 0
+
+
+async def test_no_worker_up_is_unavailable(router_client):
+    router, client = router_client
+    for worker in range(3):
+        router.worker_down(worker)
+    assert (await client.post("/mcp")).status_code == 503
+
+
+async def test_metrics_are_merged_across_workers(router_client):
+    _, client = router_client
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.text.splitlines() == [
+        "# HELP up Up.",
+        "# TYPE up gauge",
+        'up{worker="0"} 0',
+        'up{worker="1"} 1',
+        'up{worker="2"} 2',
+    ]
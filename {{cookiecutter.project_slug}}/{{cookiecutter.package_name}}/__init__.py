@@ -1,10 +1,26 @@
 """{{ cookiecutter.project_name }}: {{ cookiecutter.project_description }}"""
-from .entrypoint import main
-
+import sys
 
 __version__ = "{{ cookiecutter.version }}"
 __author__ = "{{ cookiecutter.author_name }}"
 __email__ = "{{ cookiecutter.author_email }}"
 
+
+def main() -> None:
+    """Entry point for the CLI.
+
+    The CLI is imported here rather than at package import, so importing a
+    submodule (e.g. in a process-pool worker) stays cheap and
+    `--profile-startup` can see every import.
+    """
+    from .startup import FLAG, enable
+
+    if FLAG in sys.argv:
+        enable()
+    from .entrypoint import main as run
+
+    run()
+
+
 if __name__ == "__main__":
     main()
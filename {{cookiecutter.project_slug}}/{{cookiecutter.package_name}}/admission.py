@@ -0,0 +1,198 @@
+"""Admission control: reject work the server cannot take on, before doing it.
+
+Three independent limits, all off by default:
+
+* **Global in-flight** - at most `max_in_flight` MCP POST requests are handled
+  at once by a streamable-http process.
+* **Per session** - a token bucket per `Mcp-Session-Id` (or per client address
+  before a session exists) refilling at `session_rate` requests per second.
+* **Per tool** - a token bucket per tool name refilling at `tool_rate` calls
+  per second, shared by all sessions and also applied to stdio and to items
+  of a batch.
+
+HTTP rejections are `429 Too Many Requests` with a `Retry-After` header and a
+JSON-RPC error body. Tool rejections are JSON-RPC errors with code
+`RATE_LIMITED` and the suggested wait in `data.retryAfter` (seconds).
+Limits apply per process, so with `--workers N` the totals are N times higher.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any
+
+from mcp.server.streamable_http import MCP_SESSION_ID_HEADER
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData, JSONRPCError
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Implementation-defined JSON-RPC server error (-32000 to -32099)
+RATE_LIMITED = -32029
+
+# Buckets kept for sessions and clients; the least recently used are dropped.
+MAX_TRACKED_KEYS = 10_000
+
+settings: dict[str, Any] = {
+    "max_in_flight": 0,
+    "session_rate": 0.0,
+    "session_burst": None,
+    "tool_rate": 0.0,
+    "tool_burst": None,
+}
+
+
+class TokenBucket:
+    """Holds up to `burst` tokens, refilled at `rate` per second."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def acquire(self) -> float:
+        """Take a token. Return 0 if one was available, else seconds until one is."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class KeyedLimiter:
+    """One `TokenBucket` per key, keeping at most `max_keys` of them."""
+
+    def __init__(self, rate: float, burst: float | None = None, max_keys: int = MAX_TRACKED_KEYS) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_keys:
+                # An evicted key just starts again with a full bucket
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.acquire()
+
+
+_tool_limits: KeyedLimiter | None = None
+
+
+def configure_admission(
+    max_in_flight: int | None = None,
+    session_rate: float | None = None,
+    session_burst: float | None = None,
+    tool_rate: float | None = None,
+    tool_burst: float | None = None,
+) -> None:
+    """Set the limits (0 = unlimited). HTTP limits apply to apps created afterwards."""
+    global _tool_limits
+    values = {
+        "max_in_flight": max_in_flight,
+        "session_rate": session_rate,
+        "session_burst": session_burst,
+        "tool_rate": tool_rate,
+        "tool_burst": tool_burst,
+    }
+    settings.update({key: value for key, value in values.items() if value is not None})
+    _tool_limits = KeyedLimiter(settings["tool_rate"], settings["tool_burst"]) if settings["tool_rate"] else None
+
+
+def tool_wait(name: str) -> float:
+    """Take a token for tool `name`; return 0 if admitted, else seconds to wait."""
+    return _tool_limits.acquire(name) if _tool_limits is not None else 0.0
+
+
+def retry_after(seconds: float) -> str:
+    """`Retry-After` value: whole seconds, at least 1."""
+    return str(max(1, math.ceil(seconds)))
+
+
+def _rate_limited(message: str, wait: float) -> ErrorData:
+    return ErrorData(code=RATE_LIMITED, message=message, data={"retryAfter": round(wait, 3)})
+
+
+def rate_limited_error(message: str, wait: float) -> McpError:
+    return McpError(_rate_limited(message, wait))
+
+
+def _too_many_requests(message: str, wait: float) -> Response:
+    body = JSONRPCError(jsonrpc="2.0", id="server-error", error=_rate_limited(message, wait))
+    return Response(
+        body.model_dump_json(by_alias=True, exclude_none=True),
+        status_code=429,
+        headers={"Retry-After": retry_after(wait)},
+        media_type="application/json",
+    )
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the in-flight and per-session limits.
+
+    Only POSTs to `path` (JSON-RPC messages) are limited; the long-lived GET
+    stream and session DELETEs pass through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path: str = "/mcp",
+        max_in_flight: int = 0,
+        session_rate: float = 0,
+        session_burst: float | None = None,
+        rejected: dict[str, int] | None = None,
+    ) -> None:
+        self.app = app
+        self.path = path.rstrip("/")
+        self.max_in_flight = max_in_flight
+        self.sessions = KeyedLimiter(session_rate, session_burst) if session_rate else None
+        self.in_flight = 0
+        # Rejection counters by reason, shared with the metrics registry
+        self.rejected = rejected if rejected is not None else {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        if self.sessions is not None:
+            wait = self.sessions.acquire(self._session_key(scope))
+            if wait:
+                await self._reject("session_rate", "Session rate limit exceeded", wait, scope, receive, send)
+                return
+
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            await self._reject("in_flight", "Server is at capacity", 1.0, scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _session_key(scope: Scope) -> str:
+        session_id = Headers(scope=scope).get(MCP_SESSION_ID_HEADER)
+        if session_id is not None:
+            return "session:" + session_id
+        client = scope.get("client")
+        host: str = client[0] if client else "unknown"
+        return "client:" + host
+
+    async def _reject(self, reason: str, message: str, wait: float, scope: Scope, receive: Receive, send: Send) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        await _too_many_requests(message, wait)(scope, receive, send)
@@ -0,0 +1,145 @@
+"""The streamable-http application factory for {{ cookiecutter.project_name }}."""
+
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import anyio.to_thread
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .admission import AdmissionMiddleware, settings as admission_settings
+from .core import Server
+from .executors import executor_stats
+from .lifecycle import DrainMiddleware, Lifecycle
+from .logs import log_stats
+from .metrics import CONTENT_TYPE, render
+from .process import configure_process
+from .profiler import DEFAULT_INTERVAL, FORMATS, ProfilerBusy, sample, settings as profiler_settings
+from .server import create_server
+from .sessions import create_store, settings as session_settings
+
+# Worker processes started by uvicorn only receive an import string, so the
+# parent passes its options through the environment.
+OPTIONS_ENV = "{{ cookiecutter.package_name.upper() }}_HTTP_OPTIONS"
+
+
+def metrics_route(mcp_server: Server) -> Route:
+    """A `GET /metrics` route exposing the server's counters to Prometheus."""
+
+    async def metrics(request: Request) -> Response:
+        body = render(
+            mcp_server.metrics,
+            executor_stats(),
+            mcp_server.cache_stats(),
+            mcp_server.http.stats(),
+            log_stats(),
+        )
+        return Response(body, media_type=CONTENT_TYPE)
+
+    return Route("/metrics", metrics, methods=["GET"])
+
+
+def profile_route() -> Route:
+    """A `GET /debug/profile` route sampling the process and answering with the profile.
+
+    Query parameters: `seconds` (default: `configure_profiler`'s), `interval`
+    between samples in seconds, and `format`, `collapsed` (default) or
+    `speedscope`.
+    """
+
+    async def profile(request: Request) -> Response:
+        query = request.query_params
+        format = query.get("format", "collapsed")
+        if format not in FORMATS:
+            return Response(f"format must be one of {', '.join(FORMATS)}\n", status_code=400)
+        try:
+            seconds = float(query.get("seconds", profiler_settings["seconds"]))
+            interval = float(query.get("interval", DEFAULT_INTERVAL))
+            # In a thread, so that the event loop keeps serving (and is sampled)
+            result = await anyio.to_thread.run_sync(
+                sample, seconds, interval, abandon_on_cancel=True
+            )
+        except ValueError as e:
+            return Response(f"{e}\n", status_code=400)
+        except ProfilerBusy as e:
+            return Response(f"{e}\n", status_code=409)
+        if format == "speedscope":
+            headers = {"Content-Disposition": 'attachment; filename="profile.speedscope.json"'}
+            return Response(result.render(format), media_type="application/json", headers=headers)
+        return Response(result.render(format), media_type="text/plain")
+
+    return Route("/debug/profile", profile, methods=["GET"])
+
+
+def create_http_app(
+    stateless: bool = False, metrics: bool = True, profiler: bool = False
+) -> Starlette:
+    """Create the streamable-http ASGI app.
+
+    Args:
+        stateless: Create a fresh transport per request instead of keeping
+            per-session state, so any worker can serve any request.
+        metrics: Serve Prometheus metrics on `/metrics`.
+        profiler: Serve the sampling profiler on `/debug/profile`.
+
+    The in-flight and per-session limits set with `configure_admission` are
+    applied to the MCP endpoint. `/healthz` and `/readyz` are served, and
+    SIGTERM drains the app (see `lifecycle`); its `Lifecycle` is
+    `app.state.lifecycle`. Stateful sessions are recorded in the store set
+    with `configure_sessions`, so replicas sharing it can resume them. The
+    server's HTTP pool is closed when the app shuts down.
+    """
+    mcp_server = create_server()
+    mcp_server.settings.stateless_http = stateless
+    if not stateless:
+        mcp_server.session_store = create_store(session_settings["store"])
+    app = mcp_server.streamable_http_app()
+    if metrics:
+        app.router.routes.append(metrics_route(mcp_server))
+    if profiler:
+        app.router.routes.append(profile_route())
+    if admission_settings["max_in_flight"] or admission_settings["session_rate"]:
+        app.add_middleware(
+            AdmissionMiddleware,
+            path=mcp_server.settings.streamable_http_path,
+            max_in_flight=admission_settings["max_in_flight"],
+            session_rate=admission_settings["session_rate"],
+            session_burst=admission_settings["session_burst"],
+            rejected=mcp_server.metrics.rejected,
+        )
+
+    lifecycle = app.state.lifecycle = Lifecycle()
+    app.add_middleware(
+        DrainMiddleware,
+        lifecycle=lifecycle,
+        path=mcp_server.settings.streamable_http_path,
+        rejected=mcp_server.metrics.rejected,
+    )
+    session_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[Any]:
+        try:
+            async with session_lifespan(app) as state, lifecycle.serving():
+                yield state
+        finally:
+            await mcp_server.http.aclose()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def export_options(options: dict[str, Any]) -> None:
+    """Publish options for `create_http_app_from_env` in child processes."""
+    os.environ[OPTIONS_ENV] = json.dumps(options)
+
+
+def create_http_app_from_env() -> Starlette:
+    """App factory used by uvicorn worker processes."""
+    options = json.loads(os.environ.get(OPTIONS_ENV, "{}"))
+    configure_process(options)
+    return create_http_app(**options.get("app", {}))
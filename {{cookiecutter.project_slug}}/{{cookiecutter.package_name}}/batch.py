@@ -0,0 +1,75 @@
+"""Running many tool calls in one request.
+
+MCP has no batch method, so batching is offered as a regular tool: the client
+calls `batch` with a list of `{"name", "arguments"}` items and gets one result
+per item back, in the same order. Items are independent and run concurrently,
+up to `max_concurrency` at a time; a failing or rate-limited item reports its
+error without affecting the others. Because it is an ordinary tool it works
+over every transport, and each item goes through the same handlers as a
+`tools/call` request (per-tool rate limits, tracing, caching, executors,
+metrics, output validation).
+"""
+
+import asyncio
+from typing import Any
+
+from mcp.types import CallToolResult
+from pydantic import BaseModel, Field
+
+DEFAULT_MAX_CALLS = 100
+DEFAULT_MAX_CONCURRENCY = 8
+
+BATCH_TOOL = "batch"
+
+limits = {"max_calls": DEFAULT_MAX_CALLS, "max_concurrency": DEFAULT_MAX_CONCURRENCY}
+
+
+class BatchCall(BaseModel):
+    """One tool invocation in a batch."""
+
+    name: str = Field(description="Name of the tool to call")
+    arguments: dict[str, Any] = Field(default_factory=dict, description="Arguments for the tool")
+
+
+class BatchResult(BaseModel):
+    """The outcome of one batch item."""
+
+    ok: bool
+    content: list[dict[str, Any]] | None = None
+    structured: dict[str, Any] | None = None
+    error: str | None = None
+
+
+def configure_batch(max_calls: int | None = None, max_concurrency: int | None = None) -> None:
+    """Set the batch size cap and the number of items run at once."""
+    if max_calls is not None:
+        limits["max_calls"] = max_calls
+    if max_concurrency is not None:
+        limits["max_concurrency"] = max_concurrency
+
+
+async def run_batch(server: Any, calls: list[BatchCall]) -> list[BatchResult]:
+    """Run `calls` through `server.dispatch_tool_call` and return results in order."""
+    if len(calls) > limits["max_calls"]:
+        raise ValueError(f"Batch of {len(calls)} calls exceeds the limit of {limits['max_calls']}")
+    semaphore = asyncio.Semaphore(limits["max_concurrency"])
+
+    async def run_one(call: BatchCall) -> BatchResult:
+        if call.name == BATCH_TOOL:
+            return BatchResult(ok=False, error="Batches cannot be nested")
+        async with semaphore:
+            try:
+                result = await server.dispatch_tool_call(call.name, call.arguments)
+            except Exception as e:
+                return BatchResult(ok=False, error=str(e))
+        if not isinstance(result, CallToolResult):
+            return BatchResult(ok=False, error="Tasks cannot be started from a batch")
+        if result.isError:
+            return BatchResult(ok=False, error=" ".join(getattr(block, "text", "") for block in result.content))
+        return BatchResult(
+            ok=True,
+            content=[block.model_dump(exclude_none=True) for block in result.content],
+            structured=result.structuredContent,
+        )
+
+    return list(await asyncio.gather(*(run_one(call) for call in calls)))
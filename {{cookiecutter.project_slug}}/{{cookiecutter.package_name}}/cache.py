@@ -0,0 +1,74 @@
+"""Result caching for deterministic tools and resources.
+
+Results are keyed on the canonical JSON form of the call arguments and kept in
+a bounded LRU with an optional time-to-live. Only register a tool or resource
+with `cache=True` if it returns the same result for the same arguments;
+errors are never cached.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_MAXSIZE = 128
+
+MISSING = object()
+
+
+def make_key(arguments: dict[str, Any] | None) -> str:
+    """Canonical cache key for a set of call arguments."""
+    return json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+class ResultCache:
+    """An LRU mapping with per-entry expiry and hit/miss counters.
+
+    Accessed only from the event loop thread, so it takes no locks.
+    """
+
+    def __init__(self, ttl: float | None = None, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or `MISSING`."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
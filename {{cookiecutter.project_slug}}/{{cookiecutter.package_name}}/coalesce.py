@@ -0,0 +1,55 @@
+"""Single-flight execution of identical concurrent calls.
+
+When many sessions make the same call at the same moment, as a fleet of
+agents reading `config://settings` at startup does, each call would run on
+its own. With `coalesce=True` on a tool or resource, a call arriving while an
+identical one is running waits for that one and gets its result (or its
+error) instead of running again. Calls are identical when they have the same
+arguments (for tools, keyed like the result cache) or the same URI (for
+resources). Nothing is kept once the running call finishes; combine with
+`cache=True` to also reuse the result afterwards.
+
+The shared execution runs in its own task, so a caller that is cancelled or
+disconnects does not cancel it for the others. It runs in the context of the
+first caller: progress and log notifications sent through `Context` reach
+that session only.
+"""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """At most one running execution per key, shared by every caller with that key.
+
+    Accessed only from the event loop thread, so it takes no locks.
+    """
+
+    def __init__(self) -> None:
+        self.executions = 0
+        self.coalesced = 0
+        self._flights: dict[str, asyncio.Task[Any]] = {}
+
+    async def run(self, key: str, execute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `execute()`, or of the running execution for `key`."""
+        flight = self._flights.get(key)
+        if flight is None:
+            self.executions += 1
+            flight = asyncio.ensure_future(execute())
+            self._flights[key] = flight
+            flight.add_done_callback(partial(self._land, key))
+        else:
+            self.coalesced += 1
+        # Shielded, so cancelling one caller leaves the execution to the others
+        return await asyncio.shield(flight)
+
+    def _land(self, key: str, flight: asyncio.Task[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Mark an error as seen even if every caller was cancelled meanwhile
+            flight.exception()
+
+    def stats(self) -> dict[str, Any]:
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._flights)}
@@ -0,0 +1,670 @@
+"""FastMCP server with per-registration execution, caching and coalescing
+options, tool schemas compiled once, versioned resources, call metrics and
+tracing, cached list responses, a pooled HTTP client for tools, tool plugins
+imported on first call, and streamable-http sessions other replicas can
+resume."""
+
+import inspect
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, Sequence, cast
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from mcp.server.session import ServerSession
+from mcp.shared.exceptions import UrlElicitationRequiredError
+from mcp.types import (
+    CallToolRequest,
+    CallToolRequestParams,
+    CallToolResult,
+    CreateTaskResult,
+    EmptyResult,
+    GetPromptRequest,
+    GetPromptResult,
+    Icon,
+    ListPromptsRequest,
+    ListPromptsResult,
+    ListResourcesRequest,
+    ListResourcesResult,
+    ListResourceTemplatesRequest,
+    ListResourceTemplatesResult,
+    ListToolsRequest,
+    ListToolsResult,
+    ReadResourceRequest,
+    ServerCapabilities,
+    ServerResult,
+    SubscribeRequest,
+    TextContent,
+    ToolAnnotations,
+    UnsubscribeRequest,
+)
+from mcp.types import Tool as MCPTool
+from pydantic import AnyUrl
+from starlette.applications import Starlette
+
+from . import admission, tracing
+from .batch import BATCH_TOOL, BatchCall, BatchResult, run_batch
+from .cache import DEFAULT_MAXSIZE, MISSING, ResultCache, make_key
+from .coalesce import SingleFlight
+from .executors import ExecutorKind, offload
+from .files import DEFAULT_CHUNK_SIZE, MappedFileResource, requested_range
+from .http_pool import HTTPPool
+from .listings import Listing, Registry
+from .metrics import UNKNOWN, Metrics
+from .plugins import Plugin
+from .resources import Subscriptions, compute_etag, not_modified, requested_etag, with_etag
+from .schemas import CompiledSchema
+from .serialization import SerializedResults, dumps_text
+from .sessions import MemorySessionStore, SessionStore, SharedSessionManager
+from .stdio import stdio_server
+from .streaming import stream_tool
+
+
+class Server(FastMCP):
+    """FastMCP with extra options on the registration decorators.
+
+    Example:
+        @mcp.tool(executor="thread")
+        def slow_lookup(key: str) -> str:
+            ...
+
+        @mcp.tool(cache=True, ttl=60)
+        def convert(amount: float, currency: str) -> float:
+            ...
+
+        @mcp.resource("config://settings", coalesce=True)
+        async def settings() -> str:
+            ...
+
+        @mcp.tool()
+        async def export(table: str) -> AsyncIterator[str]:
+            async for row in read_rows(table):
+                yield row
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._tool_caches: dict[str, ResultCache] = {}
+        self._resource_caches: dict[str, ResultCache] = {}
+        self._tool_flights: dict[str, SingleFlight] = {}
+        self._resource_flights: dict[str, SingleFlight] = {}
+        self._file_resources: dict[str, MappedFileResource] = {}
+        # Output schema validators by tool name, with the tool they were compiled for
+        self._output_schemas: dict[str, tuple[Tool, CompiledSchema | None]] = {}
+        # Plugins by key, and the tools of those not imported yet, as listed in the manifest
+        self._plugins: dict[str, Plugin] = {}
+        self._plugin_tools: dict[str, tuple[Plugin, MCPTool]] = {}
+        self._plugin_imports: dict[str, anyio.Lock] = {}
+        self._subscriptions = Subscriptions()
+        self.metrics = Metrics()
+        # Outbound HTTP for tools (`ctx.fastmcp.http`), closed when the server stops
+        self.http = HTTPPool()
+        # Where streamable-http sessions are recorded, so other replicas can resume them
+        self.session_store: SessionStore = MemorySessionStore()
+        self._count_sessions()
+        self._cache_listings()
+        self._dispatch_tool_calls()
+        self._limit_tool_calls()
+        self._trace_requests()
+        self._handle_subscriptions()
+
+    def _count_sessions(self) -> None:
+        """Wrap the low-level lifespan, which is entered once per session."""
+        session_lifespan = self._mcp_server.lifespan
+        metrics = self.metrics
+
+        @asynccontextmanager
+        async def counted_lifespan(server: Any) -> AsyncIterator[Any]:
+            metrics.active_sessions += 1
+            try:
+                async with session_lifespan(server) as context:
+                    yield context
+            finally:
+                metrics.active_sessions -= 1
+
+        self._mcp_server.lifespan = counted_lifespan
+
+    def _cache_listings(self) -> None:
+        """Answer the list methods from pages dumped once per change of the registry."""
+        self.listings = {
+            "tools": Listing(ListToolsResult, "tools", self.list_tools, ServerSession.send_tool_list_changed),
+            "prompts": Listing(
+                ListPromptsResult, "prompts", self.list_prompts, ServerSession.send_prompt_list_changed
+            ),
+            "resources": Listing(
+                ListResourcesResult, "resources", self.list_resources, ServerSession.send_resource_list_changed
+            ),
+            "resource_templates": Listing(
+                ListResourceTemplatesResult,
+                "resourceTemplates",
+                self.list_resource_templates,
+                ServerSession.send_resource_list_changed,
+            ),
+        }
+        tools, prompts = self.listings["tools"], self.listings["prompts"]
+        resources, templates = self.listings["resources"], self.listings["resource_templates"]
+        self._tool_manager._tools = Registry(self._tool_manager._tools, tools.invalidate)
+        self._plugin_tools = Registry(self._plugin_tools, tools.invalidate)
+        self._prompt_manager._prompts = Registry(self._prompt_manager._prompts, prompts.invalidate)
+        self._resource_manager._resources = Registry(self._resource_manager._resources, resources.invalidate)
+        self._resource_manager._templates = Registry(self._resource_manager._templates, templates.invalidate)
+
+        lowlevel = self._mcp_server
+        for request_type, listing in (
+            (ListToolsRequest, tools),
+            (ListPromptsRequest, prompts),
+            (ListResourcesRequest, resources),
+            (ListResourceTemplatesRequest, templates),
+        ):
+
+            async def handler(request: Any, listing: Listing = listing) -> ServerResult:
+                cursor = request.params.cursor if request.params is not None else None
+                return await listing.page(cursor, lowlevel.request_context.session)
+
+            lowlevel.request_handlers[request_type] = handler
+
+    def _dispatch_tool_calls(self) -> None:
+        """Replace the low-level call handler with one using compiled output schemas.
+
+        It builds the same results as the SDK's, but checks structured
+        results with a validator compiled on the tool's first call instead of
+        `jsonschema.validate`, which recompiles the schema on every call.
+        """
+
+        async def dispatch(request: CallToolRequest) -> ServerResult:
+            name = request.params.name
+            try:
+                result = await self.call_tool(name, request.params.arguments or {})
+                return ServerResult(self._tool_result(name, result))
+            except UrlElicitationRequiredError:
+                # Answered by the session with its own JSON-RPC error
+                raise
+            except Exception as e:
+                return ServerResult(_error_result(str(e)))
+
+        self._mcp_server.request_handlers[CallToolRequest] = dispatch
+
+    def _tool_result(self, name: str, result: Any) -> CallToolResult | CreateTaskResult:
+        """Build the result of a call from what `call_tool` returned, as the SDK does."""
+        if isinstance(result, CallToolResult | CreateTaskResult):
+            return result
+        if isinstance(result, tuple) and len(result) == 2:
+            content, structured = result
+        elif isinstance(result, dict):
+            content, structured = [TextContent(type="text", text=dumps_text(result))], result
+        else:
+            content, structured = result, None
+
+        schema = self._output_schema(name)
+        if schema is not None:
+            if structured is None:
+                return _error_result("Output validation error: outputSchema defined but no structured output returned")
+            error = schema.error(structured)
+            if error is not None:
+                return _error_result(f"Output validation error: {error}")
+        return CallToolResult(content=list(content), structuredContent=structured, isError=False)
+
+    def _output_schema(self, name: str) -> CompiledSchema | None:
+        """The compiled output schema of tool `name`, if it has one.
+
+        Compiled on the tool's first call rather than at registration, where
+        checking every schema would add to each stdio cold start.
+        """
+        tool = self._tool_manager.get_tool(name)
+        if tool is None:
+            self._output_schemas.pop(name, None)
+            return None
+        entry = self._output_schemas.get(name)
+        if entry is None or entry[0] is not tool:
+            schema = tool.output_schema
+            entry = self._output_schemas[name] = (tool, CompiledSchema(schema) if schema is not None else None)
+        return entry[1]
+
+    def _limit_tool_calls(self) -> None:
+        """Check the per-tool rate before the low-level call handler runs.
+
+        Raising here, rather than in `call_tool`, makes a rejection a JSON-RPC
+        error instead of a tool result with `isError` set.
+        """
+        handler = self._mcp_server.request_handlers[CallToolRequest]
+
+        async def admitted(request: CallToolRequest) -> Any:
+            self.admit_tool(request.params.name)
+            return await handler(request)
+
+        self._mcp_server.request_handlers[CallToolRequest] = admitted
+
+    def _trace_requests(self) -> None:
+        """Record tool calls, prompt renders and resource reads as spans when tracing is on."""
+        handlers = self._mcp_server.request_handlers
+        for request_type in (CallToolRequest, GetPromptRequest, ReadResourceRequest):
+            handlers[request_type] = tracing.traced(handlers[request_type], self._mcp_server)
+
+    def _handle_subscriptions(self) -> None:
+        """Accept resource subscriptions, and advertise them and list changes in the capabilities."""
+        lowlevel = self._mcp_server
+
+        # Registered directly: the SDK's `subscribe_resource` decorators are untyped
+        async def subscribe(request: SubscribeRequest) -> ServerResult:
+            uri = str(request.params.uri)
+            file = self._file_resources.get(uri)
+            etag = file.etag() if file else (await self._resource_entry(uri))[0]
+            self._subscriptions.add(uri, lowlevel.request_context.session, etag)
+            return ServerResult(EmptyResult())
+
+        async def unsubscribe(request: UnsubscribeRequest) -> ServerResult:
+            self._subscriptions.remove(str(request.params.uri), lowlevel.request_context.session)
+            return ServerResult(EmptyResult())
+
+        lowlevel.request_handlers[SubscribeRequest] = subscribe
+        lowlevel.request_handlers[UnsubscribeRequest] = unsubscribe
+
+        get_capabilities = lowlevel.get_capabilities
+
+        def capabilities(*args: Any, **kwargs: Any) -> ServerCapabilities:
+            result = get_capabilities(*args, **kwargs)
+            # Changes to the registry are announced (see `listings`)
+            for capability in (result.tools, result.prompts, result.resources):
+                if capability is not None:
+                    capability.listChanged = True
+            if result.resources is not None:
+                result.resources.subscribe = True
+            return result
+
+        lowlevel.get_capabilities = capabilities  # type: ignore[method-assign]
+
+    async def dispatch_tool_call(self, name: str, arguments: dict[str, Any]) -> CallToolResult | CreateTaskResult:
+        """Call tool `name` through the handlers of a `tools/call` request.
+
+        The call is rate limited, traced and has its output validated exactly
+        as a request from the client would. A rate limit raises `McpError`;
+        other failures are results with `isError` set.
+        """
+        request = CallToolRequest(params=CallToolRequestParams(name=name, arguments=arguments))
+        result: ServerResult = await self._mcp_server.request_handlers[CallToolRequest](request)
+        return cast(CallToolResult | CreateTaskResult, result.root)
+
+    def admit_tool(self, name: str) -> None:
+        """Raise a `RATE_LIMITED` `McpError` if tool `name` is over its rate."""
+        wait = admission.tool_wait(name)
+        if wait:
+            self.metrics.rejected["tool_rate"] = self.metrics.rejected.get("tool_rate", 0) + 1
+            raise admission.rate_limited_error(f"Rate limit exceeded for tool {name}", wait)
+
+    def tool(
+        self,
+        name: str | None = None,
+        title: str | None = None,
+        description: str | None = None,
+        annotations: ToolAnnotations | None = None,
+        icons: list[Icon] | None = None,
+        meta: dict[str, Any] | None = None,
+        structured_output: bool | None = None,
+        *,
+        executor: ExecutorKind | None = None,
+        cache: bool = False,
+        ttl: float | None = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        coalesce: bool = False,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Register a tool.
+
+        An async generator function becomes a streaming tool: each yielded
+        text chunk is sent as a progress notification (see `streaming`).
+
+        Args:
+            name: Optional name for the tool (defaults to function name)
+            title, description, annotations, icons, meta, structured_output:
+                As for `FastMCP.tool`
+            executor: Run the (sync) tool in the "thread" or "process" pool
+                instead of on the event loop
+            cache: Serve repeated calls with the same arguments from a cache,
+                skipping argument validation and execution
+            ttl: Seconds a cached result stays valid (None = until evicted)
+            maxsize: Number of results to keep per tool
+            coalesce: Let calls with the same arguments as a running call
+                share its execution (see `coalesce`)
+        """
+        register = super().tool(
+            name, title, description, annotations, icons, meta, structured_output
+        )
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            if inspect.isasyncgenfunction(fn):
+                if executor or cache or coalesce:
+                    raise TypeError(
+                        f"{fn.__name__} streams its result; it cannot use an executor, cache or coalescing"
+                    )
+                register(stream_tool(fn))
+            else:
+                register(offload(fn, executor) if executor else fn)
+            self._serialize_results(name or fn.__name__)
+            if cache:
+                self._tool_caches[name or fn.__name__] = ResultCache(ttl, maxsize)
+            if coalesce:
+                self._tool_flights[name or fn.__name__] = SingleFlight()
+            # Return the original so process pools can pickle it by reference
+            return fn
+
+        return decorator
+
+    def _serialize_results(self, name: str) -> None:
+        """Encode the tool's non-text results with the configured serializer."""
+        tool = self._tool_manager.get_tool(name)
+        if tool is not None:
+            tool.fn_metadata = SerializedResults.from_metadata(tool.fn_metadata)
+
+    def add_batch_tool(self) -> None:
+        """Register the `batch` tool, which runs many tool calls in one request."""
+
+        async def batch(calls: list[BatchCall]) -> list[BatchResult]:
+            """Call several tools in one request.
+
+            Calls run concurrently and results are returned in the same order,
+            each with either its content or its error.
+
+            Args:
+                calls: Tool invocations, each with a tool name and its arguments
+            """
+            return await run_batch(self, calls)
+
+        self.add_tool(batch, name=BATCH_TOOL)
+        self._serialize_results(BATCH_TOOL)
+
+    def resource(
+        self,
+        uri: str,
+        *,
+        cache: bool = False,
+        ttl: float | None = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        coalesce: bool = False,
+        **kwargs: Any,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Register a resource.
+
+        Every read is versioned with an ETag (see `resources`); with `cache`
+        the contents and their ETag are kept, keyed by the concrete URI.
+
+        Args:
+            uri: URI for the resource (e.g. "resource://my-resource" or "resource://{param}")
+            cache: Keep the contents instead of rebuilding them on every read
+            ttl: Seconds a cached result stays valid (None = until evicted)
+            maxsize: Number of results to keep (one per template parameter set)
+            coalesce: Let reads of a URI that is being read share that read
+                (see `coalesce`)
+            **kwargs: Passed through to `FastMCP.resource`
+        """
+        register = super().resource(uri, **kwargs)
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            register(fn)
+            if cache:
+                self._resource_caches[uri] = ResultCache(ttl, maxsize)
+            if coalesce:
+                self._resource_flights[uri] = SingleFlight()
+            return fn
+
+        return decorator
+
+    def file_resource(
+        self,
+        uri: str,
+        path: str | Path,
+        *,
+        mime_type: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> MappedFileResource:
+        """Serve a (large) file as a resource, memory-mapped and read in chunks.
+
+        Args:
+            uri: URI for the resource
+            path: The file to serve; it may be replaced or grow while served
+            mime_type: MIME type (default: guessed from the extension); text
+                types are served as UTF-8 text, others as base64 blobs
+            chunk_size: Largest number of bytes returned by one read
+            **kwargs: Other `Resource` fields, such as `name` or `description`
+        """
+        resource = MappedFileResource.from_path(uri, path, mime_type, chunk_size=chunk_size, **kwargs)
+        self.add_resource(resource)
+        self._file_resources[uri] = resource
+        return resource
+
+    def has_plugin(self, plugin: Plugin) -> bool:
+        return plugin.key in self._plugins
+
+    def add_plugin(self, plugin: Plugin, tools: list[dict[str, Any]] | None = None) -> list[dict[str, Any]]:
+        """Add the tools of a plugin (see `plugins`).
+
+        Args:
+            plugin: The plugin
+            tools: Descriptions of its tools from the manifest. They are listed
+                as they are, and the plugin is imported when one is first
+                called. Without them the plugin is imported and registered now.
+
+        Returns:
+            The descriptions of the plugin's tools, for the manifest
+        """
+        self._plugins[plugin.key] = plugin
+        if tools is not None:
+            for tool in tools:
+                description = MCPTool.model_validate(tool)
+                self._plugin_tools[description.name] = (plugin, description)
+            return tools
+        before = {tool.name for tool in self._tool_manager.list_tools()}
+        plugin.load()(self)
+        added = [tool for tool in self._tool_manager.list_tools() if tool.name not in before]
+        return [_describe(tool).model_dump(mode="json", by_alias=True, exclude_none=True) for tool in added]
+
+    async def _import_plugin(self, plugin: Plugin) -> None:
+        """Import a plugin listed from the manifest and register its tools for real.
+
+        The import runs in a worker thread, so the event loop keeps serving
+        meanwhile. Concurrent first calls wait for the one import.
+        """
+        lock = self._plugin_imports.get(plugin.key)
+        if lock is None:
+            lock = self._plugin_imports[plugin.key] = anyio.Lock()
+        async with lock:
+            if not any(owner is plugin for owner, _ in self._plugin_tools.values()):
+                return  # Imported by the call we waited for
+            register = await anyio.to_thread.run_sync(plugin.load)
+            for name, (owner, _) in list(self._plugin_tools.items()):
+                if owner is plugin:
+                    del self._plugin_tools[name]
+            register(self)
+
+    async def list_tools(self) -> list[MCPTool]:
+        """The registered tools, then the plugin tools not imported yet."""
+        tools = await super().list_tools()
+        return tools + [description for _, description in self._plugin_tools.values()]
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[Any] | dict[str, Any]:
+        """Call a tool, answering from its result cache when it has one.
+
+        Every call, including cache hits, is recorded in `metrics`. The first
+        call of a plugin tool imports its plugin.
+        """
+        pending = self._plugin_tools.get(name)
+        if pending is not None:
+            await self._import_plugin(pending[0])
+        label = name if self._tool_manager.get_tool(name) else UNKNOWN
+        return await self.metrics.track("tool", label, self._call_tool(name, arguments))
+
+    async def _call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[Any] | dict[str, Any]:
+        cache = self._tool_caches.get(name)
+        if cache is None:
+            return await self._execute_tool(name, arguments)
+
+        key = make_key(arguments)
+        result: Sequence[Any] | dict[str, Any] = cache.get(key)
+        span = tracing.current_span()
+        if span is not None:
+            span.set_attribute("mcp.cache.hit", result is not MISSING)
+        if result is MISSING:
+            result = await self._execute_tool(name, arguments)
+            cache.set(key, result)
+        return result
+
+    async def _execute_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[Any] | dict[str, Any]:
+        """Run the tool, or wait for an identical running call if it coalesces calls."""
+        flights = self._tool_flights.get(name)
+        if flights is None:
+            return await super().call_tool(name, arguments)
+        result: Sequence[Any] | dict[str, Any] = await flights.run(
+            make_key(arguments), partial(FastMCP.call_tool, self, name, arguments)
+        )
+        return result
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None) -> GetPromptResult:
+        """Render a prompt, recording it in `metrics`."""
+        label = name if self._prompt_manager.get_prompt(name) else UNKNOWN
+        return await self.metrics.track("prompt", label, super().get_prompt(name, arguments))
+
+    async def read_resource(self, uri: AnyUrl | str) -> Iterable[ReadResourceContents]:
+        """Read a resource, recording it in `metrics` under its URI or URI template.
+
+        If the request's `_meta` has an `ifNoneMatch` equal to the current
+        ETag, the contents are replaced by a "not modified" marker.
+        """
+        return await self.metrics.track("resource", self._resource_label(str(uri)), self._read_resource(str(uri)))
+
+    async def _read_resource(self, uri: str) -> list[ReadResourceContents]:
+        try:
+            meta = self._mcp_server.request_context.meta
+        except LookupError:
+            # Called outside of a request
+            meta = None
+        file = self._file_resources.get(uri)
+        if file is not None:
+            return await self._read_file(file, meta)
+
+        etag, contents = await self._resource_entry(uri)
+        if requested_etag(meta) == etag:
+            return not_modified(etag, contents[0].mime_type, isinstance(contents[0].content, bytes))
+        return contents
+
+    async def _read_file(self, file: MappedFileResource, meta: Any) -> list[ReadResourceContents]:
+        """One range of a file resource, read in a thread since it may hit the disk."""
+        etag = file.etag()
+        await self._subscriptions.publish(str(file.uri), etag)
+        if requested_etag(meta) == etag:
+            return not_modified(etag, file.mime_type, file.binary)
+        chunk = await anyio.to_thread.run_sync(file.read_range, *requested_range(meta))
+        return with_etag([chunk], etag)
+
+    async def _resource_entry(self, uri: str) -> tuple[str, list[ReadResourceContents]]:
+        """The ETag and contents of `uri`, from its cache when it has one."""
+        label = self._resource_label(uri)
+        cache = self._resource_caches.get(label)
+        if cache:
+            entry: tuple[str, list[ReadResourceContents]] = cache.get(uri)
+            if entry is not MISSING:
+                return entry
+        flights = self._resource_flights.get(label)
+        if flights is None:
+            return await self._build_resource_entry(uri, cache)
+        entry = await flights.run(uri, partial(self._build_resource_entry, uri, cache))
+        return entry
+
+    async def _build_resource_entry(
+        self, uri: str, cache: ResultCache | None
+    ) -> tuple[str, list[ReadResourceContents]]:
+        contents = list(await super().read_resource(uri))
+        etag = compute_etag(contents)
+        entry = (etag, with_etag(contents, etag))
+        if cache:
+            cache.set(uri, entry)
+        await self._subscriptions.publish(uri, etag)
+        return entry
+
+    async def refresh_resource(self, uri: str) -> str:
+        """Rebuild a resource after its data changed and return the new ETag.
+
+        Subscribers are notified only if the contents actually differ from
+        the version they last saw.
+        """
+        file = self._file_resources.get(uri)
+        if file is not None:
+            etag = file.etag()
+            await self._subscriptions.publish(uri, etag)
+            return etag
+        cache = self._resource_caches.get(self._resource_label(uri))
+        if cache:
+            cache.discard(uri)
+        # Not joined with a coalesced read, which may have started before the change
+        etag, _ = await self._build_resource_entry(uri, cache)
+        return etag
+
+    async def run_stdio_async(self) -> None:
+        """Run the server on stdin and stdout."""
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self._mcp_server.run(
+                    read_stream,
+                    write_stream,
+                    self._mcp_server.create_initialization_options(),
+                )
+        finally:
+            await self.http.aclose()
+
+    def streamable_http_app(self) -> Starlette:
+        """The streamable-http app, with sessions recorded in `session_store`
+        and messages encoded by the configured serializer."""
+        if self._session_manager is None:
+            self._session_manager = SharedSessionManager(
+                self.session_store,
+                app=self._mcp_server,
+                event_store=self._event_store,
+                retry_interval=self._retry_interval,
+                json_response=self.settings.json_response,
+                stateless=self.settings.stateless_http,
+                security_settings=self.settings.transport_security,
+                max_request_body_size=self.settings.max_request_body_size,
+                session_idle_timeout=self.settings.session_idle_timeout,
+                max_sessions=self.settings.max_sessions,
+            )
+        return super().streamable_http_app()
+
+    def _resource_label(self, uri: str) -> str:
+        """The registered URI or URI template that `uri` resolves to."""
+        if any(str(resource.uri) == uri for resource in self._resource_manager.list_resources()):
+            return uri
+        for template in self._resource_manager.list_templates():
+            if template.matches(uri) is not None:
+                return template.uri_template
+        return UNKNOWN
+
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        """Hit/miss counters for every cached tool and resource."""
+        stats = {f"tool:{name}": cache.stats() for name, cache in self._tool_caches.items()}
+        stats.update({f"resource:{uri}": cache.stats() for uri, cache in self._resource_caches.items()})
+        return stats
+
+    def coalesce_stats(self) -> dict[str, dict[str, Any]]:
+        """Executions and coalesced calls for every tool and resource that coalesces."""
+        stats = {f"tool:{name}": flights.stats() for name, flights in self._tool_flights.items()}
+        stats.update({f"resource:{uri}": flights.stats() for uri, flights in self._resource_flights.items()})
+        return stats
+
+
+def _describe(tool: Tool) -> MCPTool:
+    """The `tools/list` entry of a registered tool, as `FastMCP.list_tools` builds it."""
+    return MCPTool(
+        name=tool.name,
+        title=tool.title,
+        description=tool.description,
+        inputSchema=tool.parameters,
+        outputSchema=tool.output_schema,
+        annotations=tool.annotations,
+        icons=tool.icons,
+        _meta=tool.meta,
+    )
+
+
+def _error_result(message: str) -> CallToolResult:
+    return CallToolResult(content=[TextContent(type="text", text=message)], isError=True)
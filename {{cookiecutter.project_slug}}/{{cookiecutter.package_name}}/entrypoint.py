@@ -1,27 +1,41 @@
 """Main entry point for {{ cookiecutter.project_name }}."""
 
 import sys
-from typing import Any
+from typing import Any, Optional
 from enum import Enum
 
 import typer
 from loguru import logger
-from rich.console import Console
 
-from .server import create_server
+from . import startup
+from .batch import DEFAULT_MAX_CALLS, DEFAULT_MAX_CONCURRENCY
+from .executors import DEFAULT_MAX_QUEUE, shutdown_executors
+from .logs import LogFormat
+from .stdio import DEFAULT_CONCURRENCY
+
+# Only what stdio needs is imported above; everything else is imported where
+# it is used, since stdio servers are started once per client session.
 
 app = typer.Typer(
     name="{{ cookiecutter.package_name }}",
     help="{{ cookiecutter.project_description }}",
     add_completion=False,
 )
-console = Console()
+
 
 class Transport(str, Enum):
     stdio = "stdio"
     streamable_http = "streamable-http"
 
 
+class Serializer(str, Enum):
+    auto = "auto"
+    orjson = "orjson"
+    msgspec = "msgspec"
+    pydantic = "pydantic"
+    json = "json"
+
+
 @app.command()
 def serve(
     transport: Transport = typer.Option(
@@ -48,51 +62,304 @@ def serve(
         "-l",
         help="Log level (DEBUG, INFO, WARNING, ERROR)",
     ),
+    log_format: LogFormat = typer.Option(
+        "text",
+        "--log-format",
+        help="Log output format (text or json)",
+    ),
+    log_queue: bool = typer.Option(
+        True,
+        "--log-queue/--no-log-queue",
+        help="Write logs from a background thread instead of the event loop",
+    ),
+    log_rate_limit: float = typer.Option(
+        0,
+        "--log-rate-limit",
+        min=0,
+        help="Max INFO logs per second from each tool (0 = unlimited)",
+    ),
+    trace_file: Optional[str] = typer.Option(
+        None,
+        "--trace-file",
+        help="Record a span per tool call, prompt render and resource read, appended to this file as OTLP/JSON",
+    ),
+    serializer: Serializer = typer.Option(
+        "auto",
+        "--serializer",
+        help="JSON encoder for tool results and messages (auto picks the fastest installed)",
+    ),
+    stdio_concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--stdio-concurrency",
+        min=0,
+        help="Requests handled at once, answered as each finishes (for stdio transport; 1 = in order, 0 = unlimited)",
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Number of worker processes (for streamable-http transport)",
+    ),
+    stateless: bool = typer.Option(
+        False,
+        "--stateless",
+        help="Keep no session state so any worker can serve any request (for streamable-http transport)",
+    ),
+    session_store: str = typer.Option(
+        "memory",
+        "--session-store",
+        help="Where sessions are recorded so any replica can resume them: memory, "
+        "sqlite:///<path> or redis://<host>:<port>/<db> (for streamable-http transport)",
+    ),
+    metrics: bool = typer.Option(
+        True,
+        "--metrics/--no-metrics",
+        help="Serve Prometheus metrics on /metrics (for streamable-http transport)",
+    ),
+    thread_workers: Optional[int] = typer.Option(
+        None,
+        "--thread-workers",
+        min=1,
+        help="Size of the thread pool for tools registered with executor='thread'",
+    ),
+    process_workers: Optional[int] = typer.Option(
+        None,
+        "--process-workers",
+        min=1,
+        help="Size of the process pool for tools registered with executor='process'",
+    ),
+    executor_queue: int = typer.Option(
+        DEFAULT_MAX_QUEUE,
+        "--executor-queue",
+        min=0,
+        help="Calls that may wait for a busy pool before new ones are rejected",
+    ),
+    batch_max_calls: int = typer.Option(
+        DEFAULT_MAX_CALLS,
+        "--batch-max-calls",
+        min=1,
+        help="Most tool calls accepted in one call to the batch tool",
+    ),
+    batch_concurrency: int = typer.Option(
+        DEFAULT_MAX_CONCURRENCY,
+        "--batch-concurrency",
+        min=1,
+        help="Calls from one batch that run at the same time",
+    ),
+    max_in_flight: int = typer.Option(
+        0,
+        "--max-in-flight",
+        min=0,
+        help="MCP requests handled at once before new ones get HTTP 429 (0 = unlimited)",
+    ),
+    session_rate: float = typer.Option(
+        0,
+        "--session-rate",
+        min=0,
+        help="Requests per second allowed from each session (0 = unlimited)",
+    ),
+    session_burst: Optional[float] = typer.Option(
+        None,
+        "--session-burst",
+        min=1,
+        help="Requests a session may send at once before --session-rate applies (default: the rate)",
+    ),
+    tool_rate: float = typer.Option(
+        0,
+        "--tool-rate",
+        min=0,
+        help="Calls per second allowed to each tool, across all sessions (0 = unlimited)",
+    ),
+    tool_burst: Optional[float] = typer.Option(
+        None,
+        "--tool-burst",
+        min=1,
+        help="Calls a tool may take at once before --tool-rate applies (default: the rate)",
+    ),
+    drain_timeout: float = typer.Option(
+        30.0,
+        "--drain-timeout",
+        min=0,
+        help="Seconds after SIGTERM to let in-flight requests finish before exiting (for streamable-http transport)",
+    ),
+    drain_delay: float = typer.Option(
+        0.0,
+        "--drain-delay",
+        min=0,
+        help="Seconds after SIGTERM to keep serving while /readyz fails, before refusing new sessions",
+    ),
+    http_max_connections: Optional[int] = typer.Option(
+        None,
+        "--http-max-connections",
+        min=1,
+        help="Connections the shared HTTP client for tools keeps open at once (default: 100)",
+    ),
+    http_max_per_host: Optional[int] = typer.Option(
+        None,
+        "--http-max-per-host",
+        min=1,
+        help="Requests the shared HTTP client sends to one host at once (default: 20)",
+    ),
+    http_timeout: Optional[float] = typer.Option(
+        None,
+        "--http-timeout",
+        min=0,
+        help="Seconds the shared HTTP client waits to connect or for data (default: 10)",
+    ),
+    http_retries: Optional[int] = typer.Option(
+        None,
+        "--http-retries",
+        min=0,
+        help="Retries by the shared HTTP client after a failed connection or a 502/503/504 (default: 2)",
+    ),
+    list_page_size: int = typer.Option(
+        0,
+        "--list-page-size",
+        min=0,
+        help="Tools, prompts or resources per page of list results (0 = all in one page)",
+    ),
+    plugins: bool = typer.Option(
+        True,
+        "--plugins/--no-plugins",
+        help="Add the tools of installed plugin packages",
+    ),
+    plugin_manifest: Optional[str] = typer.Option(
+        None,
+        "--plugin-manifest",
+        help="File listing the tools of installed plugins, so they are imported only when called "
+        "(default: ~/.cache/{{ cookiecutter.package_name }}/plugins.json)",
+    ),
+    profiler: bool = typer.Option(
+        False,
+        "--profiler/--no-profiler",
+        help="Sample the running server on demand: GET /debug/profile (streamable-http transport) "
+        "or SIGUSR1, writing the profile to files (stdio transport)",
+    ),
+    profiler_seconds: Optional[float] = typer.Option(
+        None,
+        "--profiler-seconds",
+        min=0.1,
+        max=60,
+        help="Seconds a profile samples, unless the request says otherwise (default: 10)",
+    ),
+    profiler_dir: Optional[str] = typer.Option(
+        None,
+        "--profiler-dir",
+        help="Directory for profiles started by SIGUSR1 (default: the temp directory)",
+    ),
+    profile_startup: bool = typer.Option(
+        False,
+        startup.FLAG,
+        help="Print import and init times per module to stderr once the server is ready",
+    ),
 ) -> None:
     """Start the MCP server."""
-    # Configure logging
-    logger.remove()
-    logger.add(
-        sys.stderr,
-        level=log_level.upper(),
-        format=(
-            "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-            "<level>{level: <8}</level> | "
-            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-            "<level>{message}</level>"
-        ),
-    )
-
-    console.print(f"🚀 Starting {{ cookiecutter.project_name }} server...")
-    console.print(f"📡 Transport: {transport}")
-    
+    if profile_startup:
+        # Normally already enabled by the package's `main`, before any imports
+        startup.enable()
+
+    # Options for each subsystem, applied here and in every worker process
+    options: dict[str, Any] = {
+        "logging": {
+            "log_level": log_level,
+            "log_format": log_format.value,
+            "log_queue": log_queue,
+            "log_rate_limit": log_rate_limit,
+        },
+        "tracing": {"file": trace_file},
+        "serialization": {"serializer": serializer.value},
+        "executors": {
+            "thread_workers": thread_workers,
+            "process_workers": process_workers,
+            "max_queue": executor_queue,
+        },
+        "batch": {"max_calls": batch_max_calls, "max_concurrency": batch_concurrency},
+        "admission": {
+            "max_in_flight": max_in_flight,
+            "session_rate": session_rate,
+            "session_burst": session_burst,
+            "tool_rate": tool_rate,
+            "tool_burst": tool_burst,
+        },
+        "lifecycle": {"drain_timeout": drain_timeout, "drain_delay": drain_delay},
+        "sessions": {"store": session_store},
+        "stdio": {"concurrency": stdio_concurrency},
+        "listings": {"page_size": list_page_size},
+        "plugins": {"enabled": plugins, "manifest": plugin_manifest},
+        "profiler": {"seconds": profiler_seconds, "directory": profiler_dir},
+        "http": {
+            "max_connections": http_max_connections,
+            "max_per_host": http_max_per_host,
+            "timeout": http_timeout,
+            "retries": http_retries,
+        },
+        "app": {"stateless": stateless, "metrics": metrics, "profiler": profiler},
+    }
+    from .process import configure_process
+
+    with startup.phase("configure_process"):
+        configure_process(options)
+
+    # In stdio mode stdout carries the protocol, so print nothing there
+    console = None
     if transport == "streamable-http":
+        from rich.console import Console
+
+        console = Console()
+        console.print("🚀 Starting {{ cookiecutter.project_name }} server...")
+        console.print(f"📡 Transport: {transport}")
         console.print(f"🌐 Host: {host}")
         console.print(f"📝 Port: {port}")
-    
-    console.print(f"📊 Log level: {log_level.upper()}")
+        console.print(f"👷 Workers: {workers}{' (stateless)' if stateless else ''}")
+        if metrics:
+            console.print(f"📈 Metrics: http://{host}:{port}/metrics")
+        if profiler:
+            console.print(f"🔬 Profiler: http://{host}:{port}/debug/profile")
+        console.print(f"🩺 Probes: http://{host}:{port}/healthz, /readyz")
+        console.print(f"📊 Log level: {log_level.upper()}")
 
     try:
-        # Get the FastMCP server
-        mcp_server = create_server()
-        
         # Run the server using FastMCP's built-in run method
         if transport == "stdio":
+            from .server import create_server
+
+            with startup.phase("create_server"):
+                mcp_server = create_server()
+            if profiler:
+                from .profiler import install_signal_handler
+
+                install_signal_handler()
+            startup.report()
             mcp_server.run()
+        elif transport == "streamable-http" and workers > 1:
+            from .workers import run_workers
+
+            startup.report()
+            run_workers(host=host, port=port, workers=workers, options=options)
         elif transport == "streamable-http":
             # For streamable-http, we need to run with uvicorn
             import uvicorn
-            app = mcp_server.streamable_http_app()
+
+            from .app import create_http_app
+
+            with startup.phase("create_http_app"):
+                app = create_http_app(**options["app"])
+            startup.report()
             uvicorn.run(app, host=host, port=port, log_level=log_level.lower())
         else:
             raise ValueError(f"Unsupported transport: {transport}")
             
     except KeyboardInterrupt:
-        console.print("\n👋 Server stopped by user")
+        if console:
+            console.print("\n👋 Server stopped by user")
     except Exception as e:
-        logger.error(f"Server error: {e}")
-        console.print(f"❌ Error: {e}", style="red")
+        logger.error("Server error: {}", e)
+        if console:
+            console.print(f"❌ Error: {e}", style="red")
         sys.exit(1)
+    finally:
+        shutdown_executors()
 
 
 def main() -> None:
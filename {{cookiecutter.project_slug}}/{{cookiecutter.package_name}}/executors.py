@@ -0,0 +1,152 @@
+"""Bounded thread and process pools for running synchronous tools off the event loop.
+
+A plain sync tool runs on the asyncio loop shared by every session, so a slow
+one stalls all of them. Tools registered with `executor="thread"` or
+`executor="process"` run in one of the pools below instead. Each pool accepts
+at most `max_workers + max_queue` calls at once; beyond that a call fails
+immediately with `PoolFullError` rather than queueing without bound.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import threading
+import typing
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Literal
+
+ExecutorKind = Literal["thread", "process"]
+
+DEFAULT_MAX_QUEUE = 64
+
+
+class PoolFullError(RuntimeError):
+    """Raised when a pool already has as many calls as it accepts."""
+
+
+class Pool:
+    """A lazily created executor with an admission limit and counters."""
+
+    def __init__(self, kind: ExecutorKind, max_workers: int, max_queue: int) -> None:
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor: Executor | None = None
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # Imported here: most servers never start a process pool
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # Spawn rather than fork: the server process runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="tool-worker",
+                )
+        return self._executor
+
+    def _release(self, _: Future[Any] | None = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn` in the pool, or raise `PoolFullError` if it is saturated."""
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise PoolFullError(
+                    f"The {self.kind} pool is full ({self.in_flight} calls in flight), try again later"
+                )
+            self.in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # Count the call until it really finishes, even if the caller is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of the pool's size, queue depth and counters."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "queued": max(0, self.in_flight - self.max_workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pools: dict[ExecutorKind, Pool] = {
+    "thread": Pool("thread", min(32, (os.cpu_count() or 1) + 4), DEFAULT_MAX_QUEUE),
+    "process": Pool("process", os.cpu_count() or 1, DEFAULT_MAX_QUEUE),
+}
+
+
+def configure_executors(
+    thread_workers: int | None = None,
+    process_workers: int | None = None,
+    max_queue: int | None = None,
+) -> None:
+    """Resize the pools. Must be called before the first offloaded call."""
+    if thread_workers is not None:
+        pools["thread"].max_workers = thread_workers
+    if process_workers is not None:
+        pools["process"].max_workers = process_workers
+    if max_queue is not None:
+        for pool in pools.values():
+            pool.max_queue = max_queue
+
+
+def shutdown_executors() -> None:
+    """Stop the pools without waiting for running calls."""
+    for pool in pools.values():
+        pool.shutdown()
+
+
+def executor_stats() -> dict[str, dict[str, int]]:
+    """Stats for every pool, keyed by pool kind."""
+    return {kind: pool.stats() for kind, pool in pools.items()}
+
+
+def offload(fn: Callable[..., Any], kind: ExecutorKind) -> Callable[..., Any]:
+    """Wrap a sync function so each call runs in the `kind` pool."""
+    from mcp.server.fastmcp import Context
+
+    if kind not in pools:
+        raise ValueError(f"Unknown executor: {kind}")
+    if inspect.iscoroutinefunction(fn):
+        raise TypeError(f"{fn.__name__} is async; only synchronous tools can be offloaded")
+    hints = [typing.get_origin(hint) or hint for hint in typing.get_type_hints(fn).values()]
+    if any(isinstance(hint, type) and issubclass(hint, Context) for hint in hints):
+        raise TypeError(f"{fn.__name__} takes a Context, which cannot be used from an executor")
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await pools[kind].run(fn, *args, **kwargs)
+
+    return wrapper
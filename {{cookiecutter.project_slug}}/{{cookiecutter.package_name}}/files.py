@@ -0,0 +1,194 @@
+"""Large files served as resources, one bounded chunk per read.
+
+The file is memory-mapped once and shared by every reader. A read copies only
+the requested range out of the map, so memory use depends on the chunk size,
+not on the file size or the number of clients. The OS page cache holds the
+file's pages, and it can evict them.
+
+A client picks the range with `range` in the read request's `_meta`:
+
+    {"uri": "data://datasets/sales", "_meta": {"range": {"offset": 0, "length": 1048576}}}
+
+Without a range, a read returns the first chunk. Each returned item reports
+the range it holds in its `_meta`. The item also gives the total size and the
+`nextOffset` to ask for, which is absent once the end of the file is reached:
+
+    {"_meta": {"etag": "...", "size": 734003200, "offset": 0, "length": 1048576,
+               "nextOffset": 1048576}}
+
+Text chunks start and end on UTF-8 character boundaries: an offset inside a
+character moves to the next one, and a chunk can be slightly shorter than the
+length asked for (or, to hold one whole character, slightly longer). Text that
+is not valid UTF-8 is an error; serve such files as binary. The ETag comes
+from the file's size and modification time, so checking it never reads the
+file.
+
+A served file may be appended to, or replaced by renaming a new file over it,
+and the next read maps the new contents. It must not be truncated or rewritten
+in place: a read racing with the truncation touches pages that no longer
+exist, and the process is killed with SIGBUS.
+"""
+
+import mimetypes
+import mmap
+import threading
+from pathlib import Path
+from typing import Any
+
+import anyio
+from mcp.server.fastmcp.resources import Resource
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl, Field, PrivateAttr
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+RANGE = "range"
+
+# Data formats the standard library does not know
+EXTENSION_TYPES = {
+    ".jsonl": "application/x-ndjson",
+    ".ndjson": "application/x-ndjson",
+    ".parquet": "application/vnd.apache.parquet",
+    ".yaml": "application/yaml",
+    ".yml": "application/yaml",
+    ".md": "text/markdown",
+}
+
+# Non-text/* MIME types that are still served as text
+TEXT_TYPES = {
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/yaml",
+}
+
+
+def guess_mime_type(path: Path) -> str:
+    """MIME type from the file extension, `application/octet-stream` if unknown.
+
+    Compressed files (e.g. `.csv.gz`) are binary, whatever the inner type.
+    """
+    mime_type, encoding = mimetypes.guess_type(path.name)
+    if encoding is None and path.suffix.lower() in EXTENSION_TYPES:
+        return EXTENSION_TYPES[path.suffix.lower()]
+    if mime_type is None or encoding is not None:
+        return "application/octet-stream"
+    return mime_type
+
+
+def is_text(mime_type: str) -> bool:
+    return mime_type.startswith("text/") or mime_type in TEXT_TYPES or mime_type.endswith(("+json", "+xml"))
+
+
+def requested_range(meta: Any) -> tuple[int, int | None]:
+    """The `(offset, length)` asked for in a request's `_meta`, if any."""
+    byte_range = getattr(meta, RANGE, None) if meta is not None else None
+    if not isinstance(byte_range, dict):
+        return 0, None
+    offset, length = byte_range.get("offset", 0), byte_range.get("length")
+    valid_length = length is None or (isinstance(length, int) and length > 0)
+    if not isinstance(offset, int) or offset < 0 or not valid_length:
+        raise ValueError("range needs a non-negative integer offset and a positive integer length")
+    return offset, length
+
+
+class MappedFileResource(Resource):
+    """A file served from a shared memory map, `chunk_size` bytes at most per read."""
+
+    path: Path = Field(description="Path to the file")
+    chunk_size: int = Field(default=DEFAULT_CHUNK_SIZE, gt=0, description="Largest range per read")
+    binary: bool = Field(default=False, description="Serve base64 blobs instead of UTF-8 text")
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _map: mmap.mmap | None = PrivateAttr(default=None)
+    _version: tuple[int, int, int] | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_path(
+        cls, uri: str, path: str | Path, mime_type: str | None = None, **kwargs: Any
+    ) -> "MappedFileResource":
+        """Build the resource, guessing the MIME type and text/binary from the extension.
+
+        The file must only be appended to or replaced, never truncated in place.
+        """
+        path = Path(path).resolve()
+        if not path.is_file():
+            raise FileNotFoundError(f"No such file: {path}")
+        mime_type = mime_type or guess_mime_type(path)
+        binary = not is_text(mime_type)
+        return cls(uri=AnyUrl(uri), path=path, mime_type=mime_type, binary=binary, **kwargs)
+
+    def _mapped(self) -> tuple[mmap.mmap | None, int]:
+        """The current map and file size, remapping if the file has changed.
+
+        A replaced map is not closed: readers still slicing it keep it alive,
+        and it is released with its last reference.
+        """
+        stat = self.path.stat()
+        version = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if version != self._version:
+                self._map = None
+                if stat.st_size:
+                    with open(self.path, "rb") as f:
+                        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        self._map.madvise(mmap.MADV_SEQUENTIAL)
+                self._version = version
+            return self._map, stat.st_size
+
+    def etag(self) -> str:
+        """Version of the file, from its size and modification time."""
+        stat = self.path.stat()
+        return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+    def read_range(self, offset: int = 0, length: int | None = None) -> ReadResourceContents:
+        """Copy at most `chunk_size` bytes starting at `offset` out of the map.
+
+        This can touch the disk, so callers on the event loop should run it in a thread.
+
+        Raises:
+            ValueError: `offset` past the end of the file, or text that is not UTF-8
+        """
+        mapped, size = self._mapped()
+        if offset > size:
+            raise ValueError(f"offset {offset} is past the end of the file ({size} bytes)")
+        end = min(size, offset + min(length or self.chunk_size, self.chunk_size))
+        if not self.binary and mapped is not None:
+            offset = _next_boundary(mapped, offset, size)
+            end = _previous_boundary(mapped, end, size)
+            if end <= offset < size:
+                # Less than one character asked for: return that character
+                end = _next_boundary(mapped, offset + 1, size)
+        data = mapped[offset:end] if mapped is not None else b""
+        meta: dict[str, Any] = {"size": size, "offset": offset, "length": len(data)}
+        if end < size:
+            meta["nextOffset"] = end
+        content: str | bytes = data if self.binary else data.decode("utf-8")
+        return ReadResourceContents(content=content, mime_type=self.mime_type, meta=meta)
+
+    async def read(self) -> str | bytes:
+        """The first chunk, for callers that go through `FastMCP.read_resource`."""
+        return (await anyio.to_thread.run_sync(self.read_range)).content
+
+
+def _continues(byte: int) -> bool:
+    """Whether `byte` is a UTF-8 continuation byte, inside a character."""
+    return byte & 0xC0 == 0x80
+
+
+def _next_boundary(buffer: mmap.mmap, index: int, size: int) -> int:
+    """The first UTF-8 character boundary at or after `index`."""
+    stop = min(size, index + 3)
+    while index < stop and _continues(buffer[index]):
+        index += 1
+    return index
+
+
+def _previous_boundary(buffer: mmap.mmap, index: int, size: int) -> int:
+    """The last UTF-8 character boundary at or before `index`."""
+    stop = max(0, index - 3)
+    while stop < index < size and _continues(buffer[index]):
+        index -= 1
+    return index
@@ -0,0 +1,192 @@
+"""A shared, pooled HTTP client for tools that call other services.
+
+A tool that opens its own client per call pays TCP (and TLS) setup every time
+and, under load, runs the host out of ephemeral ports. `Server.http` is one
+`HTTPPool` per server: an `httpx.AsyncClient` kept open while the server runs,
+whose connections are kept alive and reused across calls and sessions. On top
+of httpx it adds:
+
+- a limit on concurrent requests per host (`max_per_host`), so one slow
+  service cannot hold every connection of the pool;
+- retries with exponential backoff for failed connections, and for 502, 503
+  and 504 responses to idempotent requests;
+- counters and connection gauges for `/metrics` (`stats`).
+
+Tools reach it through their context:
+
+    @mcp.tool()
+    async def lookup(sku: str, ctx: Context) -> dict:
+        response = await ctx.fastmcp.http.get(f"https://inventory.internal/items/{sku}")
+        response.raise_for_status()
+        return response.json()
+
+The client is created on first use, with the settings of `configure_http`,
+and closed when the server shuts down.
+"""
+
+import asyncio
+import functools
+import ssl
+from typing import Any
+
+import httpx
+
+settings: dict[str, Any] = {
+    "max_connections": 100,
+    "max_per_host": 20,
+    "keepalive_expiry": 30.0,
+    "timeout": 10.0,
+    "retries": 2,
+    "backoff": 0.1,
+}
+
+# Responses worth retrying: the service (or a proxy in front of it) is briefly unavailable
+RETRY_STATUSES = frozenset({502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def configure_http(
+    max_connections: int | None = None,
+    max_per_host: int | None = None,
+    timeout: float | None = None,
+    retries: int | None = None,
+) -> None:
+    """Set the limits of pools whose client is created from now on.
+
+    Args:
+        max_connections: Connections open at once, across all hosts
+        max_per_host: Requests in flight at once to one host
+        timeout: Seconds to connect, and between bytes read or written
+        retries: Further attempts after a failed connection or a 502/503/504
+    """
+    for key, value in (
+        ("max_connections", max_connections),
+        ("max_per_host", max_per_host),
+        ("timeout", timeout),
+        ("retries", retries),
+    ):
+        if value is not None:
+            settings[key] = value
+
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """The default TLS context, shared by every pool: loading the CA bundle
+    takes tens of milliseconds, which each new client would pay again."""
+    return httpx.create_ssl_context()
+
+
+class HTTPPool:
+    """An `httpx.AsyncClient` with per-host limits, retries and usage counters.
+
+    Keyword arguments override `settings` for this pool. Accessed only from
+    the event loop thread, so it takes no locks.
+    """
+
+    def __init__(self, **overrides: Any) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self._overrides = overrides
+        self._options: dict[str, Any] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._transport: httpx.AsyncHTTPTransport | None = None
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self._waiting: dict[str, int] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying client, created on first use."""
+        if self._client is None:
+            options = self._options = {**settings, **self._overrides}
+            limits = httpx.Limits(
+                max_connections=options["max_connections"],
+                max_keepalive_connections=options["max_connections"],
+                keepalive_expiry=options["keepalive_expiry"],
+            )
+            self._transport = httpx.AsyncHTTPTransport(verify=_ssl_context(), limits=limits)
+            self._client = httpx.AsyncClient(transport=self._transport, timeout=options["timeout"])
+        return self._client
+
+    async def request(self, method: str, url: str | httpx.URL, **kwargs: Any) -> httpx.Response:
+        """Send a request and read its response, retrying as described above.
+
+        Keyword arguments are those of `httpx.AsyncClient.request`.
+        """
+        client = self.client
+        request = client.build_request(method, url, **kwargs)
+        host = request.url.netloc.decode()
+        limit = self._hosts.get(host)
+        if limit is None:
+            limit = self._hosts[host] = asyncio.Semaphore(self._options["max_per_host"])
+
+        self._waiting[host] = self._waiting.get(host, 0) + 1
+        try:
+            await limit.acquire()
+        finally:
+            self._waiting[host] -= 1
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        self.requests += 1
+        try:
+            return await self._send(client, request)
+        finally:
+            self._in_flight[host] -= 1
+            limit.release()
+
+    async def _send(self, client: httpx.AsyncClient, request: httpx.Request) -> httpx.Response:
+        retries = self._options["retries"]
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = await client.send(request)
+            except httpx.TransportError as error:
+                # Only a request that never connected is known not to have reached the service
+                unsent = isinstance(error, httpx.ConnectError | httpx.ConnectTimeout)
+                if attempt == retries or not (idempotent or unsent):
+                    self.errors += 1
+                    raise
+            else:
+                if attempt == retries or not (idempotent and response.status_code in RETRY_STATUSES):
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self._options["backoff"] * 2**attempt)
+            attempt += 1
+            self.retries += 1
+
+    async def get(self, url: str | httpx.URL, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str | httpx.URL, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str | httpx.URL, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str | httpx.URL, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close every connection. The next request opens a new client."""
+        if self._client is not None:
+            client, self._client, self._transport = self._client, None, None
+            self._hosts.clear()
+            await client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters, open and idle connections, and requests in flight or waiting per host."""
+        # httpx does not expose its connection pool; httpcore's pool lists its connections
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "max_connections": self._options.get("max_connections", settings["max_connections"]),
+            "in_flight": {host: count for host, count in self._in_flight.items() if count},
+            "waiting": {host: count for host, count in self._waiting.items() if count},
+        }
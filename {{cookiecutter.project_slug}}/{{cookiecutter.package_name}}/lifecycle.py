@@ -0,0 +1,205 @@
+"""Graceful shutdown for streamable-http: readiness probes and connection draining.
+
+On SIGTERM a serving process:
+
+1. answers `/readyz` with 503 but keeps serving everything for `drain_delay`
+   seconds, so the load balancer can take it out of rotation;
+2. stops accepting new sessions and new standalone SSE streams (503 with
+   `Retry-After`), while requests of existing sessions are still served;
+3. waits until no MCP request is in flight, at most until `drain_timeout`
+   seconds after the signal;
+4. refuses all MCP requests and hands the signal back to uvicorn, which
+   closes the remaining connections (idle SSE streams included) and exits.
+
+`/healthz` answers 200 for as long as the process serves requests. A second
+SIGTERM skips the rest of the drain. SIGINT (Ctrl+C) still stops the server
+at once.
+"""
+
+import asyncio
+import signal
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from loguru import logger
+from mcp.types import ErrorData, JSONRPCError
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+DEFAULT_DRAIN_TIMEOUT = 30.0
+DEFAULT_DRAIN_DELAY = 0.0
+
+HEALTH_PATH = "/healthz"
+READY_PATH = "/readyz"
+
+# Implementation-defined JSON-RPC server error (-32000 to -32099)
+SHUTTING_DOWN = -32030
+
+settings: dict[str, float] = {"drain_timeout": DEFAULT_DRAIN_TIMEOUT, "drain_delay": DEFAULT_DRAIN_DELAY}
+
+
+def configure_lifecycle(drain_timeout: float | None = None, drain_delay: float | None = None) -> None:
+    """Set the drain deadline and the not-ready period before it (seconds)."""
+    if drain_timeout is not None:
+        settings["drain_timeout"] = drain_timeout
+    if drain_delay is not None:
+        settings["drain_delay"] = drain_delay
+
+
+class Lifecycle:
+    """Readiness and in-flight requests of one serving process."""
+
+    def __init__(self, drain_timeout: float | None = None, drain_delay: float | None = None) -> None:
+        self.drain_timeout = settings["drain_timeout"] if drain_timeout is None else drain_timeout
+        self.drain_delay = settings["drain_delay"] if drain_delay is None else drain_delay
+        self.ready = False
+        self.draining = False
+        self.accepting = True
+        self.closed = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._previous_handler: Any = None
+        self._drain_task: asyncio.Task[None] | None = None
+
+    def enter(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def leave(self) -> None:
+        self.in_flight -= 1
+        if not self.in_flight:
+            self._idle.set()
+
+    @asynccontextmanager
+    async def serving(self) -> AsyncIterator["Lifecycle"]:
+        """Be ready while inside; SIGTERM starts a drain instead of stopping the server.
+
+        Signal handlers can only be set from the main thread; elsewhere (e.g.
+        in tests) only readiness is tracked.
+        """
+        loop = asyncio.get_running_loop()
+        handle = threading.current_thread() is threading.main_thread()
+        if handle:
+            self._previous_handler = signal.getsignal(signal.SIGTERM)
+            signal.signal(signal.SIGTERM, lambda *_: loop.call_soon_threadsafe(self._on_sigterm))
+        self.ready = True
+        try:
+            yield self
+        finally:
+            self.ready = False
+            if self._drain_task is not None:
+                self._drain_task.cancel()
+            if handle and self._previous_handler is not None:
+                signal.signal(signal.SIGTERM, self._previous_handler)
+
+    def _on_sigterm(self) -> None:
+        if self.draining:
+            logger.warning("Second SIGTERM, exiting without waiting for {} requests", self.in_flight)
+            self._exit()
+        else:
+            self._drain_task = asyncio.create_task(self._drain_then_exit())
+
+    async def drain(self) -> int:
+        """Stop being ready, then stop accepting sessions and wait for in-flight requests.
+
+        Returns the number of requests still in flight at the deadline.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        self.draining = True
+        self.ready = False
+        logger.info("Draining: not ready, waiting {}s before refusing new sessions", self.drain_delay)
+        await asyncio.sleep(min(self.drain_delay, self.drain_timeout))
+        self.accepting = False
+        logger.info("Draining: waiting for {} requests in flight", self.in_flight)
+        try:
+            await asyncio.wait_for(self._idle.wait(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            logger.warning("Drain timeout reached with {} requests in flight", self.in_flight)
+        # Anything accepted from here on would be cut off by the shutdown
+        self.closed = True
+        return self.in_flight
+
+    async def _drain_then_exit(self) -> None:
+        await self.drain()
+        self._exit()
+
+    def _exit(self) -> None:
+        """Give SIGTERM back to the handler it replaced (uvicorn's) and raise it."""
+        previous = self._previous_handler
+        self._previous_handler = None
+        signal.signal(signal.SIGTERM, previous if previous is not None else signal.SIG_DFL)
+        signal.raise_signal(signal.SIGTERM)
+
+
+def _unavailable(message: str) -> Response:
+    body = JSONRPCError(jsonrpc="2.0", id="server-error", error=ErrorData(code=SHUTTING_DOWN, message=message))
+    return Response(
+        body.model_dump_json(by_alias=True, exclude_none=True),
+        status_code=503,
+        headers={"Retry-After": "1", "Connection": "close"},
+        media_type="application/json",
+    )
+
+
+class DrainMiddleware:
+    """ASGI middleware serving the probes and tracking requests to `path`.
+
+    POSTs and DELETEs to `path` count as in flight until their response (SSE
+    included) is complete. Once the lifecycle stops accepting, requests that
+    would open a new session or a standalone GET stream get a 503, and once it
+    is closed, all requests do.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        lifecycle: Lifecycle,
+        path: str = "/mcp",
+        rejected: dict[str, int] | None = None,
+    ) -> None:
+        self.app = app
+        self.lifecycle = lifecycle
+        self.path = path.rstrip("/")
+        # Rejection counters by reason, shared with the metrics registry
+        self.rejected = rejected if rejected is not None else {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].rstrip("/")
+        if path == HEALTH_PATH:
+            await PlainTextResponse("ok")(scope, receive, send)
+            return
+        if path == READY_PATH:
+            ready = self.lifecycle.ready
+            await PlainTextResponse("ok" if ready else "not ready", 200 if ready else 503)(scope, receive, send)
+            return
+        if path != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        lifecycle = self.lifecycle
+        if lifecycle.closed or (
+            not lifecycle.accepting and (scope["method"] == "GET" or not self._has_session(scope))
+        ):
+            self.rejected["draining"] = self.rejected.get("draining", 0) + 1
+            await _unavailable("Server is shutting down")(scope, receive, send)
+            return
+        if scope["method"] == "GET":
+            # A standalone stream stays open for the whole session; it is not work in flight
+            await self.app(scope, receive, send)
+            return
+
+        self.lifecycle.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.leave()
+
+    @staticmethod
+    def _has_session(scope: Scope) -> bool:
+        return any(name == b"mcp-session-id" for name, _ in scope["headers"])
@@ -0,0 +1,196 @@
+"""`tools/list`, `prompts/list` and `resources/list` answered from a cache.
+
+Every session lists the server's tools, prompts and resources when it starts,
+and FastMCP rebuilds each description from the registered functions and
+dumps it to JSON data every time. A `Listing` does this once, splits the
+result into pages and hands the same dumped pages to every session, until the
+registry changes.
+
+Changes are seen through `Registry`, which replaces the dicts that FastMCP's
+tool, prompt and resource managers keep their entries in: any addition or
+removal, whether through the decorators, `add_tool`, `remove_tool` or a plugin
+being imported, invalidates the listing. Sessions that listed before the
+change are then sent `notifications/tools/list_changed` (or the prompt or
+resource equivalent), once for changes made together.
+
+With a page size set, results carry a `nextCursor` for the next page. A cursor
+is only valid for the version of the list it came from: after a change, the
+client gets an invalid params error and lists again from the start.
+"""
+
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Sequence
+
+import anyio
+from loguru import logger
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    INVALID_PARAMS,
+    ErrorData,
+    ListPromptsResult,
+    ListResourcesResult,
+    ListResourceTemplatesResult,
+    ListToolsResult,
+    ServerResult,
+)
+from pydantic import BaseModel, PrivateAttr
+
+DEFAULT_PAGE_SIZE = 0
+
+settings = {"page_size": DEFAULT_PAGE_SIZE}
+
+# The results of the list methods, paged by `Listing`
+ListResult = ListToolsResult | ListPromptsResult | ListResourcesResult | ListResourceTemplatesResult
+
+# How sessions dump results (see `BaseSession._send_response`)
+DUMP_OPTIONS: dict[str, Any] = {"by_alias": True, "mode": "json", "exclude_none": True}
+
+
+def configure_listings(page_size: int | None = None) -> None:
+    """Set the number of items per page of list results (0 = all in one page)."""
+    if page_size is not None:
+        settings["page_size"] = page_size
+
+
+class Registry(dict):  # type: ignore[type-arg]
+    """A dict that calls `on_change` whenever an entry is set or removed."""
+
+    def __init__(self, entries: dict[Any, Any], on_change: Callable[[], None]) -> None:
+        super().__init__(entries)
+        self.on_change = on_change
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.on_change()
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self.on_change()
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self.on_change()
+        return value
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        self.on_change()
+        return item
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self.on_change()
+        return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.on_change()
+
+    def clear(self) -> None:
+        super().clear()
+        self.on_change()
+
+
+class DumpedResult(ServerResult):
+    """A result dumped once, when built, and sent as is to every session."""
+
+    _dump: dict[str, Any] = PrivateAttr()
+
+    def __init__(self, result: ListResult) -> None:
+        super().__init__(result)
+        self._dump = result.model_dump(**DUMP_OPTIONS)
+
+    def model_dump(self, **kwargs: Any) -> Any:
+        if kwargs == DUMP_OPTIONS:
+            return self._dump
+        return super().model_dump(**kwargs)
+
+
+class Listing:
+    """The pages of one list method, built on first request after each change.
+
+    Args:
+        result_type: The result model, e.g. `ListToolsResult`
+        field: Its field holding the items, e.g. "tools"
+        build: Returns the current items
+        notify: Sends the list-changed notification to one session
+    """
+
+    def __init__(
+        self,
+        result_type: type[ListResult],
+        field: str,
+        build: Callable[[], Awaitable[Sequence[BaseModel]]],
+        notify: Callable[[Any], Awaitable[None]],
+    ) -> None:
+        self.result_type = result_type
+        self.field = field
+        self.build = build
+        self.notify = notify
+        self.version = 0
+        self.builds = 0
+        self._pages: list[DumpedResult] | None = None
+        # Sessions that listed, and so are told about changes
+        self._sessions: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._notifying: asyncio.Task[None] | None = None
+
+    async def page(self, cursor: str | None, session: Any = None) -> DumpedResult:
+        """The page `cursor` points to, or the first page."""
+        if session is not None:
+            self._sessions.add(session)
+        pages = self._pages
+        if pages is None:
+            pages = await self._build_pages()
+        if cursor is None:
+            return pages[0]
+        version, _, index = cursor.partition(":")
+        if version != str(self.version) or not index.isdigit() or not 0 < int(index) < len(pages):
+            message = "Invalid or expired cursor: list again from the start"
+            raise McpError(ErrorData(code=INVALID_PARAMS, message=message))
+        return pages[int(index)]
+
+    async def _build_pages(self) -> list[DumpedResult]:
+        version = self.version
+        items = list(await self.build())
+        size = settings["page_size"] or max(len(items), 1)
+        chunks = [items[start:start + size] for start in range(0, len(items), size)] or [[]]
+        pages = [
+            DumpedResult(
+                self.result_type.model_validate(
+                    {
+                        self.field: chunk,
+                        "nextCursor": f"{version}:{number + 1}" if number + 1 < len(chunks) else None,
+                    }
+                )
+            )
+            for number, chunk in enumerate(chunks)
+        ]
+        self.builds += 1
+        if version == self.version:
+            # Not kept if the registry changed while they were built
+            self._pages = pages
+        return pages
+
+    def invalidate(self) -> None:
+        """Drop the pages and tell the sessions that listed, once the current changes are done."""
+        self.version += 1
+        self._pages = None
+        if not self._sessions or self._notifying is not None:
+            return
+        try:
+            self._notifying = asyncio.get_running_loop().create_task(self._notify())
+        except RuntimeError:
+            pass  # No event loop, so no session either
+
+    async def _notify(self) -> None:
+        try:
+            await asyncio.sleep(0)  # Let changes made together send one notification
+        finally:
+            self._notifying = None
+        for session in list(self._sessions):
+            try:
+                await self.notify(session)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                logger.debug("Dropping closed session from the {} listeners", self.field)
+                self._sessions.discard(session)
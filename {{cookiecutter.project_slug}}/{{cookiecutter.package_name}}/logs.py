@@ -0,0 +1,194 @@
+"""Logging configuration for {{ cookiecutter.project_name }}.
+
+By default records are handed to a background thread that does the writes,
+and in JSON mode the encoding as well, so the event loop only pays for
+building the record. Use loguru's lazy formatting (`logger.info("x={}", x)`
+rather than f-strings) so messages below the configured level are never
+built at all.
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+import traceback
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, TextIO
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+# Records waiting for the writer thread; beyond this they are dropped rather
+# than blocking the caller.
+QUEUE_SIZE = 10_000
+
+INFO_LEVEL_NO = 20
+
+_STOP = object()
+
+# The queue sink of the current configuration, if any, for `log_stats`
+_sink: "QueueSink | None" = None
+
+
+class LogFormat(str, Enum):
+    text = "text"
+    json = "json"
+
+
+def json_line(record: dict[str, Any]) -> str:
+    """Encode a loguru record as one compact JSON line."""
+    entry: dict[str, Any] = {
+        "ts": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "fn": record["function"],
+        "line": record["line"],
+        "msg": record["message"],
+    }
+    if record["extra"]:
+        entry.update(record["extra"])
+    exception = record["exception"]
+    if exception is not None:
+        entry["exc"] = "".join(
+            traceback.format_exception(exception.type, exception.value, exception.traceback)
+        )
+    return json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+
+
+class QueueSink:
+    """Loguru sink that hands messages to a background writer thread.
+
+    The writer drains everything that is queued and emits it with a single
+    write and flush, so bursts of records cost one syscall instead of many.
+    """
+
+    def __init__(self, stream: TextIO, encode: Callable[[Any], str] | None = None) -> None:
+        self.stream = stream
+        self.encode = encode
+        self.dropped = 0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        item = message.record if self.encode is not None else str(message)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """Flush what is queued and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [item for item in batch if item is not _STOP]
+            if self.encode is not None:
+                batch = [self.encode(record) for record in batch]
+            try:
+                self.stream.write("".join(batch))
+                self.stream.flush()
+            except Exception:  # pragma: no cover - nowhere left to report it
+                pass
+
+
+class RateLimitFilter:
+    """Token-bucket limit on INFO-and-below records per emitting function.
+
+    Tools log from their own function, so this caps the log volume of each
+    tool independently. WARNING and above always pass. The number of records
+    dropped since the last one emitted is attached as `suppressed`.
+    """
+
+    def __init__(self, per_second: float) -> None:
+        self.per_second = per_second
+        self.burst = max(1.0, per_second)
+        self._buckets: dict[tuple[str | None, str], list[float]] = {}
+
+    def __call__(self, record: "Record") -> bool:
+        if record["level"].no > INFO_LEVEL_NO:
+            return True
+        key = (record["name"], record["function"])
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # [tokens, last refill, suppressed]
+            bucket = self._buckets[key] = [self.burst, now, 0]
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+        bucket[1] = now
+        if bucket[0] < 1:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1
+        if bucket[2]:
+            record["extra"]["suppressed"] = int(bucket[2])
+            bucket[2] = 0
+        return True
+
+
+def configure_logging(
+    log_level: str = "INFO",
+    log_format: str = LogFormat.text,
+    log_queue: bool = True,
+    log_rate_limit: float = 0,
+    stream: TextIO | None = None,
+) -> None:
+    """Configure loguru for this process.
+
+    Args:
+        log_level: Minimum level to emit
+        log_format: `text` for colorized lines, `json` for compact JSON lines
+        log_queue: Write from a background thread instead of the caller
+        log_rate_limit: Max INFO records per second per function (0 = unlimited)
+        stream: Destination, defaults to stderr
+    """
+    global _sink
+    stream = stream or sys.stderr
+    as_json = log_format == LogFormat.json
+    rate_filter = RateLimitFilter(log_rate_limit) if log_rate_limit > 0 else None
+
+    def write_json(message: Any) -> None:
+        stream.write(json_line(message.record))
+
+    sink: Any = stream
+    _sink = None
+    if log_queue:
+        sink = _sink = QueueSink(stream, encode=json_line if as_json else None)
+    elif as_json:
+        sink = write_json
+
+    logger.remove()
+    logger.add(
+        sink,
+        level=log_level.upper(),
+        # JSON lines are encoded from the record, so skip loguru's own formatting
+        format="{message}" if as_json else TEXT_FORMAT,
+        colorize=False if as_json else stream.isatty(),
+        filter=rate_filter,
+    )
+
+
+def log_stats() -> dict[str, int]:
+    """Records dropped because the writer thread's queue was full."""
+    return {"dropped": _sink.dropped if _sink is not None else 0}
@@ -0,0 +1,35 @@
+"""The in-memory transport: a client session connected to a server in this process.
+
+Messages pass between client and server over memory streams as objects,
+without a subprocess, a socket or JSON encoding. Tests using it start
+instantly, and benchmarks using it measure dispatch without transport cost:
+
+    async with connect() as session:
+        result = await session.call_tool("echo", {"message": "hi"})
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from mcp import ClientSession
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+
+@asynccontextmanager
+async def connect(server: FastMCP | None = None, **kwargs: Any) -> AsyncIterator[ClientSession]:
+    """Yield an initialized session to `server` (default: `create_server()`).
+
+    Args:
+        server: The server to connect to
+        **kwargs: Passed to the SDK's `create_connected_server_and_client_session`,
+            e.g. `raise_exceptions=True` to fail on server errors, or client
+            callbacks such as `logging_callback`
+    """
+    if server is None:
+        # Imported here so that connecting to another server does not build this one
+        from .server import create_server
+
+        server = create_server()
+    async with create_connected_server_and_client_session(server._mcp_server, **kwargs) as session:
+        yield session
@@ -0,0 +1,216 @@
+"""Call counters and latency histograms, rendered in the Prometheus text format.
+
+Every tool call, prompt render and resource read is counted per name, together
+with its errors, the number currently running and a latency histogram. All
+recording happens on the event loop thread, so the counters are plain integers
+and floats without locks; a scrape only reads them.
+"""
+
+import bisect
+import time
+from typing import Any, Awaitable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label used for calls to names that are not registered, so clients cannot
+# create unbounded label sets.
+UNKNOWN = "<unknown>"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class CallStats:
+    """Counters and latency histogram for one tool, prompt or resource."""
+
+    __slots__ = ("calls", "errors", "in_flight", "bucket_counts", "total_seconds", "_bounds")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        # One count per bucket plus one for +Inf; not cumulative
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.total_seconds = 0.0
+        self._bounds = bounds
+
+    def observe(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.bucket_counts[bisect.bisect_left(self._bounds, seconds)] += 1
+
+
+class Metrics:
+    """Registry of `CallStats` keyed by (kind, name), plus session and rejection counts."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.calls: dict[tuple[str, str], CallStats] = {}
+        self.active_sessions = 0
+        # Requests refused by admission control, by reason
+        self.rejected: dict[str, int] = {}
+
+    def stats_for(self, kind: str, name: str) -> CallStats:
+        stats = self.calls.get((kind, name))
+        if stats is None:
+            stats = self.calls[(kind, name)] = CallStats(self.buckets)
+        return stats
+
+    async def track(self, kind: str, name: str, call: Awaitable[T]) -> T:
+        """Await `call`, recording its latency and whether it raised."""
+        stats = self.stats_for(kind, name)
+        stats.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await call
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.observe(time.perf_counter() - start)
+
+
+def _labels(**labels: Any) -> str:
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render(
+    metrics: Metrics,
+    executors: dict[str, dict[str, int]] | None = None,
+    caches: dict[str, dict[str, Any]] | None = None,
+    http: dict[str, Any] | None = None,
+    logs: dict[str, int] | None = None,
+) -> str:
+    """Render the registry (and optional pool, cache, HTTP client and log stats) as exposition text."""
+    lines: list[str] = []
+    calls = sorted(metrics.calls.items())
+
+    _family(lines, "mcp_calls_total", "counter", "Tool calls, prompt renders and resource reads.")
+    for (kind, name), stats in calls:
+        lines.append(f"mcp_calls_total{_labels(kind=kind, name=name)} {stats.calls}")
+
+    _family(lines, "mcp_errors_total", "counter", "Calls that raised an error.")
+    for (kind, name), stats in calls:
+        lines.append(f"mcp_errors_total{_labels(kind=kind, name=name)} {stats.errors}")
+
+    _family(lines, "mcp_in_flight", "gauge", "Calls currently running.")
+    for (kind, name), stats in calls:
+        lines.append(f"mcp_in_flight{_labels(kind=kind, name=name)} {stats.in_flight}")
+
+    _family(lines, "mcp_call_duration_seconds", "histogram", "Call latency in seconds.")
+    for (kind, name), stats in calls:
+        cumulative = 0
+        bounds = [*(repr(bound) for bound in metrics.buckets), "+Inf"]
+        for bound, count in zip(bounds, stats.bucket_counts):
+            cumulative += count
+            labels = _labels(kind=kind, name=name, le=bound)
+            lines.append(f"mcp_call_duration_seconds_bucket{labels} {cumulative}")
+        labels = _labels(kind=kind, name=name)
+        lines.append(f"mcp_call_duration_seconds_sum{labels} {stats.total_seconds!r}")
+        lines.append(f"mcp_call_duration_seconds_count{labels} {stats.calls}")
+
+    _family(lines, "mcp_active_sessions", "gauge", "Open MCP sessions (requests in flight when stateless).")
+    lines.append(f"mcp_active_sessions {metrics.active_sessions}")
+
+    _family(lines, "mcp_rejected_total", "counter", "Requests refused by admission control.")
+    for reason, count in sorted(metrics.rejected.items()):
+        lines.append(f"mcp_rejected_total{_labels(reason=reason)} {count}")
+
+    if executors:
+        for key, kind, help_text in (
+            ("workers", "gauge", "Worker threads or processes per pool."),
+            ("in_flight", "gauge", "Calls running or queued in the pool."),
+            ("queued", "gauge", "Calls waiting for a free worker."),
+            ("completed", "counter", "Calls finished by the pool."),
+            ("rejected", "counter", "Calls refused because the pool was full."),
+        ):
+            name = f"mcp_executor_{key}_total" if kind == "counter" else f"mcp_executor_{key}"
+            _family(lines, name, kind, help_text)
+            for pool, pool_stats in sorted(executors.items()):
+                lines.append(f"{name}{_labels(pool=pool)} {pool_stats[key]}")
+
+    if caches:
+        for key, kind, help_text in (
+            ("hits", "counter", "Results served from the cache."),
+            ("misses", "counter", "Lookups that found no valid entry."),
+            ("evictions", "counter", "Entries dropped to stay within maxsize."),
+            ("size", "gauge", "Entries currently cached."),
+        ):
+            name = f"mcp_cache_{key}_total" if kind == "counter" else f"mcp_cache_{key}"
+            _family(lines, name, kind, help_text)
+            for cache, cache_stats in sorted(caches.items()):
+                lines.append(f"{name}{_labels(cache=cache)} {cache_stats[key]}")
+
+    if http:
+        for key, help_text in (
+            ("requests", "Outbound HTTP requests sent by tools."),
+            ("retries", "Outbound HTTP attempts repeated after a failure."),
+            ("errors", "Outbound HTTP requests that failed after their retries."),
+        ):
+            _family(lines, f"mcp_http_{key}_total", "counter", help_text)
+            lines.append(f"mcp_http_{key}_total {http[key]}")
+        _family(lines, "mcp_http_connections", "gauge", "Open outbound HTTP connections.")
+        active = http["connections"] - http["idle_connections"]
+        lines.append(f"mcp_http_connections{_labels(state='active')} {active}")
+        lines.append(f"mcp_http_connections{_labels(state='idle')} {http['idle_connections']}")
+        _family(lines, "mcp_http_max_connections", "gauge", "Outbound HTTP connections allowed at once.")
+        lines.append(f"mcp_http_max_connections {http['max_connections']}")
+        for key, help_text in (
+            ("in_flight", "Outbound HTTP requests in flight, per host."),
+            ("waiting", "Outbound HTTP requests waiting for the per-host limit."),
+        ):
+            _family(lines, f"mcp_http_{key}", "gauge", help_text)
+            for host, count in sorted(http[key].items()):
+                lines.append(f"mcp_http_{key}{_labels(host=host)} {count}")
+
+    if logs:
+        _family(lines, "mcp_log_dropped_total", "counter", "Log records dropped because the log queue was full.")
+        lines.append(f"mcp_log_dropped_total {logs['dropped']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def merge(expositions: Iterable[str], label: str = "worker") -> str:
+    """Combine the output of several processes, tagging each with `label`.
+
+    Samples are regrouped under a single HELP/TYPE header per family, as the
+    text format requires.
+    """
+    headers: dict[str, list[str]] = {}
+    samples: dict[str, list[str]] = {}
+    for index, text in enumerate(expositions):
+        tag = f'{label}="{index}"'
+        family = ""
+        for line in text.splitlines():
+            if line.startswith("# "):
+                family = line.split(" ", 3)[2]
+                headers.setdefault(family, [])
+                if len(headers[family]) < 2:
+                    headers[family].append(line)
+                samples.setdefault(family, [])
+            elif line:
+                series, value = line.rsplit(" ", 1)
+                if "{" in series:
+                    series = series.replace("{", "{" + tag + ",", 1)
+                else:
+                    series = series + "{" + tag + "}"
+                samples.setdefault(family, []).append(f"{series} {value}")
+
+    lines: list[str] = []
+    for family, family_samples in samples.items():
+        lines.extend(headers.get(family, []))
+        lines.extend(family_samples)
+    return "\n".join(lines) + "\n"
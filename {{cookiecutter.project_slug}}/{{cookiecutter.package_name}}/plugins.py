@@ -0,0 +1,131 @@
+"""Tools from other packages, found through entry points and imported on first call.
+
+A plugin package declares an entry point in the `{{ cookiecutter.package_name }}.tools`
+group, naming a function that registers its tools on the server:
+
+    # pyproject.toml of the plugin package
+    [project.entry-points."{{ cookiecutter.package_name }}.tools"]
+    inventory = "acme_inventory.tools:register"
+
+    # acme_inventory/tools.py
+    import pandas as pd
+
+    def register(mcp):
+        @mcp.tool(cache=True)
+        def stock_level(sku: str) -> int:
+            ...
+
+The first time a server sees a plugin (at a given version), it imports it,
+registers its tools and records their descriptions (name, description, input
+and output schemas, annotations) in a manifest file. Later starts list those
+tools from the manifest without importing the plugin: it is imported, and
+its `register` run, when one of its tools is first called. Startup time and
+memory therefore do not grow with the number of installed tools, only with
+the number a session actually uses.
+
+The manifest is rebuilt for plugins whose version changed. During
+development, delete it (or pass another path) after changing a plugin's tools
+without changing its version.
+"""
+
+import json
+import os
+from importlib.metadata import EntryPoint, entry_points
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .core import Server
+
+PLUGIN_GROUP = "{{ cookiecutter.package_name }}.tools"
+
+settings: dict[str, Any] = {"enabled": True, "manifest": None}
+
+
+def configure_plugins(enabled: bool | None = None, manifest: str | None = None) -> None:
+    """Enable or disable plugins, and set where their manifest is kept.
+
+    Args:
+        enabled: Load the tools of installed plugins
+        manifest: Path of the manifest file (default: `default_manifest_path()`)
+    """
+    if enabled is not None:
+        settings["enabled"] = enabled
+    if manifest is not None:
+        settings["manifest"] = manifest
+
+
+def default_manifest_path() -> Path:
+    """`plugins.json` in this package's directory of the user cache."""
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "{{ cookiecutter.package_name }}" / "plugins.json"
+
+
+class Plugin:
+    """One entry point of the plugin group."""
+
+    def __init__(self, entry_point: EntryPoint) -> None:
+        self.entry_point = entry_point
+        dist = entry_point.dist
+        release = f"{dist.name}=={dist.version} " if dist is not None else ""
+        # What the manifest entry is valid for: a new release may have other tools
+        self.key = f"{release}{entry_point.name}={entry_point.value}"
+
+    def load(self) -> Callable[["Server"], None]:
+        """Import the plugin and return its registration function."""
+        register: Callable[["Server"], None] = self.entry_point.load()
+        return register
+
+
+def load_plugins(server: "Server") -> None:
+    """Add the tools of every installed plugin to `server`, from the manifest where possible.
+
+    Plugins already added to `server` are skipped, so calling this again only
+    adds newly installed ones. A plugin that fails to import is logged and
+    left out.
+    """
+    if not settings["enabled"]:
+        return
+    path = Path(settings["manifest"] or default_manifest_path())
+    manifest = read_manifest(path)
+    # Only installed plugins are kept, at their installed version
+    updated: dict[str, list[dict[str, Any]]] = {}
+    for entry_point in entry_points(group=PLUGIN_GROUP):
+        plugin = Plugin(entry_point)
+        tools = manifest.get(plugin.key)
+        if server.has_plugin(plugin):
+            if tools is not None:
+                updated[plugin.key] = tools
+            continue
+        try:
+            updated[plugin.key] = server.add_plugin(plugin, tools)
+        except Exception as e:
+            logger.warning("Could not load tool plugin {}: {}", plugin.key, e)
+    if updated != manifest:
+        write_manifest(path, updated)
+
+
+def read_manifest(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Tool descriptions by plugin key, or none if the manifest is missing or unreadable."""
+    try:
+        manifest: dict[str, list[dict[str, Any]]] = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring the tool plugin manifest {}: {}", path, e)
+        return {}
+    return manifest
+
+
+def write_manifest(path: Path, manifest: dict[str, list[dict[str, Any]]]) -> None:
+    """Replace the manifest at once, so that concurrent starts never read half of one."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}")
+        partial.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(partial, path)
+    except OSError as e:
+        # A read-only filesystem only costs the import at the next start
+        logger.warning("Could not write the tool plugin manifest {}: {}", path, e)
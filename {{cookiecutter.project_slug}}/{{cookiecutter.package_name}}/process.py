@@ -0,0 +1,47 @@
+"""Process-wide options for {{ cookiecutter.project_name }}, applied before the server starts.
+
+Kept apart from `app` so that stdio servers, which are started once per client
+session, do not import the streamable-http application to configure
+themselves.
+"""
+
+from typing import Any
+
+from .admission import configure_admission
+from .batch import configure_batch
+from .executors import configure_executors
+from .http_pool import configure_http
+from .lifecycle import configure_lifecycle
+from .listings import configure_listings
+from .logs import configure_logging
+from .plugins import configure_plugins
+from .profiler import configure_profiler
+from .serialization import configure_serializer
+from .sessions import configure_sessions
+from .stdio import configure_stdio
+from .tracing import configure_tracing
+
+
+def configure_process(options: dict[str, Any]) -> None:
+    """Apply the process-wide options (logging, tracing, serializer, executor
+    pools, limits, draining, session store, outbound HTTP, stdio pipelining,
+    list pages, tool plugins, profiler).
+
+    `options` holds one group of keyword arguments per subsystem, as built by
+    `serve`: `logging`, `tracing`, `serialization`, `executors`, `batch`,
+    `admission`, `lifecycle`, `sessions`, `http`, `stdio`, `listings`,
+    `plugins`, `profiler` and `app` (for `create_http_app`).
+    """
+    configure_logging(**options.get("logging", {}))
+    configure_tracing(**options.get("tracing", {}))
+    configure_serializer(**options.get("serialization", {}))
+    configure_executors(**options.get("executors", {}))
+    configure_batch(**options.get("batch", {}))
+    configure_admission(**options.get("admission", {}))
+    configure_lifecycle(**options.get("lifecycle", {}))
+    configure_sessions(**options.get("sessions", {}))
+    configure_http(**options.get("http", {}))
+    configure_stdio(**options.get("stdio", {}))
+    configure_listings(**options.get("listings", {}))
+    configure_plugins(**options.get("plugins", {}))
+    configure_profiler(**options.get("profiler", {}))
@@ -0,0 +1,290 @@
+"""A sampling profiler for the running server, started on demand.
+
+When a tool is slow in production but not on a laptop, `--profiler` lets you
+look inside the live process. With the HTTP transport, `GET /debug/profile`
+samples it for a few seconds and answers with the result. In stdio mode,
+SIGUSR1 does the same and writes the result to a file. Between profiles
+nothing is installed, so an enabled but idle profiler costs nothing.
+
+While profiling, a thread reads the stack of every other thread from
+`sys._current_frames()` at a fixed interval. A sample taken inside
+`Server.call_tool` is attributed to the tool being called, which is added as a
+`tool:<name>` frame below the thread's, so flame graphs split the event
+loop's time by tool. Tools running in the thread pool show up under the pool's
+threads with their own function names. The process pool is not sampled.
+
+The sampler holds the GIL while it takes a sample, which stalls the server.
+It waits at least `1 / MAX_SHARE - 1` times as long as a sample took before
+taking the next, so it never holds the GIL for more than `MAX_SHARE` of the
+time, however many threads or deep stacks there are. Only one profile runs at
+a time.
+
+Results are counted per distinct stack, and returned as collapsed stacks (one
+`frame;frame;frame count` line per stack, read by flamegraph.pl, speedscope
+and most flame graph tools) or in speedscope's JSON format.
+"""
+
+import json
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+from loguru import logger
+
+DEFAULT_SECONDS = 10.0
+DEFAULT_INTERVAL = 0.005
+MIN_INTERVAL = 0.001
+MAX_SECONDS = 60.0
+
+# Largest share of the time the sampler may hold the GIL
+MAX_SHARE = 0.1
+
+FORMATS = ("collapsed", "speedscope")
+
+# Not available on Windows
+SIGNAL = getattr(signal, "SIGUSR1", None)
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+settings: dict[str, Any] = {"seconds": DEFAULT_SECONDS, "directory": None}
+
+_running = threading.Lock()
+
+# (function, file, first line) of a frame as shown in the results
+Frame = tuple[str, str, int]
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one runs."""
+
+
+def configure_profiler(seconds: float | None = None, directory: str | None = None) -> None:
+    """Set the defaults of profiles started by a request or a signal.
+
+    Args:
+        seconds: How long a profile samples, unless the request says otherwise
+        directory: Where profiles started by SIGUSR1 are written (default: the temp directory)
+    """
+    if seconds is not None:
+        settings["seconds"] = seconds
+    if directory is not None:
+        settings["directory"] = directory
+
+
+class Profile:
+    """The samples of one run, counted per distinct stack.
+
+    A stack is (thread name, tool name or None, code objects from the
+    outermost frame in).
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter[tuple[str, str | None, tuple[CodeType, ...]]] = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        # Time spent taking samples, with the GIL held
+        self.overhead = 0.0
+
+    def frames(self) -> Counter[tuple[Frame, ...]]:
+        """The sample counts per stack of `Frame`s, from the thread's frame in."""
+        labels: dict[CodeType, Frame] = {}
+        counts: Counter[tuple[Frame, ...]] = Counter()
+        for (thread, tool, codes), count in self.stacks.items():
+            stack = [(f"thread:{thread}", "", 0)]
+            if tool is not None:
+                stack.append((f"tool:{tool}", "", 0))
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    path = _short_path(code.co_filename)
+                    label = labels[code] = (code.co_qualname, path, code.co_firstlineno)
+                stack.append(label)
+            counts[tuple(stack)] += count
+        return counts
+
+    def collapsed(self) -> str:
+        """One `frame;frame;frame count` line per stack."""
+        lines = []
+        for stack, count in sorted(self.frames().items()):
+            names = [f"{name} ({path}:{line})" if path else name for name, path, line in stack]
+            lines.append(f"{';'.join(names)} {count}\n")
+        return "".join(lines)
+
+    def speedscope(self) -> dict[str, Any]:
+        """A speedscope file with one sampled profile per thread, weighted in seconds."""
+        frames: list[dict[str, Any]] = []
+        indexes: dict[Frame, int] = {}
+        threads: dict[str, dict[str, Any]] = {}
+        for stack, count in self.frames().items():
+            thread = threads.setdefault(stack[0][0], {"samples": [], "weights": []})
+            sample = []
+            for frame in stack[1:]:
+                index = indexes.get(frame)
+                if index is None:
+                    index = indexes[frame] = len(frames)
+                    name, path, line = frame
+                    entry = {"name": name, "file": path, "line": line} if path else {"name": name}
+                    frames.append(entry)
+                sample.append(index)
+            thread["samples"].append(sample)
+            thread["weights"].append(count * self.interval)
+        profiles = [
+            {
+                "type": "sampled",
+                "name": name.removeprefix("thread:"),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(thread["weights"]),
+                **thread,
+            }
+            for name, thread in sorted(threads.items())
+        ]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": f"{{ cookiecutter.package_name }} (pid {os.getpid()})",
+            "exporter": "{{ cookiecutter.package_name }}",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def render(self, format: str) -> str:
+        """The profile in one of `FORMATS`."""
+        if format == "speedscope":
+            return json.dumps(self.speedscope())
+        return self.collapsed()
+
+
+def sample(seconds: float, interval: float = DEFAULT_INTERVAL) -> Profile:
+    """Sample every other thread of the process for `seconds`, blocking the calling thread.
+
+    Raises:
+        ValueError: `seconds` or `interval` out of range
+        ProfilerBusy: Another profile is running
+    """
+    if not 0 < seconds <= MAX_SECONDS:
+        raise ValueError(f"seconds must be more than 0 and at most {MAX_SECONDS:g}")
+    if interval < MIN_INTERVAL:
+        raise ValueError(f"interval must be at least {MIN_INTERVAL:g}")
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    try:
+        return _sample(seconds, interval)
+    finally:
+        _running.release()
+
+
+def _sample(seconds: float, interval: float) -> Profile:
+    from .core import Server
+
+    # The frame whose `name` argument is the tool being called
+    tool_code = Server.call_tool.__code__
+    profile = Profile(interval)
+    me = threading.get_ident()
+    names: dict[int, str] = {}
+    start = time.perf_counter()
+    deadline = start + seconds
+    now = start
+    while now < deadline:
+        frames = sys._current_frames()
+        unnamed = frames.keys() - names.keys()
+        if unnamed:
+            threads = threading.enumerate()
+            names.update((thread.ident, thread.name) for thread in threads if thread.ident)
+            # Threads not started by `threading`
+            names.update((ident, str(ident)) for ident in unnamed - names.keys())
+        for ident, frame in frames.items():
+            if ident != me:
+                profile.stacks[_stack(names[ident], frame, tool_code)] += 1
+        del frames
+        profile.samples += 1
+        spent = time.perf_counter() - now
+        profile.overhead += spent
+        time.sleep(max(interval - spent, spent * (1 / MAX_SHARE - 1)))
+        now = time.perf_counter()
+    profile.duration = now - start
+    return profile
+
+
+def _stack(
+    thread: str, frame: FrameType | None, tool_code: CodeType
+) -> tuple[str, str | None, tuple[CodeType, ...]]:
+    tool = None
+    codes = []
+    while frame is not None:
+        code = frame.f_code
+        if code is tool_code and tool is None:
+            # The innermost call wins, e.g. a tool called by `batch`
+            tool = str(frame.f_locals.get("name"))
+        codes.append(code)
+        frame = frame.f_back
+    codes.reverse()
+    return thread, tool, tuple(codes)
+
+
+def _short_path(filename: str) -> str:
+    """`filename` relative to the `sys.path` entry it was imported from."""
+    roots = [root for root in sys.path if root and filename.startswith(root + os.sep)]
+    if not roots:
+        return filename
+    return filename[len(max(roots, key=len)) + 1:]
+
+
+def install_signal_handler() -> bool:
+    """Profile for `settings["seconds"]` on SIGUSR1, writing the results to files.
+
+    Returns False where the signal does not exist.
+    """
+    if SIGNAL is None:
+        logger.warning("Profiling on a signal is not supported on this platform")
+        return False
+
+    def on_signal(signum: int, frame: FrameType | None) -> None:
+        threading.Thread(target=profile_to_files, name="profiler", daemon=True).start()
+
+    signal.signal(SIGNAL, on_signal)
+    logger.info(
+        "Send SIGUSR1 to process {} to profile it for {:g} seconds",
+        os.getpid(),
+        settings["seconds"],
+    )
+    return True
+
+
+def profile_to_files() -> list[Path]:
+    """Profile for `settings["seconds"]` and write a collapsed and a speedscope file.
+
+    Returns the paths written, or none if another profile was running.
+    """
+    try:
+        profile = sample(settings["seconds"])
+    except ProfilerBusy:
+        logger.warning("Ignoring the profiling signal: a profile is already running")
+        return []
+    directory = Path(settings["directory"] or tempfile.gettempdir())
+    stem = f"{{ cookiecutter.package_name }}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}"
+    paths = []
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        for format, suffix in (("collapsed", ".collapsed"), ("speedscope", ".speedscope.json")):
+            path = directory / f"{stem}{suffix}"
+            path.write_text(profile.render(format))
+            paths.append(path)
+    except OSError as e:
+        logger.error("Could not write the profile to {}: {}", directory, e)
+        return paths
+    logger.info(
+        "Profile of {} samples written to {} ({:.1%} of the time spent sampling)",
+        profile.samples,
+        ", ".join(map(str, paths)),
+        profile.overhead / profile.duration,
+    )
+    return paths
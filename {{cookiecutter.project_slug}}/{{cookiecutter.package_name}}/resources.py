@@ -0,0 +1,106 @@
+"""Versioned resource contents, conditional reads and change notifications.
+
+Every resource read carries an ETag, a hash of the contents, in the `_meta`
+of each returned item:
+
+    {"uri": "config://settings", "text": "...", "_meta": {"etag": "3f2a..."}}
+
+A client that already holds a version sends its ETag as `ifNoneMatch` in the
+request's `_meta`. If that is still the current version, the server answers
+with a single empty item marked `"notModified": true` instead of the body.
+
+Clients can subscribe to a resource URI. Subscribers are sent
+`notifications/resources/updated` only when the resource is rebuilt (by
+`Server.refresh_resource` or after its cache TTL expires) and the new contents
+hash differently from the version they last saw.
+"""
+
+import hashlib
+import weakref
+from typing import Any, Iterable
+
+import anyio
+from loguru import logger
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+
+ETAG = "etag"
+IF_NONE_MATCH = "ifNoneMatch"
+NOT_MODIFIED = "notModified"
+
+
+def compute_etag(contents: Iterable[ReadResourceContents]) -> str:
+    """Hash the content and MIME type of every item."""
+    digest = hashlib.blake2b(digest_size=16)
+    for item in contents:
+        data = item.content.encode() if isinstance(item.content, str) else item.content
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+        digest.update((item.mime_type or "").encode() + b"\0")
+    return digest.hexdigest()
+
+
+def with_etag(contents: Iterable[ReadResourceContents], etag: str) -> list[ReadResourceContents]:
+    """Copies of `contents` with the ETag added to their meta."""
+    return [
+        ReadResourceContents(
+            content=item.content, mime_type=item.mime_type, meta={**(item.meta or {}), ETAG: etag}
+        )
+        for item in contents
+    ]
+
+
+def not_modified(etag: str, mime_type: str | None, binary: bool = False) -> list[ReadResourceContents]:
+    """The answer to a conditional read whose version is still current."""
+    empty = b"" if binary else ""
+    return [ReadResourceContents(content=empty, mime_type=mime_type, meta={ETAG: etag, NOT_MODIFIED: True})]
+
+
+def requested_etag(meta: Any) -> str | None:
+    """The `ifNoneMatch` value in a request's `_meta`, if any."""
+    return getattr(meta, IF_NONE_MATCH, None) if meta is not None else None
+
+
+class Subscriptions:
+    """Sessions subscribed to each resource URI, and the version they last saw.
+
+    Sessions are held weakly, so a closed session drops out on its own.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, weakref.WeakSet[Any]] = {}
+        self._etags: dict[str, str] = {}
+
+    def add(self, uri: str, session: Any, etag: str) -> None:
+        self._sessions.setdefault(uri, weakref.WeakSet()).add(session)
+        self._etags.setdefault(uri, etag)
+
+    def remove(self, uri: str, session: Any) -> None:
+        sessions = self._sessions.get(uri)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._sessions[uri]
+                self._etags.pop(uri, None)
+
+    def count(self, uri: str) -> int:
+        return len(self._sessions.get(uri, ()))
+
+    async def publish(self, uri: str, etag: str) -> int:
+        """Notify the subscribers of `uri` if `etag` is a new version.
+
+        Returns the number of sessions notified.
+        """
+        sessions = self._sessions.get(uri)
+        if not sessions or self._etags.get(uri) == etag:
+            return 0
+        self._etags[uri] = etag
+        notified = 0
+        for session in list(sessions):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+                notified += 1
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                logger.debug("Dropping closed subscriber of {}", uri)
+                self.remove(uri, session)
+        return notified
@@ -0,0 +1,40 @@
+"""JSON schemas compiled into validators once, instead of on every tool call.
+
+The SDK checks each structured tool result with `jsonschema.validate`, which
+checks the schema itself and builds a new validator every time; for a small
+tool that is most of the time spent dispatching a call. A `CompiledSchema` does
+both once, on the tool's first call, and reports the same errors.
+
+Arguments need no such step: FastMCP validates them with the pydantic model it
+builds from the tool's signature at registration. Parameters typed as `Literal`
+or `Enum` become `enum` schemas there, so an unknown value is rejected before
+the tool runs and clients see the allowed values in `tools/list`.
+"""
+
+from typing import Any
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+
+class CompiledSchema:
+    """A validator for one JSON schema, checked and built once.
+
+    Raises `jsonschema.SchemaError` if `schema` itself is invalid.
+    """
+
+    __slots__ = ("schema", "_validator")
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        self.schema = schema
+        self._validator = cls(schema)
+
+    def error(self, instance: Any) -> str | None:
+        """Why `instance` does not match the schema, or None if it does."""
+        if self._validator.is_valid(instance):
+            return None
+        # The error `jsonschema.validate` would raise
+        error = best_match(self._validator.iter_errors(instance))
+        return error.message if error is not None else "Invalid value"
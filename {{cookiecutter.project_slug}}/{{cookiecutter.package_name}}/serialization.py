@@ -0,0 +1,218 @@
+"""Pluggable JSON encoding for tool results and protocol messages.
+
+The SDK encodes every outgoing JSON-RPC message with pydantic's
+`model_dump_json`. That is slow for the free-form `result` dict of a response,
+because each value's type is inspected as it is written. It also turns every
+non-text tool result into pretty-printed JSON. With this module, both steps go
+through one backend, chosen with `configure_serializer`:
+
+- "orjson" and "msgspec" when installed (`pip install .[orjson]` or
+  `.[msgspec]`).
+- "pydantic", which uses pydantic-core. It is always installed and faster
+  than the standard library.
+- "json", the standard library.
+
+"auto" (the default) picks the first available in that order. Tool results
+are written as compact JSON. Messages are encoded in `stdio.stdio_server` for
+stdio and in `sessions.SerializedTransport` for streamable-http, as single-line JSON
+with no ASCII escaping, as the SDK writes them.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from itertools import chain
+from typing import Any, Awaitable, Callable, Sequence
+
+import pydantic_core
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata
+from mcp.server.fastmcp.utilities.types import Audio, Image
+from mcp.types import CallToolResult, ContentBlock, JSONRPCResponse, TextContent
+from pydantic import BaseModel
+
+from . import tracing
+
+AUTO = "auto"
+
+# Tried in this order by "auto"
+PREFERRED = ("orjson", "msgspec", "pydantic")
+
+
+def _fallback(value: Any) -> Any:
+    """Plain JSON data for values a backend cannot encode itself (pydantic
+    models, URLs, ...), converted as pydantic does; `str` as a last resort."""
+    return pydantic_core.to_jsonable_python(value, fallback=str)
+
+
+class Serializer(ABC):
+    """Encodes JSON values and anything pydantic can convert to them."""
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """`value` as compact UTF-8 JSON."""
+
+    def dumps_text(self, value: Any) -> str:
+        return self.dumps(value).decode()
+
+    def encode_message(self, message: BaseModel) -> str:
+        """A JSON-RPC message on one line, as the transports send it."""
+        root = getattr(message, "root", message)
+        if isinstance(root, JSONRPCResponse) and not root.model_extra:
+            # The result is plain JSON data already: skip pydantic's walk over it
+            return self.dumps_text({"jsonrpc": root.jsonrpc, "id": root.id, "result": root.result})
+        return self.dumps_text(message.model_dump(by_alias=True, exclude_none=True))
+
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> bytes:
+        return self._dumps(value, default=_fallback, option=self._options)
+
+
+class MsgspecSerializer(Serializer):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encode: Callable[[Any], bytes] = msgspec.json.Encoder(enc_hook=_fallback).encode
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encode(value)
+
+
+class PydanticSerializer(Serializer):
+    name = "pydantic"
+
+    def dumps(self, value: Any) -> bytes:
+        return pydantic_core.to_json(value, fallback=str)
+
+
+class StdlibSerializer(Serializer):
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return self.dumps_text(value).encode()
+
+    def dumps_text(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_fallback)
+
+
+BACKENDS: dict[str, Callable[[], Serializer]] = {
+    "orjson": OrjsonSerializer,
+    "msgspec": MsgspecSerializer,
+    "pydantic": PydanticSerializer,
+    "json": StdlibSerializer,
+}
+
+_serializer: Serializer = PydanticSerializer()
+
+
+def create_serializer(name: str = AUTO) -> Serializer:
+    """Instantiate a backend; an explicitly named one must be installed."""
+    if name != AUTO:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown serializer {name!r}, expected one of {', '.join(BACKENDS)}")
+        return BACKENDS[name]()
+    for candidate in PREFERRED:
+        try:
+            return BACKENDS[candidate]()
+        except ImportError:
+            continue
+    return PydanticSerializer()
+
+
+def configure_serializer(serializer: str = AUTO) -> Serializer:
+    """Select the backend used for tool results and messages from now on."""
+    global _serializer
+    _serializer = create_serializer(serializer)
+    return _serializer
+
+
+def get_serializer() -> Serializer:
+    return _serializer
+
+
+def dumps_text(value: Any) -> str:
+    """Encode `value` as compact JSON text with the configured backend."""
+    return _serializer.dumps_text(value)
+
+
+def encode_message(message: BaseModel) -> str:
+    return _serializer.encode_message(message)
+
+
+def to_content(result: Any) -> Sequence[ContentBlock]:
+    """Convert a tool's return value into content blocks.
+
+    The same rules as FastMCP, except that values other than text and media
+    are encoded by the configured backend instead of as indented JSON.
+    """
+    if result is None:
+        return []
+    if isinstance(result, ContentBlock):
+        return [result]
+    if isinstance(result, Image):
+        return [result.to_image_content()]
+    if isinstance(result, Audio):
+        return [result.to_audio_content()]
+    if isinstance(result, list | tuple):
+        return list(chain.from_iterable(to_content(item) for item in result))
+    if not isinstance(result, str):
+        result = _serializer.dumps_text(result)
+    return [TextContent(type="text", text=result)]
+
+
+class SerializedResults(FuncMetadata):
+    """Tool metadata whose result conversion uses `to_content`.
+
+    When tracing is on, argument validation, the call itself and the result
+    conversion are recorded as the `validate`, `execute` and `serialize`
+    spans (see `tracing`).
+    """
+
+    @classmethod
+    def from_metadata(cls, metadata: FuncMetadata) -> "SerializedResults":
+        return cls.model_construct(**dict(metadata))
+
+    async def call_fn_with_arg_validation(
+        self,
+        fn: Callable[..., Any | Awaitable[Any]],
+        fn_is_async: bool,
+        arguments_to_validate: dict[str, Any],
+        arguments_to_pass_directly: dict[str, Any] | None,
+    ) -> Any:
+        if not tracing.enabled():
+            return await super().call_fn_with_arg_validation(
+                fn, fn_is_async, arguments_to_validate, arguments_to_pass_directly
+            )
+        # The same steps as FuncMetadata, timed separately
+        with tracing.span("validate"):
+            parsed = self.arg_model.model_validate(self.pre_parse_json(arguments_to_validate))
+            arguments = parsed.model_dump_one_level() | (arguments_to_pass_directly or {})
+        with tracing.span("execute"):
+            return await fn(**arguments) if fn_is_async else fn(**arguments)
+
+    def convert_result(self, result: Any) -> Any:
+        with tracing.span("serialize"):
+            return self._convert_result(result)
+
+    def _convert_result(self, result: Any) -> Any:
+        if isinstance(result, CallToolResult):
+            return super().convert_result(result)
+        content = to_content(result)
+        if self.output_schema is None:
+            return content
+        if self.wrap_output:
+            result = {"result": result}
+        assert self.output_model is not None, "Output model must be set if output schema is defined"
+        structured = self.output_model.model_validate(result).model_dump(mode="json", by_alias=True)
+        return content, structured
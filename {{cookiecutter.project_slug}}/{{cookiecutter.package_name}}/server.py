@@ -1,45 +1,57 @@
 """MCP Server implementation for {{ cookiecutter.project_name }}."""
 
-import json
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Callable, Literal, Optional
 
 from loguru import logger
-from mcp.server.fastmcp import FastMCP
+from pydantic import Field
+
+from .arrays import (
+    DIVIDE_BY_ZERO,
+    MAX_ELEMENTS,
+    OPERATIONS,
+    ArrayResult,
+    Operation,
+    calculate_elementwise,
+)
+from .core import Server
+from .plugins import load_plugins
+from .serialization import dumps_text
 
 # Create the FastMCP server
-mcp = FastMCP("{{ cookiecutter.package_name }}")
+mcp = Server("{{ cookiecutter.package_name }}")
+mcp.add_batch_tool()
 
 
-@mcp.tool()
+@mcp.tool(cache=True)
 def echo(message: str) -> str:
     """Echo back the input message"""
-    logger.info(f"Echo tool called with message: {message}")
+    logger.info("Echo tool called with message: {}", message)
     return f"Echo: {message}"
 
 
+TIMESTAMP_FORMATS: dict[str, Callable[[datetime], str]] = {
+    "iso": datetime.isoformat,
+    "unix": lambda now: str(int(now.timestamp())),
+    "human": lambda now: now.strftime("%Y-%m-%d %H:%M:%S"),
+}
+
+
+# Parameters with a fixed set of values are Literals: the input schema lists
+# them as an enum, and other values are rejected before the tool runs.
 @mcp.tool()
-def timestamp(format: str = "iso") -> str:
+def timestamp(format: Literal["iso", "unix", "human"] = "iso") -> str:
     """Get current timestamp
     
     Args:
         format: Timestamp format (iso, unix, or human)
     """
-    logger.info(f"Timestamp tool called with format: {format}")
-    now = datetime.now()
-    
-    if format == "iso":
-        return now.isoformat()
-    elif format == "unix":
-        return str(int(now.timestamp()))
-    elif format == "human":
-        return now.strftime("%Y-%m-%d %H:%M:%S")
-    else:
-        raise ValueError(f"Unknown format: {format}")
+    logger.info("Timestamp tool called with format: {}", format)
+    return TIMESTAMP_FORMATS[format](datetime.now())
 
 
-@mcp.tool()
-def calculate(operation: str, a: float, b: float) -> float:
+@mcp.tool(cache=True)
+def calculate(operation: Operation, a: float, b: float) -> float:
     """Perform basic arithmetic calculations
     
     Args:
@@ -47,20 +59,27 @@ def calculate(operation: str, a: float, b: float) -> float:
         a: First number
         b: Second number
     """
-    logger.info(f"Calculate tool called: {a} {operation} {b}")
+    logger.info("Calculate tool called: {} {} {}", a, operation, b)
+    if operation == "divide" and b == 0:
+        raise ValueError(DIVIDE_BY_ZERO)
+    return OPERATIONS[operation](a, b)
+
+
+@mcp.tool()
+def calculate_array(
+    operation: Operation,
+    a: Annotated[list[float], Field(max_length=MAX_ELEMENTS)],
+    b: Annotated[list[float], Field(max_length=MAX_ELEMENTS)],
+) -> ArrayResult:
+    """Perform element-wise arithmetic on two equal-length lists of numbers
     
-    if operation == "add":
-        return a + b
-    elif operation == "subtract":
-        return a - b
-    elif operation == "multiply":
-        return a * b
-    elif operation == "divide":
-        if b == 0:
-            raise ValueError("Cannot divide by zero")
-        return a / b
-    else:
-        raise ValueError(f"Unknown operation: {operation}")
+    Args:
+        operation: Mathematical operation (add, subtract, multiply, divide)
+        a: First numbers
+        b: Second numbers, one per element of a
+    """
+    logger.info("Calculate array tool called: {} on {} elements", operation, len(a))
+    return calculate_elementwise(operation, a, b)
 
 
 @mcp.prompt()
@@ -71,11 +90,11 @@ def hello(name: Optional[str] = None) -> str:
         name: Name to greet (optional)
     """
     user_name = name or "World"
-    logger.info(f"Hello prompt called for: {user_name}")
+    logger.info("Hello prompt called for: {}", user_name)
     return f"Hello, {user_name}! Welcome to {{ cookiecutter.project_name }}."
 
 
-@mcp.resource("config://settings")
+@mcp.resource("config://settings", cache=True, coalesce=True)
 def get_server_config() -> str:
     """Server configuration settings"""
     logger.info("Config resource accessed")
@@ -85,10 +104,16 @@ def get_server_config() -> str:
         "author": "{{ cookiecutter.author_name }}",
         "description": "{{ cookiecutter.project_description }}",
     }
-    return json.dumps(settings, indent=2)
+    return dumps_text(settings)
+
+
+# Large files are served memory-mapped, one bounded chunk per read, e.g.:
+# mcp.file_resource("data://datasets/sales", "/srv/data/sales.csv", description="Sales records")
 
 
-def create_server() -> FastMCP:
+def create_server() -> Server:
     """Create and configure the FastMCP server."""
     logger.info("Creating FastMCP server")
+    # Tools of installed plugin packages, imported when first called
+    load_plugins(mcp)
     return mcp
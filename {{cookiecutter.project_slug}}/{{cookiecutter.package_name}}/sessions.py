@@ -0,0 +1,422 @@
+"""Streamable-http sessions that any replica of the server can resume.
+
+The SDK keeps each session in the memory of the process that created it, so
+every request of a session has to reach that process. `SharedSessionManager`
+also records what the client sent in `initialize` in a `SessionStore`. A
+replica that receives a request for a session it does not hold looks the
+session up there, replays the handshake to a fresh server session of its own
+and serves the request. Several replicas sharing a store can then sit behind a
+plain round-robin load balancer.
+
+Stores are chosen by URL with `configure_sessions`:
+
+- "memory" (the default) keeps records in the process, which is what the SDK
+  does.
+- "sqlite:///path/to/sessions.db" shares them between processes on one host,
+  e.g. in tests.
+- "redis://host:6379/0" (or "rediss://") shares them between hosts. It needs
+  the `redis` extra (`pip install .[redis]`).
+
+What a session holds beyond the handshake stays with the replica that has it:
+resource subscriptions, and notifications not tied to a request, which are
+sent on the standalone GET stream of whichever replica the client opened it on.
+Sessions of authenticated clients are not resumed elsewhere, since the store
+does not record credentials.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from functools import partial
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Callable
+from uuid import uuid4
+
+import anyio
+from anyio.abc import TaskStatus
+from loguru import logger
+from mcp.server.auth.middleware.bearer_auth import AuthenticatedUser, AuthorizationContext
+from mcp.server.streamable_http import (
+    CONTENT_TYPE_JSON,
+    MCP_SESSION_ID_HEADER,
+    EventMessage,
+    StreamableHTTPServerTransport,
+)
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager, _error_response
+from mcp.types import INTERNAL_ERROR, JSONRPCMessage
+from pydantic_core import from_json
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Message, Receive, Scope, Send
+
+from .serialization import dumps_text, encode_message
+
+MEMORY = "memory"
+
+settings: dict[str, str] = {"store": MEMORY}
+
+
+def configure_sessions(store: str | None = None) -> None:
+    """Set the URL of the store used by streamable-http apps created from now on."""
+    if store is not None:
+        _store_factory(store)  # Fail at startup on a bad URL
+        settings["store"] = store
+
+
+class SessionStore(ABC):
+    """Session records by session id, expiring `ttl` seconds after they were set.
+
+    A record is the JSON text of the client's `initialize` params.
+    """
+
+    @abstractmethod
+    async def get(self, session_id: str) -> str | None:
+        """The record of `session_id`, or None if it is unknown or expired."""
+
+    @abstractmethod
+    async def set(self, session_id: str, record: str, ttl: float | None = None) -> None:
+        """Store `record`, replacing any previous one, for `ttl` seconds (forever if None)."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Forget `session_id`, if it is known."""
+
+    async def aclose(self) -> None:
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self) -> None:
+        self._records: dict[str, tuple[str, float]] = {}
+
+    async def get(self, session_id: str) -> str | None:
+        record, expires = self._records.get(session_id, (None, math.inf))
+        if expires <= time.time():
+            del self._records[session_id]
+            return None
+        return record
+
+    async def set(self, session_id: str, record: str, ttl: float | None = None) -> None:
+        self._records[session_id] = (record, math.inf if ttl is None else time.time() + ttl)
+
+    async def delete(self, session_id: str) -> None:
+        self._records.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Records in a SQLite database that processes on one host can share.
+
+    Queries run in a worker thread so the event loop never waits on the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS mcp_sessions (id TEXT PRIMARY KEY, record TEXT NOT NULL, expires REAL)"
+        )
+
+    def _execute(self, sql: str, *params: Any) -> list[Any]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    async def get(self, session_id: str) -> str | None:
+        rows = await anyio.to_thread.run_sync(
+            self._execute,
+            "SELECT record FROM mcp_sessions WHERE id = ? AND (expires IS NULL OR expires > ?)",
+            session_id,
+            time.time(),
+        )
+        return rows[0][0] if rows else None
+
+    def _set(self, session_id: str, record: str, ttl: float | None) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute("DELETE FROM mcp_sessions WHERE expires <= ?", (now,))
+            self._connection.execute(
+                "INSERT INTO mcp_sessions (id, record, expires) VALUES (?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET record = excluded.record, expires = excluded.expires",
+                (session_id, record, None if ttl is None else now + ttl),
+            )
+
+    async def set(self, session_id: str, record: str, ttl: float | None = None) -> None:
+        await anyio.to_thread.run_sync(self._set, session_id, record, ttl)
+
+    async def delete(self, session_id: str) -> None:
+        await anyio.to_thread.run_sync(self._execute, "DELETE FROM mcp_sessions WHERE id = ?", session_id)
+
+    async def aclose(self) -> None:
+        self._connection.close()
+
+
+class RedisSessionStore(SessionStore):
+    """Records in Redis, or anything speaking its protocol, with native expiry."""
+
+    def __init__(self, url: str, prefix: str = "mcp:session:") -> None:
+        import redis.asyncio
+
+        self.prefix = prefix
+        self._redis = redis.asyncio.from_url(url)
+
+    async def get(self, session_id: str) -> str | None:
+        record = await self._redis.get(self.prefix + session_id)
+        return record.decode() if record is not None else None
+
+    async def set(self, session_id: str, record: str, ttl: float | None = None) -> None:
+        expires = None if ttl is None else max(1, math.ceil(ttl))
+        await self._redis.set(self.prefix + session_id, record, ex=expires)
+
+    async def delete(self, session_id: str) -> None:
+        await self._redis.delete(self.prefix + session_id)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+def _store_factory(url: str) -> Callable[[], SessionStore]:
+    if url == MEMORY:
+        return MemorySessionStore
+    scheme, _, rest = url.partition("://")
+    if scheme == "sqlite" and rest.startswith("/"):
+        # sqlite:///relative.db and sqlite:////absolute.db, as in SQLAlchemy
+        return partial(SQLiteSessionStore, rest[1:])
+    if scheme in ("redis", "rediss", "unix"):
+        return partial(RedisSessionStore, url)
+    raise ValueError(f"Unknown session store {url!r}, expected memory, sqlite:///<path> or redis://<host>")
+
+
+def create_store(url: str = MEMORY) -> SessionStore:
+    """Create the store for `url`: "memory", "sqlite:///<path>" or "redis://..."."""
+    return _store_factory(url)()
+
+
+def _authenticated(scope: Scope) -> bool:
+    """Whether the request carries a credential, which sessions are bound to."""
+    return isinstance(scope.get("user"), AuthenticatedUser)
+
+
+def _replayed(scope: Scope, message: dict[str, Any], session_id: str | None = None) -> tuple[Scope, Receive, Send]:
+    """A POST of `message` with the headers of the client's `scope`, and a
+    `send` that drops the response."""
+    replaced = {b"accept", b"content-type", b"content-length", MCP_SESSION_ID_HEADER.encode()}
+    headers = [(name, value) for name, value in scope["headers"] if name not in replaced]
+    headers += [(b"accept", b"application/json, text/event-stream"), (b"content-type", b"application/json")]
+    if session_id is not None:
+        headers.append((MCP_SESSION_ID_HEADER.encode(), session_id.encode()))
+    body = dumps_text(message).encode()
+    answered = anyio.Event()
+    read = False
+
+    async def receive() -> Message:
+        nonlocal read
+        if not read:
+            read = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await answered.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            answered.set()
+
+    return {**scope, "method": "POST", "headers": headers}, receive, send
+
+
+class SerializedTransport(StreamableHTTPServerTransport):
+    """The SDK's streamable-http transport, with JSON responses and SSE events
+    encoded by the configured serializer."""
+
+    def _create_json_response(
+        self,
+        response_message: JSONRPCMessage | None,
+        status_code: HTTPStatus = HTTPStatus.OK,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        response_headers = {"Content-Type": CONTENT_TYPE_JSON, **(headers or {})}
+        if self.mcp_session_id:
+            response_headers[MCP_SESSION_ID_HEADER] = self.mcp_session_id
+        body = encode_message(response_message) if response_message else None
+        return Response(body, status_code=status_code, headers=response_headers)
+
+    def _create_event_data(self, event_message: EventMessage) -> Any:
+        event_data = {"event": "message", "data": encode_message(event_message.message)}
+        if event_message.event_id:
+            event_data["id"] = event_message.event_id
+        return event_data
+
+
+class SharedSessionManager(StreamableHTTPSessionManager):
+    """The SDK's session manager, with sessions recorded in `store` and
+    resumed from it when a request names a session this process lacks.
+
+    Sessions of authenticated clients are neither recorded nor resumed: the
+    SDK binds a session to the credential that opened it, which the store
+    does not hold. Every transport the manager creates, per session or per
+    stateless request, is a `SerializedTransport`. The store is not used when
+    stateless.
+
+    Records expire after the session idle timeout and are refreshed while the
+    session is used. A session deleted by its client on one replica is removed
+    from the store, but replicas that already hold it serve it until it is idle.
+
+    The SDK has no public hooks for any of this, so the manager overrides and
+    uses private members of its base class. The mcp requirement is pinned to
+    the exact version they were written against, and tests/test_sessions.py
+    fails if an upgrade changes one of them.
+    """
+
+    def __init__(self, store: SessionStore, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.store = store
+        # Record and time of the last store write, for sessions held here
+        self._records: dict[str, tuple[str, float]] = {}
+
+    @asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        try:
+            async with super().run():
+                yield
+        finally:
+            self._records.clear()
+            await self.store.aclose()
+
+    def _transport(self, session_id: str | None) -> SerializedTransport:
+        """A transport for session `session_id`, or for one stateless request if None."""
+        if session_id is None:
+            return SerializedTransport(
+                mcp_session_id=None,
+                is_json_response_enabled=self.json_response,
+                event_store=None,
+                security_settings=self.security_settings,
+            )
+        return SerializedTransport(
+            mcp_session_id=session_id,
+            is_json_response_enabled=self.json_response,
+            event_store=self.event_store,
+            security_settings=self.security_settings,
+            retry_interval=self.retry_interval,
+            idle_timeout=self.session_idle_timeout,
+        )
+
+    async def _handle_stateless_request(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # As the SDK does, with a transport of ours
+        transport = self._transport(None)
+
+        async def run_stateless_server(*, task_status: TaskStatus[None] = anyio.TASK_STATUS_IGNORED) -> None:
+            async with transport.connect() as (read_stream, write_stream):
+                task_status.started()
+                try:
+                    await self.app.run(
+                        read_stream,
+                        write_stream,
+                        self.app.create_initialization_options(),
+                        stateless=True,
+                    )
+                except Exception:  # pragma: no cover
+                    logger.exception("Stateless session crashed")
+
+        assert self._task_group is not None
+        try:
+            await self._task_group.start(run_stateless_server)
+            await transport.handle_request(scope, receive, send)
+        finally:
+            # The server task only ends once the transport is terminated
+            with anyio.CancelScope(shield=True):
+                await transport.terminate()
+
+    def _admit_session(self, requestor: AuthorizationContext | None) -> StreamableHTTPServerTransport | None:
+        # As the SDK does, with a transport of ours
+        if self.max_sessions is not None and len(self._server_instances) >= self.max_sessions:
+            return None
+        session_id = uuid4().hex
+        if requestor is not None:
+            self._session_owners[session_id] = requestor
+        transport = self._server_instances[session_id] = self._transport(session_id)
+        logger.info("Created new transport with session ID: {}", session_id)
+        return transport
+
+    async def _handle_stateful_request(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session_id = Headers(scope=scope).get(MCP_SESSION_ID_HEADER)
+        if session_id is None:
+            await self._open_session(scope, receive, send)
+            return
+
+        if session_id in self._server_instances:
+            await self._refresh(session_id)
+            await super()._handle_stateful_request(scope, receive, send)
+        else:
+            await self._resume_session(session_id, scope, receive, send)
+        if scope["method"] == "DELETE":
+            self._records.pop(session_id, None)
+            await self.store.delete(session_id)
+
+    async def _open_session(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request without a session id, recording the session it opens."""
+        body = bytearray()
+
+        async def read_body() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                body.extend(message.get("body", b""))
+            return message
+
+        async def record_session(message: Message) -> None:
+            # Record before the client sees the session id and can use it elsewhere
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                session_id = Headers(raw=message["headers"]).get(MCP_SESSION_ID_HEADER)
+                request = from_json(body) if body else None
+                if (
+                    session_id
+                    and not _authenticated(scope)
+                    and isinstance(request, dict)
+                    and request.get("method") == "initialize"
+                ):
+                    await self._record(session_id, dumps_text(request.get("params", {})))
+            await send(message)
+
+        await super()._handle_stateful_request(scope, read_body, record_session)
+
+    async def _resume_session(self, session_id: str, scope: Scope, receive: Receive, send: Send) -> None:
+        record = None if _authenticated(scope) else await self.store.get(session_id)
+        if record is not None:
+            async with self._session_creation_lock:
+                if session_id not in self._server_instances:
+                    if self.max_sessions is not None and len(self._server_instances) >= self.max_sessions:
+                        await _error_response("Too many open sessions", 503, INTERNAL_ERROR)(scope, receive, send)
+                        return
+                    await self._replay_handshake(session_id, record, scope)
+        # The SDK answers 404 if the session is unknown to every replica
+        await super()._handle_stateful_request(scope, receive, send)
+
+    async def _replay_handshake(self, session_id: str, record: str, scope: Scope) -> None:
+        """Open the recorded session here, as if its client had just initialized it."""
+        logger.info("Resuming session {} from the session store", session_id)
+        transport = self._server_instances[session_id] = self._transport(session_id)
+        params = from_json(record)
+        initialize = {"jsonrpc": "2.0", "id": f"resume-{session_id}", "method": "initialize", "params": params}
+        await self._serve_opening_request(transport, *_replayed(scope, initialize))
+        if session_id in self._server_instances:
+            initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+            await transport.handle_request(*_replayed(scope, initialized, session_id))
+            self._records[session_id] = (record, time.monotonic())
+
+    async def _record(self, session_id: str, record: str) -> None:
+        self._records[session_id] = (record, time.monotonic())
+        await self.store.set(session_id, record, self.session_idle_timeout)
+
+    async def _refresh(self, session_id: str) -> None:
+        """Push back the record's expiry, at most every quarter of the idle timeout."""
+        if session_id not in self._records or self.session_idle_timeout is None:
+            return
+        record, written = self._records[session_id]
+        if time.monotonic() - written > self.session_idle_timeout / 4:
+            await self._record(session_id, record)
+
+    async def _discard_session(self, session_id: str, transport: StreamableHTTPServerTransport) -> None:
+        self._records.pop(session_id, None)
+        await super()._discard_session(session_id, transport)
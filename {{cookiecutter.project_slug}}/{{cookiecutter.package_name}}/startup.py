@@ -0,0 +1,149 @@
+"""Startup-time profiling for `--profile-startup`.
+
+MCP hosts spawn a stdio server for every client session, so import and
+initialization time is latency the user sees on each launch. The profiler
+times every module import through a `sys.meta_path` hook, plus named
+initialization phases, and prints the slowest of them to stderr (stdout
+carries the protocol in stdio mode).
+
+It has to be enabled before the package's heavy imports run, which is why
+`main` checks for the flag before importing the CLI.
+"""
+
+import importlib.abc
+import importlib.machinery
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Iterator, TextIO
+
+FLAG = "--profile-startup"
+
+REPORT_LIMIT = 25
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Delegates to the real loader and times `exec_module`."""
+
+    def __init__(self, loader: Any, profile: "StartupProfile") -> None:
+        self.loader = loader
+        self.profile = profile
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> ModuleType | None:
+        module: ModuleType | None = self.loader.create_module(spec)
+        return module
+
+    def exec_module(self, module: ModuleType) -> None:
+        # Let the module see its real loader (importlib.resources, pkgutil, ...)
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        with self.profile.measure(module.__name__, self.profile.imports):
+            self.loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+
+class StartupProfile(importlib.abc.MetaPathFinder):
+    """Collects per-module import times and per-phase init times.
+
+    Times are recorded as (name, cumulative, self) in seconds; self time
+    excludes nested imports and phases.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.imports: list[tuple[str, float, float]] = []
+        self.phases: list[tuple[str, float, float]] = []
+        self._children: list[float] = []
+        self._finding: set[str] = set()
+
+    def find_spec(self, name: str, path: Any, target: ModuleType | None = None) -> Any:
+        if name in self._finding:
+            return None
+        self._finding.add(name)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(name)
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    @contextmanager
+    def measure(self, name: str, records: list[tuple[str, float, float]]) -> Iterator[None]:
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            records.append((name, elapsed, elapsed - nested))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        with self.measure(name, self.phases):
+            yield
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def report(self, stream: TextIO | None = None, limit: int = REPORT_LIMIT) -> None:
+        """Write the slowest imports and every phase to `stream` (stderr)."""
+        stream = stream or sys.stderr
+        total = time.perf_counter() - self.started
+        slowest = sorted(self.imports, key=lambda record: record[2], reverse=True)[:limit]
+        lines = [
+            f"Startup profile: {total * 1000:.1f} ms, {len(self.imports)} modules imported",
+            f"{'cumulative':>12} {'self':>10}  slowest imports (ms)",
+        ]
+        lines += [f"{cumulative * 1000:12.1f} {own * 1000:10.1f}  {name}" for name, cumulative, own in slowest]
+        lines.append(f"{'cumulative':>12} {'self':>10}  init phases (ms)")
+        lines += [f"{cumulative * 1000:12.1f} {own * 1000:10.1f}  {name}" for name, cumulative, own in self.phases]
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+
+
+_profile: StartupProfile | None = None
+
+
+def enable() -> StartupProfile:
+    """Start recording imports from this point on."""
+    global _profile
+    if _profile is None:
+        _profile = StartupProfile()
+        _profile.install()
+    return _profile
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time an initialization step when profiling is enabled, else do nothing."""
+    if _profile is None:
+        yield
+        return
+    with _profile.phase(name):
+        yield
+
+
+def report() -> None:
+    """Print the profile, if enabled, and stop recording imports."""
+    if _profile is not None:
+        _profile.uninstall()
+        _profile.report()
@@ -0,0 +1,176 @@
+"""The stdio transport: newline-delimited JSON-RPC on stdin and stdout.
+
+The same framing as the SDK's `stdio_server`, with outgoing messages encoded
+by the configured serializer (see `serialization`), and built for hosts that
+pipeline requests:
+
+- The server handles every request in its own task, so a slow tool does not
+  hold up the requests read after it; responses are written in the order they
+  finish. At most `concurrency` requests are in flight: the rest wait, in
+  order, until a response is written. Notifications and the client's replies
+  to the server's own requests are never held back, so a tool waiting for one
+  cannot block the others, and a request cancelled while waiting never runs.
+  A limit of 1 handles requests one at a time, in order.
+- stdin is read in chunks of up to 64 KiB, split into lines here, and every
+  message waiting to go out when stdout is free is sent in a single write,
+  instead of a thread hop and a system call for every line.
+"""
+
+import math
+import sys
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO
+
+import anyio
+import anyio.lowlevel
+import anyio.to_thread
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp import types
+from mcp.shared.message import SessionMessage
+
+from .serialization import encode_message
+
+DEFAULT_CONCURRENCY = 16
+READ_SIZE = 64 * 1024
+
+limits = {"concurrency": DEFAULT_CONCURRENCY}
+
+
+def configure_stdio(concurrency: int | None = None) -> None:
+    """Set the number of requests handled at once (0 = unlimited)."""
+    if concurrency is not None:
+        limits["concurrency"] = concurrency
+
+
+@asynccontextmanager
+async def stdio_server(
+    stdin: BinaryIO | None = None,
+    stdout: BinaryIO | None = None,
+    concurrency: int | None = None,
+) -> AsyncIterator[
+    tuple[MemoryObjectReceiveStream[SessionMessage | Exception], MemoryObjectSendStream[SessionMessage]]
+]:
+    """Yield the read and write streams for a session on stdin and stdout.
+
+    Args:
+        stdin: Binary stream to read requests from (default: the process's stdin)
+        stdout: Binary stream to write responses to (default: the process's stdout)
+        concurrency: Requests handled at once, 0 for no limit (default: from
+            `configure_stdio`)
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    # One read returns whatever is available, up to READ_SIZE
+    read = getattr(stdin, "read1", stdin.read)
+    if concurrency is None:
+        concurrency = limits["concurrency"]
+    # No limit is a limit never reached
+    slots = anyio.Semaphore(concurrency or sys.maxsize)
+    # IDs of the requests holding a slot until their response is written
+    pending: Counter[types.RequestId] = Counter()
+    # IDs of the requests waiting for a slot, and of those cancelled meanwhile
+    waiting: Counter[types.RequestId] = Counter()
+    dropped: set[types.RequestId] = set()
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[SessionMessage | Exception](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[SessionMessage](0)
+    queue_writer, queue = anyio.create_memory_object_stream[types.JSONRPCRequest](math.inf)
+
+    async def receive(line: bytes) -> None:
+        try:
+            message = types.JSONRPCMessage.model_validate_json(line.decode("utf-8", errors="replace"))
+        except Exception as exc:
+            await read_stream_writer.send(exc)
+            return
+        root = message.root
+        if isinstance(root, types.JSONRPCRequest):
+            if waiting or not acquire_nowait(slots):
+                # Behind the requests already waiting, so they still start in order
+                waiting[root.id] += 1
+                queue_writer.send_nowait(root)
+                return
+            pending[root.id] += 1
+        if isinstance(root, types.JSONRPCNotification) and root.method == "notifications/cancelled":
+            request_id = (root.params or {}).get("requestId")
+            if request_id is not None and waiting[request_id] > 0:
+                dropped.add(request_id)
+        await read_stream_writer.send(SessionMessage(message))
+
+    async def stdin_reader() -> None:
+        try:
+            # Closing the queue lets the dispatcher close the read stream once it is empty
+            async with queue_writer:
+                partial = b""
+                while chunk := await anyio.to_thread.run_sync(read, READ_SIZE, abandon_on_cancel=True):
+                    *lines, partial = (partial + chunk).split(b"\n")
+                    for line in lines:
+                        if line.strip():
+                            await receive(line)
+                if partial.strip():
+                    await receive(partial)
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def dispatcher() -> None:
+        try:
+            async with read_stream_writer, queue:
+                async for request in queue:
+                    await slots.acquire()
+                    discard(waiting, request.id)
+                    if request.id in dropped:
+                        dropped.discard(request.id)
+                        slots.release()
+                        continue
+                    pending[request.id] += 1
+                    await read_stream_writer.send(SessionMessage(types.JSONRPCMessage(request)))
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    def write(data: bytes) -> None:
+        stdout.write(data)
+        stdout.flush()
+
+    def release(message: types.JSONRPCMessage) -> None:
+        if isinstance(message.root, types.JSONRPCResponse | types.JSONRPCError) and pending[message.root.id]:
+            discard(pending, message.root.id)
+            slots.release()
+
+    async def stdout_writer() -> None:
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    messages = [session_message.message]
+                    # Messages sent while the last write was in progress go out together
+                    while True:
+                        try:
+                            messages.append(write_stream_reader.receive_nowait().message)
+                        except (anyio.WouldBlock, anyio.EndOfStream):
+                            break
+                    data = "".join([encode_message(message) + "\n" for message in messages])
+                    await anyio.to_thread.run_sync(write, data.encode())
+                    for message in messages:
+                        release(message)
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(stdin_reader)
+        tg.start_soon(stdout_writer)
+        tg.start_soon(dispatcher)
+        yield read_stream, write_stream
+
+
+def acquire_nowait(semaphore: anyio.Semaphore) -> bool:
+    try:
+        semaphore.acquire_nowait()
+    except anyio.WouldBlock:
+        return False
+    return True
+
+
+def discard(counts: Counter[types.RequestId], key: types.RequestId) -> None:
+    """Count one occurrence of `key` less, forgetting it at zero."""
+    counts[key] -= 1
+    if counts[key] <= 0:
+        del counts[key]
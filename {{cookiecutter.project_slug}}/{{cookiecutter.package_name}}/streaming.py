@@ -0,0 +1,83 @@
+"""Tools written as async generators, streamed as progress notifications.
+
+MCP has no partial tool results, but a request can carry a progress token, and
+progress notifications for it are delivered while the call is still running:
+on the request's SSE stream with streamable-http, and on stdout with stdio.
+A streaming tool yields text chunks; each chunk is sent as the `message` of a
+progress notification as soon as it is produced, so the first byte arrives
+early and the full result is never held in memory.
+
+Sending a notification waits until the transport has taken it, so a slow
+client slows the generator down instead of letting chunks pile up.
+
+Clients that send no progress token (and direct calls) get the chunks joined
+into a normal result instead.
+"""
+
+import contextlib
+import functools
+import inspect
+import typing
+from typing import Any, AsyncIterator, Callable
+
+from mcp.server.fastmcp import Context
+from mcp.server.session import ServerSession
+
+CONTEXT_PARAM = "stream_ctx"
+
+
+def _context_param(fn: Callable[..., Any]) -> str | None:
+    for name, hint in typing.get_type_hints(fn).items():
+        if isinstance(hint, type) and issubclass(hint, Context):
+            return name
+    return None
+
+
+def _progress_token(ctx: Context[ServerSession, Any, Any]) -> Any:
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        # Called outside of a request
+        return None
+    return meta.progressToken if meta else None
+
+
+def stream_tool(fn: Callable[..., AsyncIterator[str]]) -> Callable[..., Any]:
+    """Wrap an async generator of text chunks as a tool coroutine.
+
+    The wrapper asks FastMCP for a `Context` (reusing the generator's own
+    Context parameter if it has one) to send the notifications.
+    """
+    if not inspect.isasyncgenfunction(fn):
+        raise TypeError(f"{fn.__name__} is not an async generator")
+    own_ctx = _context_param(fn)
+    ctx_name = own_ctx or CONTEXT_PARAM
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        ctx: Context[ServerSession, Any, Any] = kwargs[ctx_name] if own_ctx else kwargs.pop(ctx_name)
+        token = _progress_token(ctx)
+        chunks: list[str] = []
+        count = 0
+        async with contextlib.aclosing(fn(*args, **kwargs)) as stream:
+            async for chunk in stream:
+                count += 1
+                if token is None:
+                    chunks.append(chunk)
+                else:
+                    await ctx.report_progress(count, message=chunk)
+        if token is None:
+            return "".join(chunks)
+        return f"Streamed {count} chunks"
+
+    # Describe the wrapper to FastMCP: the generator's parameters plus a
+    # Context, returning text
+    signature = inspect.signature(fn)
+    parameters = list(signature.parameters.values())
+    annotations = {name: hint for name, hint in typing.get_type_hints(fn).items() if name != "return"}
+    if own_ctx is None:
+        parameters.append(inspect.Parameter(CONTEXT_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Context))
+        annotations[CONTEXT_PARAM] = Context
+    wrapper.__signature__ = signature.replace(parameters=parameters, return_annotation=str)  # type: ignore[attr-defined]
+    wrapper.__annotations__ = {**annotations, "return": str}
+    return wrapper
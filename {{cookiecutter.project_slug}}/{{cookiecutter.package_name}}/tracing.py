@@ -0,0 +1,387 @@
+"""Per-call tracing of tool, prompt and resource dispatch.
+
+Each `tools/call`, `prompts/get` and `resources/read` request is recorded as a
+span named after the method and its target (e.g. "tools/call calculate"),
+with attributes named after OpenTelemetry's MCP semantic conventions. A tool
+call has child spans for the time spent validating its arguments
+(`validate`), running it (`execute`) and converting its result (`serialize`).
+Whatever the server writes to the wire after that is transport overhead.
+
+Spans are handed to an exporter set with `set_exporter`:
+
+- `InMemoryCollector` keeps them in a list, e.g. for tests and benchmarks.
+- `OTLPFileExporter` appends them to a file as OTLP/JSON lines, from a
+  background thread. The OpenTelemetry Collector's `otlpjsonfile` receiver
+  reads them from there.
+
+A W3C `traceparent` in the request's `_meta` makes the span part of the
+client's trace. Tracing is off until an exporter is set; until then every
+hook is a single check of a module global.
+"""
+
+import atexit
+import os
+import queue
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+import pydantic_core
+from mcp.types import CallToolRequest, CallToolResult, GetPromptRequest, ReadResourceRequest
+
+SERVICE_NAME = "{{ cookiecutter.package_name }}"
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_STOP = object()
+
+
+class Span:
+    """A timed operation with attributes, in the OpenTelemetry data model."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "message",
+        "events",
+    )
+
+    def __init__(
+        self, name: str, trace_id: str, parent_id: str | None = None, kind: int = KIND_INTERNAL
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: dict[str, Any] = {}
+        self.status = 0
+        self.message = ""
+        self.events: list[dict[str, Any]] = []
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error_type: str, message: str = "") -> None:
+        self.status = STATUS_ERROR
+        self.message = message
+        self.attributes["error.type"] = error_type
+
+    def record_exception(self, error: BaseException) -> None:
+        self.set_error(type(error).__qualname__, str(error))
+        self.events.append(
+            {
+                "name": "exception",
+                "time_ns": time.time_ns(),
+                "attributes": {"exception.type": type(error).__qualname__, "exception.message": str(error)},
+            }
+        )
+
+    def to_otlp(self) -> dict[str, Any]:
+        """The span in the OTLP/JSON encoding."""
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status, "message": self.message} if self.status else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = [
+                {
+                    "name": event["name"],
+                    "timeUnixNano": str(event["time_ns"]),
+                    "attributes": _otlp_attributes(event["attributes"]),
+                }
+                for event in self.events
+            ]
+        return span
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_request(spans: list[Span]) -> dict[str, Any]:
+    """An OTLP/JSON `ExportTraceServiceRequest` holding `spans`."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": SERVICE_NAME, "process.pid": os.getpid()})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": f"{SERVICE_NAME}.tracing"},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """Receives every span as it ends."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Handle `span`, which has just ended."""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemoryCollector(SpanExporter):
+    """Keeps ended spans in `spans`, oldest first."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class OTLPFileExporter(SpanExporter):
+    """Appends spans to `path` as OTLP/JSON, one export request per line.
+
+    Encoding and writing happen on a background thread, which writes
+    everything queued since its last write as one line. Spans beyond
+    `max_queue` waiting ones are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, path: str, max_queue: int = 10_000) -> None:
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="span-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        """Write what is queued and close the file."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+        atexit.unregister(self.shutdown)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [span for span in batch if span is not _STOP]
+            if batch:
+                self._file.write(pydantic_core.to_json(otlp_request(batch)).decode() + "\n")
+                self._file.flush()
+        self._file.close()
+
+
+_exporter: SpanExporter | None = None
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def set_exporter(exporter: SpanExporter | None) -> SpanExporter | None:
+    """Export spans to `exporter` from now on; None turns tracing off."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+    return exporter
+
+
+def configure_tracing(file: str | None = None) -> None:
+    """Append spans to `file` as OTLP/JSON (if it is set)."""
+    if file:
+        set_exporter(OTLPFileExporter(file))
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Span | None:
+    """The span of the operation running now, if it is traced."""
+    return _current.get()
+
+
+def parse_traceparent(value: Any) -> tuple[str, str] | None:
+    """The trace id and parent span id of a W3C `traceparent` header value."""
+    if not isinstance(value, str):
+        return None
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id
+
+
+class _SpanScope:
+    """Starts a span on enter, ends and exports it on exit."""
+
+    __slots__ = ("_name", "_attributes", "_traceparent", "_span", "_token")
+
+    def __init__(self, name: str, attributes: dict[str, Any] | None = None, traceparent: Any = None) -> None:
+        self._name = name
+        self._attributes = attributes
+        self._traceparent = traceparent
+
+    def __enter__(self) -> Span:
+        parent = _current.get()
+        remote = parse_traceparent(self._traceparent) if parent is None else None
+        if parent is not None:
+            span = Span(self._name, parent.trace_id, parent.span_id)
+        elif remote is not None:
+            span = Span(self._name, remote[0], remote[1], KIND_SERVER)
+        else:
+            span = Span(self._name, secrets.token_hex(16), kind=KIND_SERVER)
+        if self._attributes:
+            span.attributes.update(self._attributes)
+        self._span = span
+        self._token = _current.set(span)
+        return span
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, traceback: Any) -> None:
+        span = self._span
+        span.end_ns = time.time_ns()
+        if exc is not None:
+            span.record_exception(exc)
+        _current.reset(self._token)
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(span)
+
+
+class _NoSpan:
+    """What `span` returns when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, attributes: dict[str, Any] | None = None, traceparent: Any = None) -> _SpanScope | _NoSpan:
+    """A context manager recording a span, a child of the current one if any.
+
+    Without a current span, a valid W3C `traceparent` makes it a child of
+    the caller's span. When tracing is off, nothing is recorded.
+    """
+    if _exporter is None:
+        return _NO_SPAN
+    return _SpanScope(name, attributes, traceparent)
+
+
+def _size(value: Any) -> int:
+    """Bytes of `value` as compact JSON."""
+    return len(pydantic_core.to_json(value, fallback=str))
+
+
+def _target(request: Any) -> tuple[str, dict[str, Any]]:
+    """What a request is for, and span attributes describing it."""
+    if isinstance(request, CallToolRequest):
+        arguments = request.params.arguments or {}
+        name = request.params.name
+        return name, {"gen_ai.tool.name": name, "mcp.request.size": _size(arguments)}
+    if isinstance(request, GetPromptRequest):
+        return request.params.name, {"gen_ai.prompt.name": request.params.name}
+    if isinstance(request, ReadResourceRequest):
+        uri = str(request.params.uri)
+        return uri, {"mcp.resource.uri": uri}
+    return "", {}
+
+
+def traced(handler: Callable[[Any], Awaitable[Any]], lowlevel: Any) -> Callable[[Any], Awaitable[Any]]:
+    """Wrap a low-level request handler so that each request is a span.
+
+    `lowlevel` is the `mcp.server.lowlevel.Server` whose request context
+    provides the request id.
+    """
+
+    async def handle(request: Any) -> Any:
+        if _exporter is None:
+            return await handler(request)
+
+        target, attributes = _target(request)
+        attributes["mcp.method.name"] = request.method
+        meta = request.params.meta
+        traceparent = (meta.model_extra or {}).get("traceparent") if meta is not None else None
+        with _SpanScope(f"{request.method} {target}".rstrip(), attributes, traceparent) as current:
+            try:
+                current.set_attribute("jsonrpc.request.id", str(lowlevel.request_context.request_id))
+            except LookupError:
+                pass
+            result = await handler(request)
+            root = getattr(result, "root", result)
+            response = root.model_dump(by_alias=True, exclude_none=True)
+            current.set_attribute("mcp.response.size", _size(response))
+            if isinstance(root, CallToolResult) and root.isError:
+                current.set_error("tool_error")
+            return result
+
+    return handle
@@ -0,0 +1,462 @@
+"""Multi-process serving for the streamable-http transport.
+
+Two modes are supported:
+
+* **Stateless** - uvicorn forks N workers that share the listening socket and
+  the kernel spreads connections across them. No session state is kept, so any
+  worker can answer any request.
+* **Stateful** - each worker listens on a private Unix socket and the parent
+  process runs an `AffinityRouter` on the public port. The router remembers
+  which worker created each `Mcp-Session-Id` and keeps routing that session
+  there for its whole lifetime, or until the worker would have dropped it
+  for being idle. A worker that exits is restarted; meanwhile it gets no new
+  sessions, and the clients of its sessions get 404 and initialize again. A
+  scrape of `/metrics` on the public port is answered with the metrics of
+  every worker, labelled by worker index. On SIGTERM the router drains (see
+  `lifecycle`) before the workers are stopped.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Sequence
+
+import httpx
+from loguru import logger
+from mcp.server.streamable_http import MCP_SESSION_ID_HEADER
+from mcp.server.streamable_http_manager import DEFAULT_MAX_SESSIONS, DEFAULT_SESSION_IDLE_TIMEOUT
+from mcp.types import INVALID_REQUEST, ErrorData, JSONRPCError
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .app import create_http_app, export_options
+from .lifecycle import DrainMiddleware, Lifecycle, configure_lifecycle
+from .metrics import CONTENT_TYPE, merge
+from .process import configure_process
+
+# Headers that describe a single hop and must not be forwarded.
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+WORKER_STARTUP_TIMEOUT = 30.0
+METRICS_SCRAPE_TIMEOUT = 5.0
+# How often the parent checks that the workers are alive
+WATCH_INTERVAL = 1.0
+
+
+def _error_response(message: str, status_code: int, code: int = INVALID_REQUEST) -> Response:
+    """A JSON-RPC error body with the given HTTP status."""
+    body = JSONRPCError(jsonrpc="2.0", id="server-error", error=ErrorData(code=code, message=message))
+    return Response(
+        body.model_dump_json(by_alias=True, exclude_none=True),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+class _Route:
+    """The worker of one session, and when a request of it was last in flight."""
+
+    __slots__ = ("worker", "active", "in_flight")
+
+    def __init__(self, worker: int) -> None:
+        self.worker = worker
+        self.active = time.monotonic()
+        self.in_flight = 0
+
+
+class SessionTable:
+    """The worker of each session, for as long as the worker may still hold it.
+
+    Workers end a session after `idle_timeout` seconds without a request in
+    flight, and hold at most `max_sessions` each. Entries are forgotten on the
+    same terms: when idle for longer than `idle_timeout`, and least recently
+    used first beyond `max_sessions`, so the table stays bounded however
+    clients leave.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float | None = DEFAULT_SESSION_IDLE_TIMEOUT,
+        max_sessions: int | None = DEFAULT_MAX_SESSIONS,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        # Least recently active first
+        self._routes: OrderedDict[str, _Route] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._routes
+
+    def __getitem__(self, session_id: str) -> int:
+        return self._routes[session_id].worker
+
+    def __setitem__(self, session_id: str, worker: int) -> None:
+        self._routes[session_id] = _Route(worker)
+        self._routes.move_to_end(session_id)
+        self._expire()
+
+    def pop(self, session_id: str) -> None:
+        self._routes.pop(session_id, None)
+
+    def drop_worker(self, worker: int) -> None:
+        """Forget every session of `worker`, e.g. because it exited."""
+        for session_id in [key for key, route in self._routes.items() if route.worker == worker]:
+            del self._routes[session_id]
+
+    def begin(self, session_id: str) -> int | None:
+        """Mark a request of the session in flight and return its worker, if still known."""
+        self._expire()
+        route = self._routes.get(session_id)
+        if route is None:
+            return None
+        route.in_flight += 1
+        route.active = time.monotonic()
+        self._routes.move_to_end(session_id)
+        return route.worker
+
+    def end(self, session_id: str) -> None:
+        """Mark a request begun with `begin` finished."""
+        route = self._routes.get(session_id)
+        if route is not None:
+            route.in_flight -= 1
+            route.active = time.monotonic()
+            self._routes.move_to_end(session_id)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._routes:
+            session_id, route = next(iter(self._routes.items()))
+            idle = self.idle_timeout is not None and now - route.active > self.idle_timeout
+            full = self.max_sessions is not None and len(self._routes) > self.max_sessions
+            if not idle and not full:
+                return
+            if idle and not full and route.in_flight:
+                # A long-lived stream keeps the session alive on its worker
+                route.active = now
+                self._routes.move_to_end(session_id)
+                continue
+            del self._routes[session_id]
+
+
+class AffinityRouter:
+    """ASGI app that pins each MCP session to the worker that created it.
+
+    Requests without an `Mcp-Session-Id` header (session initialization) are
+    spread round-robin over the workers not marked down. The session id
+    returned by the worker is remembered, and every later request carrying it
+    is forwarded to the same worker. Sessions are forgotten when the worker
+    answers 404 for them, when they are deleted, when the worker would have
+    dropped them (see `SessionTable`), and when the worker is marked down.
+
+    If `metrics_path` is set, a GET on it is sent to every worker and the
+    results are merged into one response. The router is ready, in the sense
+    of `lifecycle`, from its lifespan startup until its shutdown, and runs
+    `watch(router)` meanwhile (see `WorkerProcesses.watch`).
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[httpx.AsyncClient],
+        metrics_path: str | None = None,
+        lifecycle: Lifecycle | None = None,
+        session_idle_timeout: float | None = DEFAULT_SESSION_IDLE_TIMEOUT,
+        watch: Callable[["AffinityRouter"], Coroutine[Any, Any, None]] | None = None,
+    ) -> None:
+        if not clients:
+            raise ValueError("AffinityRouter needs at least one worker")
+        self.clients = list(clients)
+        self.metrics_path = metrics_path
+        self.lifecycle = lifecycle or Lifecycle()
+        self.sessions = SessionTable(session_idle_timeout, DEFAULT_MAX_SESSIONS * len(self.clients))
+        self.watch = watch
+        # Workers that exited and are not serving again yet
+        self.down: set[int] = set()
+        self._next_worker = itertools.cycle(range(len(self.clients)))
+
+    def worker_down(self, worker: int) -> None:
+        """Stop sending requests to `worker` and forget its sessions."""
+        self.down.add(worker)
+        self.sessions.drop_worker(worker)
+
+    def worker_up(self, worker: int) -> None:
+        """Give `worker` new sessions again."""
+        self.down.discard(worker)
+
+    def _pick_worker(self) -> int | None:
+        """The next worker up, round-robin, or None if all are down."""
+        for _ in range(len(self.clients)):
+            worker = next(self._next_worker)
+            if worker not in self.down:
+                return worker
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        request = Request(scope, receive)
+        if request.method == "GET" and request.url.path == self.metrics_path:
+            response = await self._scrape()
+            await response(scope, receive, send)
+            return
+
+        session_id = request.headers.get(MCP_SESSION_ID_HEADER)
+        if session_id is None:
+            available = self._pick_worker()
+            if available is None:
+                await _error_response("No worker available", 503)(scope, receive, send)
+                return
+            worker = available
+        else:
+            known = self.sessions.begin(session_id)
+            if known is None:
+                # Unknown or expired session ID - return 404 per MCP spec
+                await _error_response("Session not found", 404)(scope, receive, send)
+                return
+            worker = known
+
+        try:
+            await self._proxy(request, worker, session_id, scope, receive, send)
+        finally:
+            if session_id is not None:
+                self.sessions.end(session_id)
+
+    async def _proxy(
+        self,
+        request: Request,
+        worker: int,
+        session_id: str | None,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Forward the request to `worker` and stream its response back."""
+        try:
+            upstream = await self._forward(request, worker)
+        except httpx.TransportError as e:
+            logger.error("Worker {} unavailable: {}", worker, e)
+            await _error_response("Worker unavailable", 503)(scope, receive, send)
+            return
+
+        if session_id is None:
+            new_session_id = upstream.headers.get(MCP_SESSION_ID_HEADER)
+            if new_session_id:
+                self.sessions[new_session_id] = worker
+        elif upstream.status_code == 404 or (
+            request.method == "DELETE" and upstream.is_success
+        ):
+            self.sessions.pop(session_id)
+
+        response = StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            headers={
+                key: value
+                for key, value in upstream.headers.items()
+                if key.lower() not in HOP_BY_HOP_HEADERS
+            },
+            background=BackgroundTask(upstream.aclose),
+        )
+        await response(scope, receive, send)
+
+    async def _forward(self, request: Request, worker: int) -> httpx.Response:
+        """Send the request to a worker and return its streaming response."""
+        client = self.clients[worker]
+        headers = [
+            (key, value)
+            for key, value in request.headers.items()
+            if key not in HOP_BY_HOP_HEADERS and key != "content-length"
+        ]
+        url = request.url.path
+        if request.url.query:
+            url = f"{url}?{request.url.query}"
+        upstream_request = client.build_request(
+            request.method,
+            url,
+            headers=headers,
+            content=await request.body(),
+        )
+        return await client.send(upstream_request, stream=True)
+
+    async def _scrape(self) -> Response:
+        """Fetch the metrics of every worker and merge them."""
+        assert self.metrics_path is not None
+        responses = await asyncio.gather(
+            *(client.get(self.metrics_path, timeout=METRICS_SCRAPE_TIMEOUT) for client in self.clients),
+            return_exceptions=True,
+        )
+        expositions = []
+        for worker, response in enumerate(responses):
+            if isinstance(response, BaseException) or not response.is_success:
+                logger.warning("Could not scrape metrics from worker {}: {!r}", worker, response)
+                expositions.append("")
+            else:
+                expositions.append(response.text)
+        return Response(merge(expositions), media_type=CONTENT_TYPE)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        await receive()  # lifespan.startup
+        watching = asyncio.create_task(self.watch(self)) if self.watch is not None else None
+        try:
+            async with self.lifecycle.serving():
+                await send({"type": "lifespan.startup.complete"})
+                await receive()  # lifespan.shutdown
+        finally:
+            if watching is not None:
+                watching.cancel()
+        for client in self.clients:
+            await client.aclose()
+        await send({"type": "lifespan.shutdown.complete"})
+
+
+def _run_worker(socket_path: str, options: dict[str, Any]) -> None:
+    """Worker process body: serve the MCP app on a Unix socket."""
+    import uvicorn
+
+    configure_process(options)
+    # The router has drained before workers are stopped, and is the one probed
+    configure_lifecycle(drain_delay=0)
+    uvicorn.run(
+        create_http_app(**options.get("app", {})),
+        uds=socket_path,
+        log_level=options["logging"]["log_level"].lower(),
+    )
+
+
+def _wait_for_sockets(paths: Sequence[str], processes: Sequence[Any]) -> None:
+    """Block until every worker has bound its socket."""
+    deadline = time.monotonic() + WORKER_STARTUP_TIMEOUT
+    while not all(os.path.exists(path) for path in paths):
+        if any(not process.is_alive() for process in processes):
+            raise RuntimeError("A worker process exited during startup")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Workers did not start within {WORKER_STARTUP_TIMEOUT}s")
+        time.sleep(0.05)
+
+
+class WorkerProcesses:
+    """The worker processes of the stateful mode, one per Unix socket."""
+
+    def __init__(self, socket_paths: Sequence[str], options: dict[str, Any]) -> None:
+        self.socket_paths = list(socket_paths)
+        self.options = options
+        self.processes: list[Any] = []
+        self._context = multiprocessing.get_context("spawn")
+
+    def start(self) -> None:
+        """Start every worker and wait until all of them listen."""
+        self.processes = [self._spawn(index) for index in range(len(self.socket_paths))]
+        _wait_for_sockets(self.socket_paths, self.processes)
+
+    def stop(self) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+
+    def _spawn(self, index: int) -> Any:
+        path = self.socket_paths[index]
+        # A worker that died leaves its socket file behind
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        process = self._context.Process(
+            target=_run_worker,
+            args=(path, self.options),
+            name=f"mcp-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    async def watch(self, router: AffinityRouter, interval: float = WATCH_INTERVAL) -> None:
+        """Restart workers that exit, every `interval` seconds, for as long as `router` runs."""
+        while True:
+            await asyncio.sleep(interval)
+            self.check(router)
+
+    def check(self, router: AffinityRouter) -> None:
+        """Mark workers that exited down in `router` and restart them, and
+        mark restarted workers up once they listen."""
+        for index, process in enumerate(self.processes):
+            if not process.is_alive():
+                logger.error("Worker {} exited with code {}, restarting it", index, process.exitcode)
+                router.worker_down(index)
+                self.processes[index] = self._spawn(index)
+            elif index in router.down and os.path.exists(self.socket_paths[index]):
+                logger.info("Worker {} restarted", index)
+                router.worker_up(index)
+
+
+def run_workers(host: str, port: int, workers: int, options: dict[str, Any]) -> None:
+    """Serve the streamable-http app from `workers` processes on one port.
+
+    `options` are applied in every worker, see `configure_process`.
+    """
+    import uvicorn
+
+    log_level = options["logging"]["log_level"].lower()
+
+    if options.get("app", {}).get("stateless"):
+        export_options(options)
+        uvicorn.run(
+            "{{ cookiecutter.package_name }}.app:create_http_app_from_env",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            log_level=log_level,
+        )
+        return
+
+    socket_dir = tempfile.mkdtemp(prefix="{{ cookiecutter.package_name }}-")
+    socket_paths = [os.path.join(socket_dir, f"worker-{index}.sock") for index in range(workers)]
+    processes = WorkerProcesses(socket_paths, options)
+    try:
+        processes.start()
+        logger.info("Started {} workers behind the session-affinity router", workers)
+        # httpx logs every proxied request at INFO
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        clients = [
+            httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=path),
+                base_url="http://worker",
+                # SSE streams stay open for the whole session
+                timeout=httpx.Timeout(None),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=64),
+            )
+            for path in socket_paths
+        ]
+        metrics_path = "/metrics" if options.get("app", {}).get("metrics", True) else None
+        router = AffinityRouter(clients, metrics_path=metrics_path, watch=processes.watch)
+        uvicorn.run(DrainMiddleware(router, router.lifecycle), host=host, port=port, log_level=log_level)
+    finally:
+        processes.stop()
+        shutil.rmtree(socket_dir, ignore_errors=True)